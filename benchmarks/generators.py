@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+# Seeded stand-ins for the dataframes in tests/create_dataframes.py, scaled up to any size
+
+POSITIONS = ['GK', 'DEF', 'MID', 'FWD']
+TEAM_STATS = ['goals_scored', 'assists', 'yellow_cards']
+
+
+def _names(prefix, n):
+    return [f'{prefix} {i}' for i in range(n)]
+
+
+def _categories(rng, n_rows, n_categories):
+    # The four real positions, then made up ones once more categories are asked for
+    names = POSITIONS[:n_categories] if n_categories <= len(POSITIONS) else POSITIONS + _names('Position', n_categories - len(POSITIONS))
+    return rng.choice(names, size=n_rows)
+
+
+def season_team(n_teams = 20, n_series = 3, n_categories = None, seed = 0):
+    # Like df_season_team: one row per team with a count for each stat, plus a division column to colour by
+    rng = np.random.default_rng(seed)
+    stats = TEAM_STATS[:n_series] + _names('stat', max(n_series - len(TEAM_STATS), 0))
+    df = pd.DataFrame({'team_x': _names('Team', n_teams)})
+    for stat in stats:
+        df[stat] = rng.integers(25, 105, size=n_teams)
+    if n_categories is not None:
+        df['division'] = rng.choice(_names('Division', n_categories), size=n_teams)
+    return df
+
+
+def season_players(n_rows = 869, n_categories = 4, seed = 0):
+    # Like df_season_players: a category per player and two skewed numeric columns, with a spike of players on zero
+    rng = np.random.default_rng(seed)
+    minutes = rng.gamma(1.2, 30.0, size=n_rows)
+    influence = rng.gamma(1.5, 5.0, size=n_rows)
+    unused = rng.random(n_rows) < 0.2
+    minutes[unused] = 0.0
+    influence[unused] = 0.0
+    return pd.DataFrame({
+        'position': _categories(rng, n_rows, n_categories),
+        'influence': influence,
+        'minutes': minutes,
+    })
+
+
+def gameweeks(n_rows = 38, n_series = 2, seed = 0):
+    # Like df_haaland: a running index and one cumulative count per series
+    rng = np.random.default_rng(seed)
+    names = ['goals_scored', 'assists'][:n_series] + _names('series', max(n_series - 2, 0))
+    df = pd.DataFrame({'GW': np.arange(1, n_rows + 1)})
+    for name in names:
+        df[name] = rng.poisson(0.8, size=n_rows).cumsum()
+    return df
+
+
+def matches(n_rows = 1_000_000, n_teams = 20_000, seed = 0):
+    # Long format: one row per team per match, for the charts that aggregate it themselves
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'team_x': rng.choice(_names('Team', n_teams), size=n_rows),
+        'goals_scored': rng.poisson(1.5, size=n_rows),
+        'assists': rng.poisson(1.0, size=n_rows),
+    })
+
+
+def metrics(n_rows = 2_000_000, n_columns = 20, seed = 0):
+    # Wide numeric data with a running timestamp, more columns than a chart uses
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({f'metric_{i}': rng.normal(size=n_rows) for i in range(n_columns)})
+    df['timestamp'] = np.arange(n_rows, dtype=float)
+    return df
+
+
+def sales(n_rows = 1_000_000, n_regions = 50, seed = 0):
+    # Long format sales with a text column no chart uses, written out to CSV and Parquet for the file readers
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'region': rng.choice(_names('Region', n_regions), size=n_rows),
+        'sales': rng.gamma(2.0, 50.0, size=n_rows),
+        'price': rng.normal(100, 15, size=n_rows),
+        'units': rng.poisson(20, size=n_rows).astype(float),
+        'notes': rng.choice(['a', 'bb', 'ccc'], size=n_rows),
+    })
+
+
+def panels(n_panels = 16, rows_per_panel = 2000, n_categories = 4, seed = 0):
+    # A stretch of matches per player, to be split into one panel per player
+    rng = np.random.default_rng(seed)
+    n_rows = n_panels * rows_per_panel
+    return pd.DataFrame({
+        'player': np.repeat(_names('Player', n_panels), rows_per_panel),
+        'minute': np.tile(np.arange(rows_per_panel, dtype=float), n_panels),
+        'influence': rng.normal(size=n_rows),
+        'threat': rng.random(n_rows),
+        'position': _categories(rng, n_rows, n_categories),
+    })
@@ -0,0 +1,70 @@
+import argparse
+import resource
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from speedy_charts.charts import Bar, Line, Scatter
+from speedy_charts.figures import FigurePool
+
+
+def rss_mb():
+    # Current resident memory on Linux, the peak elsewhere
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+parser = argparse.ArgumentParser(description='Render charts in a loop and check that memory stays flat')
+parser.add_argument('--charts', type=int, default=100_000)
+parser.add_argument('--mode', choices=('plot', 'render', 'pool'), default='plot', help='plot through pyplot and close, render, or render with a FigurePool')
+parser.add_argument('--warmup', type=int, default=500, help='charts rendered before the baseline is taken')
+parser.add_argument('--limit', type=float, default=20.0, help='growth in MB allowed after the warmup')
+parser.add_argument('--every', type=int, default=1000, help='charts between memory readings')
+args = parser.parse_args()
+
+rng = np.random.default_rng(42)
+teams = pd.DataFrame({'team': [f'team_{i}' for i in range(20)], 'goals': rng.integers(0, 100, 20)})
+series = pd.DataFrame({'x': np.arange(2000, dtype=float), 'a': rng.normal(size=2000).cumsum(), 'b': rng.normal(size=2000).cumsum()})
+points = pd.DataFrame({'x': rng.random(2000), 'y': rng.random(2000), 'position': rng.choice(['GK', 'DEF', 'MID', 'FWD'], 2000)})
+
+charts = (
+    lambda: Bar(x = 'team', y = 'goals', df = teams),
+    lambda: Line(x = 'x', y = ['a', 'b'], df = series),
+    lambda: Scatter(x = 'x', y = 'y', df = points, category_column = 'position'),
+)
+pool = FigurePool()
+
+if args.mode == 'plot':
+    import matplotlib.pyplot as plt
+
+baseline = None
+start = time.perf_counter()
+for i in range(args.charts):
+    if args.mode == 'plot':
+        with charts[i % len(charts)]() as chart:
+            chart.plot(title=f'Chart {i}')
+            chart.figure.canvas.draw()
+    else:
+        charts[i % len(charts)]().render(pool=pool if args.mode == 'pool' else None, title=f'Chart {i}')
+
+    done = i + 1
+    if done == min(args.warmup, args.charts):
+        baseline = rss_mb()
+        print(f"{done:8d} charts  baseline {baseline:8.1f}MB")
+    elif done % args.every == 0 or done == args.charts:
+        print(f"{done:8d} charts  {rss_mb():8.1f}MB  {(time.perf_counter() - start) / done * 1000:6.1f}ms per chart")
+
+growth = rss_mb() - baseline
+print(f"Grew {growth:.1f}MB after the warmup (limit {args.limit:.1f}MB)")
+if args.mode == 'plot' and plt.get_fignums():
+    print(f"{len(plt.get_fignums())} pyplot figures were left open")
+    sys.exit(1)
+if args.mode == 'pool':
+    print(pool.stats())
+sys.exit(1 if growth > args.limit else 0)
@@ -0,0 +1,600 @@
+import argparse
+import datetime
+import functools
+import io
+import itertools
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+import numpy as np
+import pandas as pd
+from matplotlib.colors import ListedColormap, to_rgba, to_rgba_array
+
+from generators import gameweeks, matches, metrics, panels, sales, season_players, season_team
+from speedy_charts.cache import RenderCache, render_key
+from speedy_charts.charts import Bar, GroupedBar, HorizontalStackedBar, Line, Scatter, StackedBar, StreamingLine, new_figure
+from speedy_charts.facets import Facets
+from speedy_charts.palettes import af_categorical, palette_rgba
+
+PHASES = ('plot', 'draw', 'png')
+
+# Palette that stretches to any number of categories or series
+PALETTE = 'oth_sequential_9'
+
+
+def grid(**params):
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*params.values())]
+
+
+def team_series(p):
+    return list(season_team(2, p['series']).columns[1:])
+
+
+def aggregated(chart, y, p):
+    df = matches(p['rows'], p['teams'])
+    return lambda: chart(x = 'team_x', y = y, df = df, agg = p['agg'], top_n = 20)
+
+
+def groupby_bars(p):
+    # The approach agg replaced: totals from pandas, then a bar for every team. Drawing all 20,000 is too slow, so only the first p['bars'] are
+    df = matches(p['rows'], p['teams'])
+    return lambda: Bar(x = 'team_x', y = 'goals_scored', df = df.groupby('team_x', sort=False)['goals_scored'].sum().reset_index().head(p['bars']))
+
+
+def adapted(chart, p, **chart_kwargs):
+    # pyarrow and polars are only imported by the cases that need them
+    df = metrics(p['rows'], p['columns'])
+    if p['source'].startswith('arrow'):
+        import pyarrow as pa
+        data = pa.Table.from_pandas(df, preserve_index=False)
+    elif p['source'].startswith('polars'):
+        import polars as pl
+        data = pl.from_pandas(df)
+    else:
+        data = df
+    del df
+
+    if p['source'].endswith('to_pandas'):
+        # The approach the adapters replaced: the whole table converted to pandas before charting
+        return lambda: chart(df = data.to_pandas(), **chart_kwargs)
+    return lambda: chart(df = data, **chart_kwargs)
+
+
+ADAPTER_SOURCES = ['pandas', 'arrow', 'arrow_to_pandas', 'polars', 'polars_to_pandas']
+
+
+@functools.lru_cache(maxsize=None)
+def files_directory():
+    # Removed when the suite exits
+    return tempfile.TemporaryDirectory()
+
+
+@functools.lru_cache(maxsize=None)
+def sales_file(n_rows, file_format):
+    path = os.path.join(files_directory().name, f'sales_{n_rows}.{file_format}')
+    df = sales(n_rows)
+    if file_format == 'csv':
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, row_group_size=500_000)
+    return path
+
+
+def from_file(chart, p, **chart_kwargs):
+    path = sales_file(p['rows'], p['format'])
+    if p['source'] == 'pandas':
+        # The approach from_file replaced: the whole file read into pandas before charting
+        read = pd.read_csv if p['format'] == 'csv' else pd.read_parquet
+        return lambda: chart(df = read(path), **chart_kwargs)
+    return lambda: chart.from_file(path, **chart_kwargs)
+
+
+class PanelByPanel:
+    # The approach Facets replaced: a chart of its own on each subplot, every one applying the theme and its limits itself
+    def __init__(self, chart, df, facet_column, **chart_kwargs):
+        self.charts = [chart(df = panel, **chart_kwargs) for _, panel in df.groupby(facet_column, sort=False)]
+
+    def plot(self, panel_size = (3.2, 2.4), layout = 'constrained', **plot_kwargs):
+        columns = math.ceil(math.sqrt(len(self.charts)))
+        rows = math.ceil(len(self.charts) / columns)
+        fig = new_figure(layout=layout, figsize=(panel_size[0] * columns, panel_size[1] * rows))
+        axes = fig.subplots(rows, columns, squeeze=False).ravel()
+        for chart, ax in zip(self.charts, axes):
+            # Scatter keeps the legend of its categories whatever legend says, inside the panel it doesn't squeeze the grid
+            chart.plot(legend=False, legend_plot_area='inside', ax=ax, **plot_kwargs)
+        for ax in axes[len(self.charts):]:
+            ax.set_visible(False)
+        return fig
+
+
+class CategoryUnits:
+    # The approach integer positions replaced: team names straight into ax.bar through matplotlib's category units
+    def __init__(self, df, x, y):
+        self.df, self.x, self.y = df, x, y
+
+    def plot(self, fig):
+        fig.add_subplot().bar(self.df[self.x], self.df[self.y])
+
+
+class EveryLabel:
+    # Ticks as they were before thinning, every group placed and labelled
+    def __init__(self, chart):
+        self.chart = chart
+
+    def plot(self, fig, **plot_kwargs):
+        ax = self.chart.plot(fig=fig, **plot_kwargs)
+        locator = ax.xaxis.get_major_locator()
+        ax.set_xticks(locator.positions, locator.labels)
+
+
+class BarPerSeries:
+    # The approach one collection per series replaced: an ax.bar call per series, stacking pandas Series
+    def __init__(self, df, x, y):
+        self.df, self.x, self.y = df, x, y
+
+    def plot(self, fig, colour_palette = PALETTE):
+        ax = fig.add_subplot()
+        df = self.df.set_index(self.x)
+        bottom = np.zeros(len(df))
+        colours = palette_rgba(colour_palette, len(self.y))
+        for i, item in enumerate(self.y):
+            ax.bar(df.index, df[item], bottom=bottom, label=item, color=colours[i])
+            bottom += df[item]
+
+
+def colour_chart(p):
+    df = season_players(p['rows'])
+    if p['column'] == 'ranges':
+        return Scatter(x = 'minutes', y = 'influence', df = df, category_column = 'influence', category_list = ['Low', 'Medium', 'High'], custom_ranges = [0, 10, 20, float('inf')])
+    return Scatter(x = 'minutes', y = 'influence', df = df, category_column = 'position')
+
+
+class ColourRows:
+    # Only the colour of every row, turned into the RGBA array ax.scatter/ax.bar would make of it. 'dict' is the approach
+    # category codes replaced: a dict of RGBA tuples mapped into an object column, through pd.cut for ranges
+    def __init__(self, chart, mapping):
+        self.chart, self.mapping = chart, mapping
+
+    def plot(self, fig):
+        chart = self.chart
+        if self.mapping == 'codes':
+            to_rgba_array(chart._colour_rows(chart.df, af_categorical)[2])
+            return
+
+        cmap = ListedColormap([to_rgba(colour) for colour in af_categorical])
+        values = chart.df[chart.category_column]
+        if chart.custom_ranges is not None:
+            values = pd.cut(values, bins=chart.custom_ranges, labels=chart.category_list, right=False).astype(str)
+            categories = chart.category_list
+        else:
+            categories = values.unique()
+        to_rgba_array(values.map({category: cmap(i) for i, category in enumerate(categories)}))
+
+
+REFRESHES = 20
+
+REFRESH_CHARTS = {
+    'line': (Line, {'x': 'time', 'y': ['a', 'b']}, lambda rng: pd.DataFrame({
+        'time': np.arange(10_000), 'a': rng.normal(size=10_000).cumsum(), 'b': rng.normal(size=10_000).cumsum()})),
+    'scatter': (Scatter, {'x': 'x', 'y': 'y', 'category_column': 'group'}, lambda rng: pd.DataFrame({
+        'x': rng.normal(size=20_000), 'y': rng.normal(size=20_000), 'group': rng.choice(['a', 'b', 'c'], size=20_000)})),
+    'stacked_bar': (StackedBar, {'x': 'team', 'y': ['a', 'b', 'c']}, lambda rng: pd.DataFrame({
+        'team': [f'Team {i}' for i in range(20)], 'a': rng.integers(50, 60, 20), 'b': rng.integers(50, 60, 20), 'c': rng.integers(50, 60, 20)})),
+}
+
+
+class Refreshes:
+    # A dashboard redrawing a chart for each of REFRESHES new frames. 'replot' is the approach update replaced: the chart
+    # plotted from scratch on every refresh
+    def __init__(self, p):
+        self.chart, self.chart_kwargs, make_frame = REFRESH_CHARTS[p['chart']]
+        rng = np.random.default_rng(0)
+        self.frames = [make_frame(rng) for _ in range(REFRESHES)]
+        self.method = p['method']
+
+    def plot(self, fig):
+        if self.method == 'replot':
+            for df in self.frames:
+                fig.clear()
+                self.chart(df = df, **self.chart_kwargs).plot(fig=fig)
+                fig.canvas.draw()
+            return
+
+        chart = self.chart(df = self.frames[0], **self.chart_kwargs)
+        ax = chart.plot(fig=fig)
+        if self.method == 'blit_fixed_axes':
+            # A dashboard with fixed axis limits only ever redraws the data
+            for get_limits, set_limits in ((ax.get_xlim, ax.set_xlim), (ax.get_ylim, ax.set_ylim)):
+                low, high = get_limits()
+                set_limits(low - (high - low), high + (high - low))
+        fig.canvas.draw()
+
+        blit = self.method != 'update'
+        for df in self.frames:
+            chart.update(df, blit=blit)
+        if blit:
+            # Blitted artists are left out of savefig until a plain update
+            chart.update()
+
+
+class Stream:
+    # Points arriving in batches with the chart redrawn after each one, through StreamingLine's ring buffers or, as before
+    # it existed, a dataframe that is appended to, sliced to the window and plotted again ('reslice')
+    def __init__(self, p, window = 5_000, batch = 1_000):
+        rng = np.random.default_rng(0)
+        self.times = np.arange(p['points'], dtype=float)
+        self.values = rng.normal(size=p['points']).cumsum()
+        self.method, self.window, self.batch = p['method'], window, batch
+
+    def plot(self, fig):
+        batches = [slice(start, start + self.batch) for start in range(0, len(self.times), self.batch)]
+        if self.method == 'reslice':
+            df = pd.DataFrame({'time': [], 'value': []})
+            for rows in batches:
+                df = pd.concat([df, pd.DataFrame({'time': self.times[rows], 'value': self.values[rows]})], ignore_index=True)
+                fig.clear()
+                Line(x = 'time', y = 'value', df = df.tail(self.window)).plot(fig=fig)
+                fig.canvas.draw()
+            return
+
+        chart = StreamingLine(x = 'time', y = 'value', capacity = self.window)
+        chart.plot(fig=fig)
+        for rows in batches:
+            if self.method == 'append':
+                for time_value, value in zip(self.times[rows], self.values[rows]):
+                    chart.append(time_value, value)
+            else:
+                chart.extend(self.times[rows], self.values[rows])
+            chart.update()
+
+
+CACHE_CHARTS = {
+    'bar': lambda rows: Bar(x = 'team_x', y = 'goals_scored', df = season_team(rows)),
+    'scatter': lambda rows: Scatter(x = 'minutes', y = 'influence', df = season_players(rows), category_column = 'position'),
+}
+
+
+class CachedRender:
+    # The same chart asked for again: rendered from scratch ('none'), only hashed ('key') or read back from a warm cache
+    def __init__(self, chart, cache):
+        self.chart, self.cache = chart, cache
+        self.store = None
+        if cache == 'memory':
+            self.store = RenderCache()
+        elif cache == 'disk':
+            self.store = RenderCache(directory = os.path.join(files_directory().name, 'cache'), memory = False)
+        if self.store is not None:
+            self.store.render(chart, title='Cached')
+
+    def plot(self, fig):
+        if self.cache == 'none':
+            self.chart.render(title='Cached')
+        elif self.cache == 'key':
+            render_key(self.chart, {'title': 'Cached'})
+        else:
+            self.store.render(self.chart, title='Cached')
+
+
+FACET_CHARTS = {
+    'scatter': (Scatter, {'x': 'influence', 'y': 'threat', 'category_column': 'position'}),
+    'line': (Line, {'x': 'minute', 'y': 'influence'}),
+}
+
+
+def faceted(facets, p):
+    chart, chart_kwargs = FACET_CHARTS[p['chart']]
+    df = panels(p['panels'])
+    return lambda: facets(chart, df = df, facet_column = 'player', **chart_kwargs)
+
+
+# Each case builds (chart, plot kwargs) from one set of parameters, with a parameter grid per preset. Cases that time
+# building the chart from its data, such as aggregating, give a function that makes the chart instead
+CASES = {
+    'bar': (
+        lambda p: (Bar(x = 'team_x', y = 'goals_scored', df = season_team(p['groups'])), {}),
+        {'quick': grid(groups=[20, 200]), 'full': grid(groups=[20, 200, 1000])},
+    ),
+    'bar_category_units': (
+        lambda p: (CategoryUnits(season_team(p['groups']), 'team_x', 'goals_scored'), {}),
+        {'quick': grid(groups=[20, 200]), 'full': grid(groups=[20, 200, 1000])},
+    ),
+    'bar_categories': (
+        lambda p: (Bar(x = 'team_x', y = 'goals_scored', df = season_team(p['groups'], n_categories=p['categories']), category_column = 'division'), {'colour_palette': PALETTE}),
+        {'quick': grid(groups=[200], categories=[4, 50]), 'full': grid(groups=[200, 1000], categories=[4, 50, 500])},
+    ),
+    'bar_ranges': (
+        lambda p: (Bar(x = 'team_x', y = 'goals_scored', df = season_team(p['groups']), category_column = 'goals_scored',
+                       category_list = [f'Band {i}' for i in range(p['ranges'])], custom_ranges = list(np.linspace(25, 105, p['ranges'] + 1))), {'colour_palette': PALETTE}),
+        {'quick': grid(groups=[200], ranges=[3, 8]), 'full': grid(groups=[200, 1000], ranges=[3, 8])},
+    ),
+    'stacked_bar': (
+        lambda p: (StackedBar(x = 'team_x', y = team_series(p), df = season_team(p['groups'], p['series'])), {'colour_palette': PALETTE}),
+        {'quick': grid(groups=[20, 200], series=[3, 10]), 'full': grid(groups=[20, 500, 2000], series=[3, 10, 50])},
+    ),
+    'horizontal_stacked_bar': (
+        lambda p: (HorizontalStackedBar(x = 'team_x', y = team_series(p), df = season_team(p['groups'], p['series'])), {'colour_palette': PALETTE}),
+        {'quick': grid(groups=[20, 200], series=[3, 10]), 'full': grid(groups=[20, 500, 2000], series=[3, 10, 50])},
+    ),
+    'stacked_bar_every_label': (
+        lambda p: (EveryLabel(StackedBar(x = 'team_x', y = team_series(p), df = season_team(p['groups'], p['series']))), {'colour_palette': PALETTE}),
+        {'quick': grid(groups=[200], series=[3]), 'full': grid(groups=[500, 2000], series=[3])},
+    ),
+    'stacked_bar_per_series': (
+        lambda p: (BarPerSeries(season_team(p['groups'], p['series']), 'team_x', team_series(p)), {'colour_palette': PALETTE}),
+        {'quick': grid(groups=[200], series=[10]), 'full': grid(groups=[200, 2000], series=[10, 50])},
+    ),
+    'grouped_bar': (
+        lambda p: (GroupedBar(x = 'team_x', y = team_series(p), df = season_team(p['groups'], p['series'])), {'colour_palette': PALETTE}),
+        {'quick': grid(groups=[20, 200], series=[3, 10]), 'full': grid(groups=[20, 500, 2000], series=[3, 10, 50])},
+    ),
+    'bar_aggregate': (
+        lambda p: (aggregated(Bar, 'goals_scored', p), {}),
+        {'quick': grid(rows=[1_000_000], teams=[20_000], agg=['sum', 'mean', 'count', 0.9]),
+         'full': grid(rows=[1_000_000, 10_000_000], teams=[20_000], agg=['sum', 'mean', 'count', 0.9])},
+    ),
+    'grouped_bar_aggregate': (
+        lambda p: (aggregated(GroupedBar, ['goals_scored', 'assists'], p), {'colour_palette': PALETTE}),
+        {'quick': grid(rows=[1_000_000], teams=[20_000], agg=['mean']), 'full': grid(rows=[1_000_000, 10_000_000], teams=[20_000], agg=['mean'])},
+    ),
+    'bar_groupby': (
+        lambda p: (groupby_bars(p), {}),
+        {'quick': grid(rows=[1_000_000], teams=[20_000], bars=[2_000]), 'full': grid(rows=[1_000_000, 10_000_000], teams=[20_000], bars=[2_000])},
+    ),
+    'line_adapters': (
+        lambda p: (adapted(Line, p, x = 'timestamp', y = 'metric_0'), {'downsample': 'minmax'}),
+        {'quick': grid(rows=[2_000_000], columns=[20], source=ADAPTER_SOURCES), 'full': grid(rows=[2_000_000, 10_000_000], columns=[20], source=ADAPTER_SOURCES)},
+    ),
+    'scatter_adapters': (
+        lambda p: (adapted(Scatter, p, x = 'metric_0', y = 'metric_1'), {'density': True}),
+        {'quick': grid(rows=[2_000_000], columns=[20], source=ADAPTER_SOURCES), 'full': grid(rows=[2_000_000, 10_000_000], columns=[20], source=ADAPTER_SOURCES)},
+    ),
+    'bar_file': (
+        lambda p: (from_file(Bar, p, x = 'region', y = 'sales', agg = 'sum', top_n = 10), {}),
+        {'quick': grid(rows=[1_000_000], format=['csv', 'parquet'], source=['from_file', 'pandas']),
+         'full': grid(rows=[1_000_000, 5_000_000], format=['csv', 'parquet'], source=['from_file', 'pandas'])},
+    ),
+    'scatter_file': (
+        lambda p: (from_file(Scatter, p, x = 'price', y = 'units'), {'density': True}),
+        {'quick': grid(rows=[1_000_000], format=['csv', 'parquet'], source=['from_file', 'pandas']),
+         'full': grid(rows=[1_000_000, 5_000_000], format=['csv', 'parquet'], source=['from_file', 'pandas'])},
+    ),
+    'facets': (
+        lambda p: (faceted(Facets, p), {}),
+        {'quick': grid(panels=[4, 16], chart=['scatter', 'line']), 'full': grid(panels=[4, 16, 64], chart=['scatter', 'line'])},
+    ),
+    'facets_panel_by_panel': (
+        lambda p: (faceted(PanelByPanel, p), {}),
+        {'quick': grid(panels=[4, 16], chart=['scatter', 'line']), 'full': grid(panels=[4, 16, 64], chart=['scatter', 'line'])},
+    ),
+    'grouped_bar_every_label': (
+        lambda p: (EveryLabel(GroupedBar(x = 'team_x', y = team_series(p), df = season_team(p['groups'], p['series']))), {'colour_palette': PALETTE}),
+        {'quick': grid(groups=[200], series=[3]), 'full': grid(groups=[500, 2000], series=[3])},
+    ),
+    'line': (
+        lambda p: (Line(x = 'GW', y = list(gameweeks(2, p['series']).columns[1:]), df = gameweeks(p['rows'], p['series'])), {'colour_palette': PALETTE, 'downsample': p['downsample']}),
+        {'quick': grid(rows=[10_000, 1_000_000], series=[1, 4], downsample=[None, 'minmax', 'lttb']),
+         'full': grid(rows=[10_000, 1_000_000, 10_000_000], series=[1, 4, 16], downsample=[None, 'minmax', 'lttb'])},
+    ),
+    'scatter': (
+        lambda p: (Scatter(x = 'minutes', y = 'influence', df = season_players(p['rows'], max(p['categories'], 1)),
+                           category_column = 'position' if p['categories'] else None), {'colour_palette': PALETTE}),
+        {'quick': grid(rows=[10_000, 100_000], categories=[0, 4]), 'full': grid(rows=[10_000, 100_000, 1_000_000], categories=[0, 4, 20, 200])},
+    ),
+    'scatter_density': (
+        lambda p: (Scatter(x = 'minutes', y = 'influence', df = season_players(p['rows'], max(p['categories'], 1)),
+                           category_column = 'position' if p['categories'] else None), {'colour_palette': PALETTE, 'density': True}),
+        {'quick': grid(rows=[2_000_000], categories=[0, 4]), 'full': grid(rows=[2_000_000, 20_000_000], categories=[0, 4, 20])},
+    ),
+    'colour_mapping': (
+        lambda p: (ColourRows(colour_chart(p), p['mapping']), {}),
+        {'quick': grid(rows=[1_000_000], column=['categories', 'ranges'], mapping=['codes', 'dict']),
+         'full': grid(rows=[1_000_000, 10_000_000], column=['categories', 'ranges'], mapping=['codes', 'dict'])},
+    ),
+    'update': (
+        lambda p: (Refreshes(p), {}),
+        {'quick': grid(chart=['line', 'scatter', 'stacked_bar'], method=['update', 'blit', 'replot']),
+         'full': grid(chart=['line', 'scatter', 'stacked_bar'], method=['update', 'blit', 'blit_fixed_axes', 'replot'])},
+    ),
+    'streaming': (
+        lambda p: (Stream(p), {}),
+        {'quick': grid(points=[20_000], method=['extend', 'append', 'reslice']), 'full': grid(points=[20_000, 100_000], method=['extend', 'append', 'reslice'])},
+    ),
+    'render_cache': (
+        lambda p: (CachedRender(CACHE_CHARTS[p['chart']](p['rows']), p['cache']), {}),
+        {'quick': grid(chart=['bar'], rows=[20], cache=['none', 'key', 'memory', 'disk']) + grid(chart=['scatter'], rows=[100_000], cache=['none', 'key', 'memory', 'disk']),
+         'full': grid(chart=['bar'], rows=[20], cache=['none', 'key', 'memory', 'disk']) + grid(chart=['scatter'], rows=[100_000, 10_000_000], cache=['none', 'key', 'memory', 'disk'])},
+    ),
+}
+
+
+def case_id(name, params):
+    return name + '[' + ','.join(f'{key}={value}' for key, value in params.items()) + ']'
+
+
+def count_artists(fig):
+    return sum(len(ax.patches) + len(ax.lines) + len(ax.collections) + len(ax.images) for ax in fig.axes)
+
+
+def run_phases(build, traced, layout = 'constrained'):
+    # Runs plot -> draw -> png once, measuring each phase on its own
+    results = {}
+    state = {}
+
+    def plot():
+        chart, plot_kwargs = build()
+        if callable(chart):
+            chart = chart()
+        if isinstance(chart, (Facets, PanelByPanel)):
+            # Small multiples size their figure to the number of panels
+            state['fig'] = chart.plot(layout=layout, **plot_kwargs)
+        else:
+            state['fig'] = new_figure(layout=layout)
+            chart.plot(fig=state['fig'], **plot_kwargs)
+
+    def draw():
+        state['fig'].canvas.draw()
+
+    def png():
+        state['fig'].savefig(io.BytesIO(), format='png')
+
+    # Arrow allocates through its own memory pool, out of tracemalloc's sight, so a proxy pool tracks its peak
+    pa = sys.modules.get('pyarrow') if traced else None
+    for phase, function in zip(PHASES, (plot, draw, png)):
+        if traced:
+            tracemalloc.start()
+            if pa is not None:
+                default_pool = pa.default_memory_pool()
+                pool = pa.proxy_memory_pool(default_pool)
+                pa.set_memory_pool(pool)
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if traced:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            if pa is not None:
+                pa.set_memory_pool(default_pool)
+                peak += pool.max_memory()
+            results[phase] = peak / 1e6
+        else:
+            results[phase] = elapsed
+
+    return results, count_artists(state['fig'])
+
+
+def run_case(name, params, repeat, layout = 'constrained'):
+    factory = CASES[name][0]
+    # Data is generated up front so only the chart itself is measured
+    chart, plot_kwargs = factory(params)
+
+    timings = {phase: [] for phase in PHASES}
+    for _ in range(repeat):
+        seconds, artists = run_phases(lambda: (chart, plot_kwargs), traced=False, layout=layout)
+        for phase in PHASES:
+            timings[phase].append(seconds[phase])
+
+    # tracemalloc slows everything down, so memory is measured on a separate run
+    peaks, _ = run_phases(lambda: (chart, plot_kwargs), traced=True, layout=layout)
+
+    return {
+        'id': case_id(name, params),
+        'case': name,
+        'params': params,
+        'artists': artists,
+        'phases': {
+            phase: {
+                'median_s': statistics.median(timings[phase]),
+                'min_s': min(timings[phase]),
+                'peak_mb': peaks[phase],
+            }
+            for phase in PHASES
+        },
+    }
+
+
+def environment():
+    try:
+        from importlib.metadata import version
+        speedy_charts_version = version('speedy-charts')
+    except Exception:
+        speedy_charts_version = None
+
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+        'speedy_charts': speedy_charts_version,
+    }
+
+
+def run(args):
+    results = []
+    for name in CASES:
+        if args.filter and not any(pattern in name for pattern in args.filter):
+            continue
+        for params in CASES[name][1][args.preset]:
+            try:
+                result = run_case(name, params, args.repeat, args.layout)
+            except ImportError as error:
+                # Cases for optional data sources need their library installed
+                print(f"{case_id(name, params):<62} skipped, {error}", flush=True)
+                continue
+            results.append(result)
+            phases = '  '.join(f"{phase} {result['phases'][phase]['median_s'] * 1000:8.1f}ms {result['phases'][phase]['peak_mb']:7.1f}MB" for phase in PHASES)
+            print(f"{result['id']:<62} {phases}  artists {result['artists']:>7,}", flush=True)
+
+    report = {'environment': environment(), 'preset': args.preset, 'repeat': args.repeat, 'layout': args.layout, 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved {len(results)} results to {args.output}")
+    return 0
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = {result['id']: result for result in json.load(f)['results']}
+    with open(args.current) as f:
+        current = {result['id']: result for result in json.load(f)['results']}
+
+    regressions = 0
+    for case in current:
+        if case not in baseline:
+            continue
+        cells = []
+        for phase in PHASES:
+            # The fastest run is the least affected by other load on the machine
+            before = baseline[case]['phases'][phase]['min_s']
+            after = current[case]['phases'][phase]['min_s']
+            ratio = after / before if before else float('inf')
+            flag = ''
+            # Tiny phases are mostly noise, so only flag slowdowns that are also over a millisecond
+            if ratio > 1 + args.threshold and after - before > 0.001:
+                flag = ' !'
+                regressions += 1
+            cells.append(f"{phase} {ratio:5.2f}x{flag:<2}")
+        artists = f"artists {baseline[case]['artists']:>7,} -> {current[case]['artists']:<7,}"
+        print(f"{case:<62} {'  '.join(cells)}  {artists}")
+
+    missing = sorted(set(baseline) - set(current))
+    if missing:
+        print(f"{len(missing)} baseline cases were not run: {', '.join(missing)}")
+    print(f"{regressions} phases slower than the baseline by more than {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description='Time every chart type across data sizes and compare runs')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--preset', choices=['quick', 'full'], default='quick', help='size of the parameter grid (default: quick)')
+    run_parser.add_argument('--repeat', type=int, default=3, help='timed runs per case, the median is reported (default: 3)')
+    run_parser.add_argument('--filter', action='append', default=[], help='only run cases whose name contains this, can be repeated')
+    run_parser.add_argument('--output', help='JSON file to save the results to')
+    run_parser.add_argument('--layout', choices=['constrained', 'fixed'], default='constrained', help='layout engine of the figures (default: constrained)')
+
+    compare_parser = commands.add_parser('compare', help='compare two saved runs')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='slowdown that counts as a regression (default: 0.1 for 10%%)')
+
+    args = parser.parse_args(argv)
+    return run(args) if args.command == 'run' else compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
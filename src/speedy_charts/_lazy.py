@@ -0,0 +1,39 @@
+import importlib
+import os
+import sys
+
+
+def select_backend():
+    # Respect a backend chosen by the caller, otherwise fall back to Agg on machines without a display
+    if 'matplotlib.pyplot' in sys.modules or os.environ.get('MPLBACKEND'):
+        return
+
+    import matplotlib
+
+    get_backend = getattr(matplotlib.rcParams, '_get_backend_or_none', None)
+    if get_backend is None or get_backend() is not None:
+        return
+
+    if sys.platform.startswith('linux') and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        matplotlib.use('Agg')
+
+
+class LazyModule:
+    # Placeholder for a module that is only imported the first time one of its attributes is used
+    def __init__(self, name, before_import = None):
+        self._name = name
+        self._before_import = before_import
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            if self._before_import is not None:
+                self._before_import()
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return f"<lazy module '{self._name}'>"
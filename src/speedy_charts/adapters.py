@@ -0,0 +1,79 @@
+from ._lazy import LazyModule
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+
+def chart_columns(x, y, category_column = None):
+    # Columns a chart reads, in order and without repeats
+    columns = [x] + (list(y) if type(y) == list else [y])
+    if category_column is not None:
+        columns.append(category_column)
+    return list(dict.fromkeys(columns))
+
+
+def _library(data):
+    return type(data).__module__.split('.')[0]
+
+
+def _arrow_column(column):
+    # Numeric columns without nulls in a single chunk are a view of the Arrow buffer, anything else is wrapped rather than converted
+    import pyarrow as pa
+
+    if isinstance(column, pa.ChunkedArray) and column.num_chunks == 1:
+        column = column.chunk(0)
+    if isinstance(column, pa.Array) and column.null_count == 0 and (pa.types.is_integer(column.type) or pa.types.is_floating(column.type) or pa.types.is_boolean(column.type) or pa.types.is_temporal(column.type)):
+        try:
+            return column.to_numpy(zero_copy_only=True)
+        except (pa.ArrowInvalid, NotImplementedError):
+            pass
+    return pd.arrays.ArrowExtensionArray(column if isinstance(column, pa.ChunkedArray) else pa.chunked_array([column]))
+
+
+def _polars_column(series):
+    if series.null_count() == 0 and (series.dtype.is_numeric() or series.dtype.is_temporal()):
+        try:
+            return series.to_numpy(allow_copy=False)
+        except RuntimeError:
+            pass
+    return _arrow_column(series.to_arrow())
+
+
+def _columns(data, columns):
+    # The chart's columns from any supported input, as arrays that share memory with it where possible
+    library = _library(data)
+    if library == 'polars':
+        names = data.columns
+        get = lambda name: _polars_column(data.get_column(name))
+    elif library == 'pyarrow':
+        names = data.column_names if hasattr(data, 'column_names') else data.schema.names
+        get = lambda name: _arrow_column(data.column(name))
+    elif isinstance(data, np.ndarray):
+        if data.dtype.names is None:
+            raise ValueError("A NumPy array needs named fields to be used as a dataframe, pass a structured array or a dict of arrays")
+        names = data.dtype.names
+        get = lambda name: data[name]
+    elif hasattr(data, 'keys'):
+        names = list(data.keys())
+        get = lambda name: np.asarray(data[name])
+    else:
+        raise ValueError(f"Unsupported data type {type(data).__name__}, use a pandas, Polars or Arrow dataframe, a structured NumPy array or a dict of arrays")
+
+    missing = [column for column in columns if column not in names]
+    if missing:
+        raise ValueError(f"The data has no column{'s' if len(missing) > 1 else ''} {', '.join(map(repr, missing))}")
+    return {column: get(column) for column in columns}
+
+
+def as_frame(data, columns):
+    # A pandas dataframe of only the columns a chart needs, pandas dataframes themselves are passed through untouched
+    if data is None or isinstance(data, pd.DataFrame):
+        return data
+
+    arrays = _columns(data, columns)
+    lengths = {len(values) for values in arrays.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"All columns need the same length, got lengths {sorted(lengths)}")
+
+    # One block per column, so pandas keeps the arrays as they are instead of copying them into a 2D block
+    return pd.DataFrame({column: pd.Series(values, copy=False) for column, values in arrays.items()}, copy=False)
@@ -0,0 +1,154 @@
+from ._lazy import LazyModule
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+# Bar width used by matplotlib's ax.bar/ax.barh
+DEFAULT_BAR_WIDTH = 0.8
+
+# Aggregations Bar and GroupedBar can apply to long format data, a number between 0 and 1 takes that quantile instead
+AGGREGATIONS = ('sum', 'mean', 'count', 'min', 'max', 'median')
+
+
+def series_matrix(df, columns):
+    # All y-axis values as one (n_groups, n_series) float array, missing values become NaN
+    return df[list(columns)].to_numpy(dtype=float, na_value=np.nan)
+
+
+def stack_offsets(values):
+    # Where each segment of a stack starts, from a single cumulative sum across the series
+    filled = np.nan_to_num(values, nan=0.0)
+    return np.cumsum(filled, axis=1) - filled
+
+
+def group_positions(groups):
+    # Numeric groups keep their values as positions, anything else is hashed once and placed at 0, 1, 2, ... in order of
+    # appearance and labelled with ticks, repeated groups share a position and missing groups are left out (NaN)
+    groups = pd.Index(groups)
+    if pd.api.types.is_numeric_dtype(groups) and not pd.api.types.is_bool_dtype(groups):
+        return groups.to_numpy(dtype=float), None
+    codes, uniques = pd.factorize(groups)
+    positions = codes.astype(float)
+    positions[codes < 0] = np.nan
+    return positions, [str(group) for group in uniques]
+
+
+def bar_positions(groups):
+    # Positions for ax.bar, dates are passed through for matplotlib's date axis and everything else goes through group_positions
+    if pd.api.types.infer_dtype(groups, skipna=True) in ('datetime64', 'datetime', 'date'):
+        return groups, None
+    return group_positions(groups)
+
+
+def bar_vertices(positions, starts, lengths, width = DEFAULT_BAR_WIDTH, horizontal = False):
+    # Corners of every bar as an (n_bars, 4, 2) array, bars with a missing value are left out
+    positions = np.asarray(positions, dtype=float)
+    starts = np.asarray(starts, dtype=float)
+    lengths = np.asarray(lengths, dtype=float)
+
+    keep = np.isfinite(positions) & np.isfinite(starts) & np.isfinite(lengths)
+    low = positions[keep] - width / 2
+    high = low + width
+    start = starts[keep]
+    end = start + lengths[keep]
+
+    vertices = np.empty((len(low), 4, 2))
+    vertices[:, 0] = np.column_stack([low, start])
+    vertices[:, 1] = np.column_stack([low, end])
+    vertices[:, 2] = np.column_stack([high, end])
+    vertices[:, 3] = np.column_stack([high, start])
+
+    if horizontal:
+        vertices = vertices[..., ::-1]
+    return vertices
+
+
+def _quantile(agg):
+    # The quantile an aggregation asks for, None for the other aggregations
+    if isinstance(agg, str):
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation '{agg}', use one of {', '.join(AGGREGATIONS)} or a quantile between 0 and 1")
+        return 0.5 if agg == 'median' else None
+    if isinstance(agg, (int, float)) and not isinstance(agg, bool) and 0 <= agg <= 1:
+        return float(agg)
+    raise ValueError(f"Unknown aggregation {agg!r}, use one of {', '.join(AGGREGATIONS)} or a quantile between 0 and 1")
+
+
+def combine_groups(agg, table, tail, sums = None, counts = None):
+    # The 'Other' bar from the results of the groups it replaces, which works for every aggregation except quantiles
+    if agg == 'mean':
+        return sums.iloc[tail].sum() / counts.iloc[tail].sum()
+    if agg in ('sum', 'count'):
+        return table.iloc[tail].sum()
+    return table.iloc[tail].agg(agg)
+
+
+def fold_groups(table, labels, x, value_columns, top_n = None, other_label = 'Other', text_category = None, other = None):
+    # Dataframe of one row per bar from a table of one row per group, other(tail) gives the values of the 'Other' bar
+    if top_n is None:
+        table.index = pd.Index(labels, name=x)
+        return table.reset_index()
+
+    # Largest bars first, ties keep the order the groups first appear in
+    order = np.argsort(-table[value_columns].sum(axis=1).to_numpy(), kind='stable')
+    top, tail = order[:top_n], order[top_n:]
+    if len(tail) == 0:
+        table = table.iloc[top]
+        table.index = pd.Index([labels[i] for i in top], name=x)
+        return table.reset_index()
+
+    values = other(tail)
+    if text_category is not None:
+        values[text_category] = other_label
+
+    # Labels become strings so numeric groups and the 'Other' label can share one axis
+    table = pd.concat([table.iloc[top], pd.DataFrame([values], columns=table.columns).astype(table.dtypes.to_dict())])
+    table.index = pd.Index([str(labels[i]) for i in top] + [other_label], name=x)
+    return table.reset_index()
+
+
+def category_columns(df, x, value_columns, category_column = None):
+    # Columns aggregated for each bar and the text category carried along with them, df can be the first chunk of a file
+    # Colouring each bar by its own group needs no extra column, x already holds the category once the table is built
+    if category_column == x:
+        category_column = None
+    numeric_category = category_column is not None and pd.api.types.is_numeric_dtype(df[category_column])
+    # Numeric categories are coloured by range, so they are aggregated the same way as the bars
+    columns = value_columns + [category_column] if numeric_category and category_column not in value_columns else value_columns
+    text_category = category_column if category_column is not None and not numeric_category else None
+    return columns, text_category
+
+
+def aggregate_bars(df, x, y, agg = 'sum', top_n = None, other_label = 'Other', category_column = None):
+    # One row per bar from long format data, everything past the top_n largest bars is folded into a single 'Other' bar
+    if top_n is not None and top_n < 1:
+        raise ValueError(f"top_n must be at least 1, got {top_n}")
+    quantile = _quantile(agg)
+
+    value_columns = list(y) if type(y) == list else [y]
+    columns, text_category = category_columns(df, x, value_columns, category_column)
+
+    # Groups are hashed once, every aggregation then works on the integer codes, rows with a missing x are dropped (-1)
+    codes, groups = pd.factorize(df[x])
+    grouped = df[columns].groupby(codes, sort=True)
+    sums = counts = None
+    if quantile is not None:
+        table = grouped.quantile(quantile)
+    elif agg == 'mean':
+        sums, counts = grouped.sum(), grouped.count()
+        table = sums / counts
+    else:
+        table = grouped.agg(agg)
+    table = table.drop(index=-1, errors='ignore')
+    if sums is not None:
+        sums, counts = sums.drop(index=-1, errors='ignore'), counts.drop(index=-1, errors='ignore')
+
+    if text_category is not None:
+        table[text_category] = df[text_category].groupby(codes, sort=True).first().drop(index=-1, errors='ignore')
+
+    def other(tail):
+        if quantile is not None:
+            return df.loc[np.isin(codes, tail), columns].quantile(quantile)
+        return combine_groups(agg, table[columns], tail, sums, counts)
+
+    return fold_groups(table, list(groups), x, value_columns, top_n, other_label, text_category, other)
@@ -0,0 +1,171 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import traceback
+
+from ._lazy import LazyModule
+from .cache import RenderCache
+from .figures import FigurePool
+from .themes import DEFAULT_THEME
+
+pd = LazyModule('pandas')
+
+# Spec keys which are not passed on to the chart constructor
+_SPEC_KEYS = ('chart', 'df', 'plot', 'output', 'format', 'dpi', 'layout')
+
+# Dataframes and render cache shared with the worker processes, and the figures each one reuses, set once per worker by _init_worker
+_worker_dataframes = {}
+_worker_cache = None
+_worker_figures = None
+
+
+class BatchResult:
+    def __init__(self, index, output = None, data = None, error = None):
+        self.index = index
+        self.output = output
+        self.data = data
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"BatchResult(index={self.index}, error={self.error.strip().splitlines()[-1]!r})"
+        if self.output is not None:
+            return f"BatchResult(index={self.index}, output={self.output!r})"
+        return f"BatchResult(index={self.index}, bytes={len(self.data)})"
+
+
+def _init_worker(dataframes, theme, cache = None):
+    global _worker_dataframes, _worker_cache, _worker_figures
+    _worker_dataframes = dataframes or {}
+    _worker_cache = cache
+    _worker_figures = FigurePool()
+
+    # Warm the worker up front so the first chart in each process doesn't pay for imports, fonts and theme loading
+    with _worker_figures.figure(theme=theme) as fig:
+        fig.canvas.draw()
+
+
+def _render_spec(index, spec, dataframes, cache = None, pool = None):
+    from . import charts
+
+    try:
+        chart_name = spec['chart']
+        chart_class = getattr(charts, chart_name, None)
+        if not isinstance(chart_class, type) or not issubclass(chart_class, charts.CreateChart):
+            raise ValueError(f"Unknown chart type '{chart_name}'")
+
+        df = spec.get('df')
+        if isinstance(df, str):
+            if df not in dataframes:
+                raise ValueError(f"No dataframe called '{df}' was passed to render_batch")
+            df = dataframes[df]
+
+        chart_kwargs = {key: value for key, value in spec.items() if key not in _SPEC_KEYS}
+        plot_kwargs = dict(spec.get('plot') or {})
+        output = spec.get('output')
+        if output is not None:
+            directory = os.path.dirname(output)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        chart = chart_class(df=df, **chart_kwargs)
+        data = chart.render(format=spec.get('format'), dpi=spec.get('dpi'), to=output, cache=cache, layout=spec.get('layout', 'constrained'), pool=pool, **plot_kwargs)
+
+        if output is not None:
+            return BatchResult(index, output=output)
+        return BatchResult(index, data=data)
+
+    except Exception:
+        return BatchResult(index, error=traceback.format_exc())
+
+
+def _worker_render(task):
+    index, spec = task
+    return _render_spec(index, spec, _worker_dataframes, _worker_cache, _worker_figures)
+
+
+def render_batch(specs, dataframes = None, processes = None, chunksize = None, theme = DEFAULT_THEME, cache = None):
+    specs = list(specs)
+    dataframes = dataframes or {}
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(specs)))
+
+    # Render in this process when there is nothing to gain from a pool
+    if processes == 1:
+        pool = FigurePool()
+        return [_render_spec(index, spec, dataframes, cache, pool) for index, spec in enumerate(specs)]
+
+    # Forked workers inherit the dataframes without pickling them, spawned workers receive one copy each. macOS offers fork as
+    # well, but children forked from a process whose system frameworks started threads can crash, so only Linux forks
+    context = multiprocessing.get_context('fork' if sys.platform.startswith('linux') else None)
+
+    if chunksize is None:
+        chunksize = max(1, len(specs) // (processes * 4))
+
+    results = [None] * len(specs)
+    with context.Pool(processes, initializer=_init_worker, initargs=(dataframes, theme, cache)) as pool:
+        for result in pool.imap_unordered(_worker_render, enumerate(specs), chunksize=chunksize):
+            results[result.index] = result
+
+    return results
+
+
+def _read_specs(path):
+    with open(path) as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _read_dataframe(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, low_memory=False)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog='speedy-charts-batch', description='Render a batch of chart specs across a process pool')
+    parser.add_argument('specs', help='JSON list or JSON lines file of chart specs')
+    parser.add_argument('--data', action='append', default=[], metavar='NAME=PATH', help='CSV or Parquet file made available to the specs under NAME')
+    parser.add_argument('--processes', type=int, default=None, help='number of worker processes (default: all cores)')
+    parser.add_argument('--chunksize', type=int, default=None, help='specs sent to a worker at a time')
+    parser.add_argument('--cache-dir', default=None, help='directory for cached renders, unchanged charts are copied from it instead of drawn again')
+    parser.add_argument('--cache-size', type=int, default=1024, help='size limit of the cache directory in MB (default: 1024)')
+    args = parser.parse_args(argv)
+
+    dataframes = {}
+    for item in args.data:
+        name, sep, path = item.partition('=')
+        if not sep:
+            parser.error(f"--data expects NAME=PATH, got '{item}'")
+        dataframes[name] = _read_dataframe(path)
+
+    specs = _read_specs(args.specs)
+    for index, spec in enumerate(specs):
+        if not spec.get('output'):
+            parser.error(f"Spec {index} has no output path")
+
+    cache = None
+    if args.cache_dir is not None:
+        cache = RenderCache(directory=args.cache_dir, max_disk_bytes=args.cache_size * 1024 * 1024)
+
+    results = render_batch(specs, dataframes=dataframes, processes=args.processes, chunksize=args.chunksize, cache=cache)
+
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        print(f"Spec {result.index} failed:\n{result.error}", file=sys.stderr)
+    print(f"Rendered {len(results) - len(failed)} of {len(results)} charts")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
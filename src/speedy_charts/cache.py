@@ -0,0 +1,257 @@
+import functools
+import hashlib
+import importlib.metadata
+import inspect
+import os
+import threading
+from collections import OrderedDict
+
+from ._lazy import LazyModule
+from .adapters import chart_columns
+from .export import RASTERIZE_THRESHOLD, VECTOR_FORMATS
+from .palettes import palette_kind, resolve_palette
+from .themes import compile_theme
+
+mpl = LazyModule('matplotlib')
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+# Part of every key, bump it whenever a change to the library alters the images charts produce
+CACHE_VERSION = 1
+
+# Chart attributes which decide what gets drawn, the dataframe itself is hashed column by column
+_CHART_ATTRIBUTES = ('x', 'y', 'category_column', 'category_list', 'custom_ranges', 'agg', 'top_n', 'other_label')
+
+
+@functools.lru_cache(maxsize=None)
+def _package_version():
+    # None when running from a source checkout that was never installed
+    try:
+        return importlib.metadata.version('speedy-charts')
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _hash_values(digest, values):
+    # Numeric columns are hashed straight from their memory, anything else by value through pandas' vectorised hashes,
+    # so the same text gives the same key whether it came from pandas, Arrow, Polars or NumPy
+    if not isinstance(values, pd.Series) or isinstance(values.dtype, np.dtype):
+        array = np.asarray(values)
+        if array.dtype.kind in 'biufcmM':
+            digest.update(f'{array.dtype}{array.shape}'.encode())
+            digest.update(np.ascontiguousarray(array).view(np.uint8))
+            return
+
+    objects = values.to_numpy(dtype=object) if isinstance(values, pd.Series) else np.asarray(values, dtype=object).ravel()
+    digest.update(f'object{objects.shape}'.encode())
+    digest.update(pd.util.hash_array(objects))
+
+
+def render_key(chart, plot_kwargs = None, file_format = 'png', dpi = None, rasterize_threshold = RASTERIZE_THRESHOLD, layout = 'constrained'):
+    # Content hash of everything that changes the rendered bytes: chart type, data actually used, plot arguments, theme and output settings
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f'{type(chart).__module__}.{type(chart).__qualname__}|{CACHE_VERSION}|{_package_version()}|{mpl.__version__}|{file_format}|{dpi}|{layout}'.encode())
+    if file_format in VECTOR_FORMATS:
+        digest.update(f'|rasterize_threshold={rasterize_threshold}'.encode())
+
+    for name in _CHART_ATTRIBUTES:
+        digest.update(f'|{name}={getattr(chart, name, None)!r}'.encode())
+
+    binned = getattr(chart, '_binned', None)
+    if chart.df is not None:
+        for column in chart_columns(chart.x, chart.y, getattr(chart, 'category_column', None)):
+            digest.update(f'|column={column!r}'.encode())
+            _hash_values(digest, chart.df[column])
+    elif binned is not None:
+        # Charts plotted from a file only hold their binned counts
+        counts, extent, categories = binned
+        digest.update(f'|extent={tuple(map(float, extent))!r}|categories={categories!r}'.encode())
+        _hash_values(digest, counts)
+    else:
+        # Lists and arrays, or the ring buffers of a streaming chart
+        x_values, y_values = chart._cache_data()
+        _hash_values(digest, x_values)
+        _hash_values(digest, y_values)
+
+    # Fill in the defaults so leaving an argument out and passing its default give the same key
+    arguments = inspect.signature(chart.plot).bind_partial(**(plot_kwargs or {}))
+    arguments.apply_defaults()
+    for name, value in sorted(arguments.arguments.items()):
+        if name == 'colour_palette':
+            # The same colours are stretched differently once they are registered as a sequential or diverging palette
+            value = resolve_palette(value)
+            if isinstance(value, (list, tuple)):
+                value = (value, palette_kind(value))
+        elif name == 'theme':
+            value = sorted(compile_theme(value).items()) if value is not None else None
+        digest.update(f'|{name}={value!r}'.encode())
+
+    return digest.hexdigest()
+
+
+class RenderCache:
+    # Encoded charts keyed by render_key, held in memory and/or on disk and evicted least recently used first
+    def __init__(self, max_bytes = 256 * 1024 * 1024, directory = None, max_disk_bytes = 1024 * 1024 * 1024, memory = True):
+        self.max_bytes = max_bytes if memory else 0
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._size = 0
+        self._disk_size = None
+        self._lock = threading.Lock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __getstate__(self):
+        # Worker processes share the disk cache but start with an empty memory cache
+        state = self.__dict__.copy()
+        state.update(_entries=OrderedDict(), _size=0, _disk_size=None, _lock=None, hits=0, disk_hits=0, misses=0, evictions=0)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries or (self.directory is not None and os.path.exists(self._path(key)))
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._store_memory(key, data)
+        return data
+
+    def put(self, key, data):
+        with self._lock:
+            self._store_memory(key, data)
+        self._write_disk(key, data)
+
+    def _store_memory(self, key, data):
+        # Entries bigger than the whole budget are left to the disk cache
+        if len(data) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        self._entries[key] = data
+        self._size += len(data)
+
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def _read_disk(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        # The modification time doubles as the last use for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _write_disk(self, key, data):
+        if self.directory is None or len(data) > self.max_disk_bytes:
+            return
+
+        # Write then rename so other processes never read half a file
+        path = self._path(key)
+        temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = sum(entry.stat().st_size for entry in self._disk_entries())
+            else:
+                self._disk_size += len(data)
+            if self._disk_size > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _disk_entries(self):
+        return [entry for entry in os.scandir(self.directory) if entry.is_file() and not entry.name.endswith('.tmp')]
+
+    def _evict_disk(self):
+        entries = []
+        for entry in self._disk_entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+            self.evictions += 1
+        self._disk_size = size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            if self.directory is not None:
+                for entry in self._disk_entries():
+                    os.remove(entry.path)
+                self._disk_size = 0
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._size,
+            'disk_bytes': self._disk_size,
+        }
+
+    def render(self, chart, file_format = 'png', dpi = None, rasterize_threshold = RASTERIZE_THRESHOLD, layout = 'constrained', pool = None, **plot_kwargs):
+        # Encoded chart from the cache, plotting and saving it only on a miss
+        key = render_key(chart, plot_kwargs, file_format, dpi, rasterize_threshold, layout)
+        data = self.get(key)
+        if data is None:
+            data = chart.render(format=file_format, dpi=dpi, rasterize_threshold=rasterize_threshold, layout=layout, pool=pool, **plot_kwargs)
+            self.put(key, data)
+        return data
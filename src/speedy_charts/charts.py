@@ -1,398 +1,1059 @@
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
-import warnings
-from matplotlib.colors import to_rgba, ListedColormap
-import matplotlib.patches as mpatches
-from src.speedy_charts.palettes import af_categorical
+import io
+import logging
+
+from ._lazy import LazyModule, select_backend
+from .adapters import as_frame, chart_columns
+from .bars import DEFAULT_BAR_WIDTH, aggregate_bars, bar_positions, bar_vertices, group_positions, series_matrix, stack_offsets
+from .density import axes_pixel_shape, bin_points, data_extent, density_image
+from .downsample import downsample_series
+from .export import RASTERIZE_THRESHOLD, VECTOR_FORMATS, output_format, rasterize_dense_artists
+from .files import FILE_CHUNK_SIZE, group_totals, line_extremes, point_counts, read_chunks, value_extent
+from .instrumentation import span, time_layout
+from .palettes import af_categorical, can_interpolate, palette_rgba, resolve_palette
+from .streaming import RingBuffer
+from .themes import DEFAULT_THEME, theme_context
+
+# matplotlib, numpy and pandas are only imported when the first chart is plotted
+mpl = LazyModule('matplotlib')
+plt = LazyModule('matplotlib.pyplot', before_import=select_backend)
+mcollections = LazyModule('matplotlib.collections')
+mcolors = LazyModule('matplotlib.colors')
+mpatches = LazyModule('matplotlib.patches')
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+logger = logging.getLogger(__name__)
+
+
+def new_figure(theme = 'speedy_charts.mplstyles.standard_theme', layout = 'constrained', **kwargs):
+    # Figure attached to its own Agg canvas, it is never registered with pyplot's figure manager
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from .layout import figure_layout
+
+    # The layout engine is made inside the theme so it picks up the theme's settings
+    with theme_context(theme):
+        fig = Figure(layout=figure_layout(layout), **kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
 
 class CreateChart:
     def __init__(self, x, y, df = None, category_column = None, category_list = None, custom_ranges = None):
-        self.df = df
+        # Polars, Arrow, structured arrays and dicts of arrays are narrowed down to the columns the chart uses
+        self.df = as_frame(df, chart_columns(x, y, category_column)) if df is not None else None
         self.x = x
         self.y = y
         self.category_column = category_column
         self.category_list = category_list
         self.custom_ranges = custom_ranges
 
-    def _legend(self, legend = False, legend_loc = 'upper right', legend_plot_area = 'outside'):
+        # Artists drawn by the last call to plot, reused by update
+        self._ax = None
+        # Figure plot created through pyplot, closed by close or the next plot
+        self._figure = None
+        self._artists = []
+        self._plotted_categories = None
+        self._plotted_colours = None
+        # (categories, colours, row colours) worked out by Facets for the whole dataframe, used by the next plot instead of _colour_rows
+        self._preset_colours = None
+        self._background = None
+        self._blit_connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    @property
+    def figure(self):
+        return self._ax.figure if self._ax is not None else None
+
+    def close(self):
+        # Let go of the axes and artists of the last plot, and close the figure if plot created it
+        self._track(None, [])
+        self._plotted_categories = self._plotted_colours = None
+        fig = self._close_figure()
+        if fig is not None:
+            fig.clear()
+
+    def _close_figure(self):
+        # pyplot keeps every figure it made open until it is closed
+        fig, self._figure = self._figure, None
+        if fig is not None:
+            plt.close(fig)
+        return fig
+
+    def render(self, format = None, dpi = None, to = None, rasterize_threshold = RASTERIZE_THRESHOLD, cache = None, layout = 'constrained', pool = None, **plot_kwargs):
+        # Plot on a figure of its own and save it straight to a buffer or path, or return the bytes when to is None
+        file_format = output_format(format, to)
+
+        if cache is not None:
+            data = cache.render(self, file_format=file_format, dpi=dpi, rasterize_threshold=rasterize_threshold, layout=layout, pool=pool, **plot_kwargs)
+            if to is None:
+                return data
+            if hasattr(to, 'write'):
+                to.write(data)
+            else:
+                with open(to, 'wb') as f:
+                    f.write(data)
+            return to
+
+        theme = plot_kwargs.get('theme', DEFAULT_THEME)
+        fig = pool.acquire(theme=theme, layout=layout) if pool is not None else new_figure(theme=theme, layout=layout)
+        try:
+            self.plot(fig=fig, **plot_kwargs)
+
+            # Big scatters and long lines would otherwise write every point into the file
+            if file_format in VECTOR_FORMATS and rasterize_threshold is not None:
+                rasterize_dense_artists(fig, rasterize_threshold)
+
+            target = io.BytesIO() if to is None else to
+            with theme_context(theme), self._span('savefig'):
+                fig.savefig(target, format=file_format, dpi=dpi)
+        finally:
+            # The figure isn't kept anywhere, so release it straight away rather than leaving it to the garbage collector
+            self._track(None, [])
+            if pool is not None:
+                pool.release(fig)
+            else:
+                fig.clear()
+
+        return target.getvalue() if to is None else to
+
+    def update(self, df = None, x = None, y = None, blit = False):
+        # Swap in new data and redraw the existing artists instead of building the chart again
+        if self._ax is None:
+            raise ValueError("You need to plot the chart before it can be updated")
+
+        if x is not None:
+            self.x = x
+        if y is not None:
+            self.y = y
+        if df is not None:
+            self.df = as_frame(df, chart_columns(self.x, self.y, self.category_column))
+
+        ax = self._ax
+        limits = (tuple(ax.get_xlim()), tuple(ax.get_ylim()))
+        with self._span('update') as phase:
+            self._update_artists(ax)
+            self._rescale(ax)
+            phase.record(artists=len(self._artists))
+        rescaled = limits != (tuple(ax.get_xlim()), tuple(ax.get_ylim()))
+
+        if blit and ax.figure.canvas.supports_blit:
+            self._blit(ax, rescaled)
+        else:
+            self._stop_blitting()
+            ax.figure.canvas.draw_idle()
+
+        return ax
+
+    def _span(self, name):
+        # Timed phase of this chart, only recorded while a collector or callback is listening
+        rows = len(self.df) if self.df is not None else len(self.x) if hasattr(self.x, '__len__') and not isinstance(self.x, str) else None
+        return span(name, type(self).__name__, rows)
+
+    @staticmethod
+    def _read_groups(path, x, y, agg, top_n, other_label, category_column, filters, chunk_size, file_format):
+        # Totals for each group of a CSV/Parquet file, read a chunk of the chart's columns at a time
+        chunks = read_chunks(path, chart_columns(x, y, category_column), filters, chunk_size, file_format)
+        return group_totals(chunks, x, y, agg, top_n, other_label, category_column)
+
+    def _bar_frame(self):
+        # One row per bar, long format data is aggregated first when agg or top_n were given
+        if getattr(self, 'agg', None) is None and getattr(self, 'top_n', None) is None:
+            return self.df
+        if self.df is None:
+            raise ValueError("agg and top_n need a dataframe, aggregate lists/arrays before passing them to the chart")
+        return aggregate_bars(self.df, self.x, self.y, agg=self.agg or 'sum', top_n=self.top_n, other_label=self.other_label, category_column=self.category_column)
+
+    def _update_artists(self, ax):
+        raise ValueError(f"{type(self).__name__} charts can't be updated, plot the chart again instead")
+
+    def _cache_data(self):
+        # x and y values hashed by the render cache for charts plotted from lists or arrays
+        return self.x, self.y
+
+    def _track(self, ax, artists):
+        self._stop_blitting()
+        self._ax = ax
+        self._artists = list(artists)
+
+    @staticmethod
+    def _rescale(ax):
+        ax.relim()
+        # Older matplotlib releases leave collections out of relim
+        for collection in ax.collections:
+            ax.update_datalim(collection.get_datalim(ax.transData).get_points())
+        ax.autoscale_view()
+
+    def _blit(self, ax, rescaled):
+        canvas = ax.figure.canvas
+        if self._blit_connection is None:
+            # Animated artists are left out of full draws, so the saved background is everything except the data
+            for artist in self._artists:
+                artist.set_animated(True)
+            self._blit_connection = (canvas, canvas.mpl_connect('draw_event', self._capture_background))
+            rescaled = True
+
+        # New axis limits change the ticks outside the axes, which needs a full draw
+        if rescaled or self._background is None:
+            canvas.draw()
+        else:
+            canvas.restore_region(self._background)
+            self._draw_artists()
+        canvas.blit(ax.bbox)
+
+    def _capture_background(self, event):
+        self._background = event.canvas.copy_from_bbox(self._ax.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self._artists:
+            self._ax.draw_artist(artist)
+
+    def _stop_blitting(self):
+        # Animated artists don't appear in savefig, so hand them back to normal drawing
+        if self._blit_connection is not None:
+            canvas, connection = self._blit_connection
+            canvas.mpl_disconnect(connection)
+            for artist in self._artists:
+                artist.set_animated(False)
+            self._blit_connection = None
+            self._background = None
+
+    def _legend(self, ax, legend = False, legend_loc = 'upper right', legend_plot_area = 'outside'):
         if legend:
             if type(self.y) != list:
                 pass
             else:
                 if legend_plot_area == 'inside':
-                    plt.legend(loc=legend_loc)
+                    ax.legend(loc=legend_loc)
                 else:
                     if 'upper' not in legend_loc and 'lower' not in legend_loc:
-                        plt.legend(bbox_to_anchor=(1.05, 1), loc=legend_loc, borderaxespad=0)
+                        ax.legend(bbox_to_anchor=(1.05, 1), loc=legend_loc, borderaxespad=0)
 
                     elif 'upper' in legend_loc and 'lower' not in legend_loc:
-                        num_items = len(plt.gca().get_legend_handles_labels()[1])
-                        plt.legend(loc=legend_loc, bbox_to_anchor=(0.5, -0.3), ncol=num_items)
+                        num_items = len(ax.get_legend_handles_labels()[1])
+                        ax.legend(loc=legend_loc, bbox_to_anchor=(0.5, -0.3), ncol=num_items)
 
                     else:
-                        num_items = len(plt.gca().get_legend_handles_labels()[1])
-                        plt.legend(loc=legend_loc, bbox_to_anchor=(0.5, -0.2), ncol=num_items)
+                        num_items = len(ax.get_legend_handles_labels()[1])
+                        ax.legend(loc=legend_loc, bbox_to_anchor=(0.5, -0.2), ncol=num_items)
         else:
             pass
 
+    def _create_axes(self, ax = None, fig = None):
+        if ax is not None:
+            fig = ax.figure
+        elif fig is not None:
+            ax = fig.add_subplot()
+
+        # Plotting again moves the chart off its figure, which is taken out of pyplot but otherwise left as it was
+        if fig is not self._figure:
+            self._close_figure()
+        if fig is None:
+            fig, ax = plt.subplots(layout = 'constrained')
+            self._figure = fig
+
+        self._freeze_tick_style(ax)
+        time_layout(fig)
+
+        # Start from a clean slate so update never mixes artists or categories from an earlier plot
+        self._track(ax, [])
+        self._plotted_categories = self._plotted_colours = None
+
+        return fig, ax
+
+    @staticmethod
+    def _category_ticks(axis, positions, labels):
+        # Categories are labelled through a locator that leaves out labels the axis has no room for, instead of one tick each
+        from .ticks import category_ticks
+        category_ticks(axis, positions, labels)
+
+    @staticmethod
+    def _freeze_tick_style(ax):
+        # Ticks are created lazily at draw time, so copy the active theme onto the axes rather than relying on rcParams then
+        rc = mpl.rcParams
+        for axis in (ax.xaxis, ax.yaxis):
+            name = axis.axis_name
+            colour = rc[f'{name}tick.color']
+            label_colour = rc[f'{name}tick.labelcolor']
+            for which in ('major', 'minor'):
+                axis.set_tick_params(
+                    which=which,
+                    direction=rc[f'{name}tick.direction'],
+                    length=rc[f'{name}tick.{which}.size'],
+                    width=rc[f'{name}tick.{which}.width'],
+                    pad=rc[f'{name}tick.{which}.pad'],
+                    labelsize=rc[f'{name}tick.labelsize'],
+                    color=colour,
+                    labelcolor=colour if label_colour == 'inherit' else label_colour,
+                    grid_color=rc['grid.color'],
+                    grid_alpha=rc['grid.alpha'],
+                    grid_linewidth=rc['grid.linewidth'],
+                    grid_linestyle=rc['grid.linestyle'],
+                )
+
     @staticmethod
     def convert_hex_list_to_rgba(hex_list):
-        return [to_rgba(hex) for hex in hex_list]
+        return [tuple(colour) for colour in palette_rgba(hex_list)]
 
-    def create_colour_categories(self, df, cat_col, colours, category_list = None):
+    @staticmethod
+    def _check_category_column(df, cat_col):
         if pd.api.types.is_numeric_dtype(df[cat_col]) is True:
             raise ValueError(
                 f"The column {cat_col} is numeric, please provide a non-numeric categorical column to create colour categories, if you wish to create categories based on the numeric column, add a custom_ranges argument")
-        else:
-            colour_list = self.convert_hex_list_to_rgba(colours)
-
-            cmap = ListedColormap(colour_list)
 
-            # Map categories to colours
-            if cat_col is not None and category_list is None:
-                category_colours = {category: cmap(i) for i, category in enumerate(df[cat_col].unique())}
-                df.loc[:, 'colour'] = df[cat_col].map(category_colours)
-                return category_colours
-            elif category_list is not None:
-                category_colours = {category: cmap(i) for i, category in enumerate(category_list)}
-                df.loc[:, 'colour'] = df[cat_col].map(category_colours)
-                return category_colours
-
-    def create_colour_ranges(self, df, cat_col, colours, category_order = None, custom_ranges = None):
+    @staticmethod
+    def _check_range_column(df, cat_col, category_order, custom_ranges):
         if pd.api.types.is_numeric_dtype(df[cat_col]) is False:
             raise ValueError(
                 f"The column {cat_col} is categorical, a custom_ranges argument is not required. If you want to assign colours based on ranges - please provide a numeric column"
             )
-        colour_list = self.convert_hex_list_to_rgba(colours)
-        cmap = ListedColormap(colour_list)
-
-        # Map ranges to colours
         if len (category_order) != len(custom_ranges)-1:
             raise ValueError(
                 f"When providing custom ranges, the number of categories ({len(category_order)}) must be one less than the number of ranges ({len(custom_ranges)}). Add 'float('inf')' to the end of the ranges to include all values above the last range i.e. 'custom_ranges=[0,10,20, float('inf')]'"
             )
-        else:
-            df['range_category'] = pd.cut(df[cat_col], bins=custom_ranges, labels=category_order, right=False)
-            df['range_category'] = df['range_category'].astype(str)
-            category_colours = {category: cmap(i) for i, category in enumerate(category_order)}
-            df.loc[:,'colour'] = df['range_category'].map(category_colours)
 
-        return category_colours
+    def create_colour_categories(self, df, cat_col, colours, category_list = None):
+        self._check_category_column(df, cat_col)
 
+        # Map categories to colours
+        if category_list is None:
+            category_list = pd.unique(df[cat_col])
+        colour_list = palette_rgba(resolve_palette(colours), len(category_list))
+        return {category: tuple(colour_list[i]) for i, category in enumerate(category_list)}
 
-class Bar(CreateChart):
-    def __init__(self, x, y, df = None, category_column = None, category_list = None, custom_ranges = None):
-        super().__init__(x, y, df, category_column, category_list, custom_ranges)
+    def create_colour_ranges(self, df, cat_col, colours, category_order = None, custom_ranges = None):
+        self._check_range_column(df, cat_col, category_order, custom_ranges)
 
-    def plot(self, x_label = '', y_label = '', title = '', colour_palette = af_categorical, legend = False, legend_loc = 'upper center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme'):
-        plt.style.use(theme)
-        fig, ax = plt.subplots(layout = 'constrained')
+        # Map ranges to colours
+        colour_list = palette_rgba(resolve_palette(colours), len(category_order))
+        return {category: tuple(colour_list[i]) for i, category in enumerate(category_order)}
 
-        if self.df is not None:
+    def _categories(self, df):
+        # Ordered names of the colour categories, checked the same way as the colour mapping
+        if self.custom_ranges is not None:
+            if self.category_list is None:
+                raise ValueError(
+                    f"When providing custom ranges, you need to also provide a category list to assign names to the ranges"
+                )
+            self._check_range_column(df, self.category_column, self.category_list, self.custom_ranges)
+            return list(self.category_list)
+
+        self._check_category_column(df, self.category_column)
+        if self.category_list is not None:
+            return list(self.category_list)
+        return list(pd.unique(df[self.category_column]))
+
+    def _category_codes(self, values, categories):
+        # Position of each value in categories, -1 where it doesn't belong to any of them
+        if self.custom_ranges is not None:
+            codes = np.searchsorted(np.asarray(self.custom_ranges, dtype=float), np.asarray(values, dtype=float), side='right') - 1
+            codes[codes >= len(categories)] = -1
+            return codes
+        return pd.Categorical(values, categories=categories).codes
+
+    def _category_colours(self, categories, colour_palette):
+        # (n_categories, 4) RGBA array, stretched for sequential/diverging palettes, categorical ones repeat their last colour
+        return palette_rgba(colour_palette, len(categories))
 
-            # Create bar chart where category column is specified
-            if self.category_list is None and self.custom_ranges is None and self.category_column is not None:
-                colour_list = self.convert_hex_list_to_rgba(colour_palette)
-                category_colours = self.create_colour_categories(self.df, self.category_column, colour_list, list(self.df[self.category_column].unique()))
-                ax.bar(self.df[self.x], self.df[self.y], color=self.df['colour'])
-                handles = [mpatches.Patch(color=category_colours[category], label=category) for category in list(self.df[self.category_column].unique())]
-                handles = sorted(handles, key=lambda handle: list(self.df[self.category_column].unique()).index(handle.get_label()))
-
-            # Create bar chart where category column and a custom order is specified
-            elif self.category_list is not None and self.custom_ranges is None and self.category_column is not None:
-                colour_list = self.convert_hex_list_to_rgba(colour_palette)
-                category_colours = self.create_colour_categories(self.df, self.category_column, colour_list, self.category_list)
-                ax.bar(self.df[self.x], self.df[self.y], color=self.df['colour'])
-                handles = [mpatches.Patch(color=category_colours[category], label=category) for category in self.category_list]
-                handles = sorted(handles, key=lambda handle: self.category_list.index(handle.get_label()))
-
-            # Create bar chart where category column, custom order and custom numeric ranges is specified
-            elif self.category_list is not None and self.custom_ranges is not None and self.category_column is not None:
-                colour_list = self.convert_hex_list_to_rgba(colour_palette)
-                category_colours = self.create_colour_ranges(self.df, self.category_column, colour_list, self.category_list, self.custom_ranges)
-                ax.bar(self.df[self.x], self.df[self.y], color=self.df['colour'])
-                handles = [mpatches.Patch(color=category_colours[category], label=category) for category in self.category_list]
-                handles = sorted(handles, key=lambda handle: self.category_list.index(handle.get_label()))
+    @staticmethod
+    def _series_colours(colour_palette, n_series, chart_name):
+        # One colour per y-axis value
+        if type(colour_palette) != list:
+            raise ValueError(f"You need to supply a colour palette with more than one value to create a {chart_name}")
+        elif n_series > len(colour_palette) and not can_interpolate(colour_palette):
+            raise ValueError(f"You have more y-axis values ({n_series}) than colours in the palette ({len(colour_palette)}), please provide a larger palette")
+        return palette_rgba(colour_palette, n_series)
 
+    @staticmethod
+    def _add_bars(ax, positions, starts, values, labels, colours, width = DEFAULT_BAR_WIDTH, step = 0, horizontal = False):
+        # One PolyCollection per series rather than one Rectangle artist per bar, step shifts each series along for grouped bars
+        collections = []
+        for i, label in enumerate(labels):
+            vertices = bar_vertices(positions + step * i, starts[:, i], values[:, i], width=width, horizontal=horizontal)
+            bars = mcollections.PolyCollection(vertices, facecolors=[colours[i]], label=label)
+
+            # Keep the value axis starting at zero like ax.bar does
+            if horizontal:
+                bars.sticky_edges.x.append(0)
             else:
-                ax.bar(self.df[self.x], self.df[self.y], color=colour_palette[0])
+                bars.sticky_edges.y.append(0)
+            ax.add_collection(bars, autolim=True)
+            collections.append(bars)
+
+        ax.autoscale_view()
+        return collections
 
-        # Create bar from lists/arrays
+    @staticmethod
+    def _set_bars(bars, positions, starts, values, width = DEFAULT_BAR_WIDTH, step = 0, horizontal = False):
+        for i, collection in enumerate(bars):
+            collection.set_verts(bar_vertices(positions + step * i, starts[:, i], values[:, i], width=width, horizontal=horizontal))
+
+    def _plotted_row_colours(self, df):
+        # Row colours for new data from the categories picked when the chart was plotted, new categories are left uncoloured
+        codes = self._category_codes(df[self.category_column], self._plotted_categories)
+        lookup = np.vstack([self._plotted_colours, np.zeros((1, 4))])
+        return lookup[codes]
+
+    def _colour_rows(self, df, colour_palette):
+        # Categories, their colours and an (n_rows, 4) RGBA array, the dataframe itself is left untouched
+        if self._preset_colours is not None and df is self.df:
+            return self._preset_colours
+        if self.category_list is None and self.custom_ranges is None:
+            # Categories in order of appearance and their codes from a single hashing pass
+            self._check_category_column(df, self.category_column)
+            codes, categories = pd.factorize(df[self.category_column])
+            categories = list(categories)
         else:
-            ax.bar(self.x, self.y, color= colour_palette)
+            categories = self._categories(df)
+            codes = self._category_codes(df[self.category_column], categories)
+        category_colours = self._category_colours(categories, colour_palette)
 
-        ax.set_xlabel(xlabel=x_label)
-        ax.set_ylabel(ylabel=y_label)
-        ax.set_title(label=title)
+        # Rows outside every category pick up the transparent row appended at the end (code -1)
+        lookup = np.vstack([category_colours, np.zeros((1, 4))])
+        return categories, category_colours, lookup[codes]
 
-        # Add legend to plot
-        if self.custom_ranges is None and self.category_list is None and self.category_column is None:
-            self._legend(legend=legend, legend_loc=legend_loc)
 
-        elif self.custom_ranges is not None and self.category_list is None:
-            raise ValueError(
-                f"When providing a custom_ranges argument you must also provide a category_list argument to assign names to the ranges"
-            )
-        else:
-            # Apply custom legend where category column has been specified
-            if legend_plot_area == 'inside':
-                # Place legend inside plot area
-                ax.legend(handles=handles, loc=legend_loc)
-            else:
-                # Place the legend outside the plot area
-                if 'upper' not in legend_loc and 'lower' not in legend_loc:
-                    ax.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc=legend_loc, borderaxespad=0)
+class Bar(CreateChart):
+    def __init__(self, x, y, df = None, category_column = None, category_list = None, custom_ranges = None, agg = None, top_n = None, other_label = 'Other'):
+        super().__init__(x, y, df, category_column, category_list, custom_ranges)
+        self.agg = agg
+        self.top_n = top_n
+        self.other_label = other_label
+
+    @classmethod
+    def from_file(cls, path, x, y, agg = 'sum', top_n = None, other_label = 'Other', category_column = None, category_list = None, custom_ranges = None, filters = None, chunk_size = FILE_CHUNK_SIZE, file_format = None):
+        df = cls._read_groups(path, x, y, agg, top_n, other_label, category_column, filters, chunk_size, file_format)
+        return cls(x, y, df = df, category_column = category_column, category_list = category_list, custom_ranges = custom_ranges)
+
+    def plot(self, x_label = '', y_label = '', title = '', colour_palette = af_categorical, legend = False, legend_loc = 'upper center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme', ax = None, fig = None):
+        colour_palette = resolve_palette(colour_palette)
+
+        with theme_context(theme):
+            fig, ax = self._create_axes(ax, fig)
+
+            with self._span('prepare'):
+                df = self._bar_frame()
+                # Text groups are hashed once into integer positions rather than going through matplotlib's category units
+                positions, tick_labels = bar_positions(df[self.x] if df is not None else self.x)
+
+            if df is not None:
+
+                # Create bar chart coloured by a category column, or by custom numeric ranges of it
+                if self.category_column is not None:
+                    with self._span('colours'):
+                        categories, category_colours, row_colours = self._colour_rows(df, colour_palette)
+                    with self._span('artists') as phase:
+                        bars = ax.bar(positions, df[self.y], color=row_colours)
+                        phase.record(artists=len(bars.patches))
+                    handles = [mpatches.Patch(color=category_colours[i], label=category) for i, category in enumerate(categories)]
+                    self._plotted_categories, self._plotted_colours = categories, category_colours
+
                 else:
-                    num_items = len(handles)
-                    ax.legend(handles=handles, loc=legend_loc, bbox_to_anchor=(0.5, -0.3), ncol=num_items)
+                    with self._span('artists') as phase:
+                        bars = ax.bar(positions, df[self.y], color=colour_palette[0])
+                        phase.record(artists=len(bars.patches))
 
-        print('Colour Palette - ', colour_palette)
+            # Create bar from lists/arrays
+            else:
+                with self._span('artists') as phase:
+                    bars = ax.bar(positions, self.y, color= colour_palette)
+                    phase.record(artists=len(bars.patches))
 
-        return ax
+            self._track(ax, bars.patches)
+            if tick_labels is not None:
+                self._category_ticks(ax.xaxis, np.arange(len(tick_labels)), tick_labels)
 
+            ax.set_xlabel(xlabel=x_label)
+            ax.set_ylabel(ylabel=y_label)
+            ax.set_title(label=title)
 
-class StackedBar(CreateChart):
-    def __init__(self, x, y, df=None):
-        super().__init__(x, y, df)
+            # Add legend to plot
+            if self.custom_ranges is not None and self.category_list is None:
+                raise ValueError(
+                    f"When providing a custom_ranges argument you must also provide a category_list argument to assign names to the ranges"
+                )
 
-    def plot(self, x_label = '', y_label = '', title = '', colour_palette = af_categorical, legend = True, legend_loc = 'upper center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme'):
-        plt.style.use(theme)
-        fig, ax = plt.subplots(layout='constrained')
+            elif self.category_column is None:
+                self._legend(ax, legend=legend, legend_loc=legend_loc)
 
-        # Create stacked bar from df
-        if self.df is not None:
-            if type(self.y) != list:
-                raise ValueError("You need to supply multiple y-axis values in a list to create a stacked bar chart")
             else:
-                self.df.set_index(self.x, inplace=True)
+                # Apply custom legend where category column has been specified
+                if legend_plot_area == 'inside':
+                    # Place legend inside plot area
+                    ax.legend(handles=handles, loc=legend_loc)
+                else:
+                    # Place the legend outside the plot area
+                    if 'upper' not in legend_loc and 'lower' not in legend_loc:
+                        ax.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc=legend_loc, borderaxespad=0)
+                    else:
+                        num_items = len(handles)
+                        ax.legend(handles=handles, loc=legend_loc, bbox_to_anchor=(0.5, -0.3), ncol=num_items)
 
-                # Initialise bottom array to zero
-                bottom = np.zeros(len(self.df))
+            logger.debug('Colour palette - %s', colour_palette)
 
-                # Create chart for each category
-                if len(self.y) > len(colour_palette):
-                    raise ValueError(f"You have more y-axis values ({len(self.y)}) than colours in the palette ({len(colour_palette)}), please provide a larger palette")
-                elif type(colour_palette) != list:
-                    raise ValueError("You need to supply a colour palette with more than one value to create a stacked bar chart")
-                else:
-                    for i, item in enumerate (self.y):
-                        ax.bar(self.df.index, self.df[item], bottom=bottom, label=item, color=colour_palette[i])
-                        bottom += self.df[item] # update the bottom for the next stack
+            return ax
 
-                ax.set_xlabel(xlabel=x_label)
-                ax.set_ylabel(ylabel=y_label)
-                self._legend(legend=legend, legend_loc=legend_loc, legend_plot_area=legend_plot_area)
-                ax.set_title(label=title)
-                self.df.reset_index(inplace=True)
 
-                plt.subplots_adjust(bottom=0.3)
+    def _update_artists(self, ax):
+        df = self._bar_frame()
+        heights = np.asarray(df[self.y] if df is not None else self.y, dtype=float)
+        if len(heights) != len(self._artists):
+            raise ValueError(f"The chart has {len(self._artists)} bars but the new data has {len(heights)}, plot the chart again to change the number of bars")
 
-                print('Colour Palette - ', colour_palette)
+        row_colours = self._plotted_row_colours(df) if self.category_column is not None else None
+        for i, bar in enumerate(self._artists):
+            bar.set_height(heights[i])
+            if row_colours is not None:
+                bar.set_facecolor(row_colours[i])
 
-                return ax
-        else:
-            raise ValueError("You need to supply a dataframe to create a stacked bar chart")
+        # The largest groups can change places, so the bars keep their slots and the labels move instead
+        if self.top_n is not None:
+            self._category_ticks(ax.xaxis, [bar.get_x() + bar.get_width() / 2 for bar in self._artists], [str(group) for group in df[self.x]])
 
 
-class HorizontalStackedBar(CreateChart):
+class StackedBar(CreateChart):
     def __init__(self, x, y, df=None):
         super().__init__(x, y, df)
 
-    def plot(self, x_label = '', y_label = '', title = '', colour_palette = af_categorical, legend = True, legend_loc = 'lower center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme'):
-        plt.style.use(theme)
-        fig, ax = plt.subplots(layout='constrained')
+    @classmethod
+    def from_file(cls, path, x, y, agg = 'sum', top_n = None, other_label = 'Other', filters = None, chunk_size = FILE_CHUNK_SIZE, file_format = None):
+        return cls(x, y, df = cls._read_groups(path, x, y, agg, top_n, other_label, None, filters, chunk_size, file_format))
 
-        # Create stacked bar from df
-        if self.df is not None:
-            if type(self.y) != list:
-                raise ValueError("You need to supply multiple y-axis values in a list to create a stacked bar chart")
-            else:
-                self.df.set_index(self.x, inplace=True)
+    def _update_artists(self, ax):
+        values = series_matrix(self.df, self.y)
+        positions, tick_labels = group_positions(self.df[self.x])
+        self._set_bars(self._artists, positions, stack_offsets(values), values)
+        if tick_labels is not None:
+            self._category_ticks(ax.xaxis, np.arange(len(tick_labels)), tick_labels)
 
-                # Initialise bottom array to zero
-                left = np.zeros(len(self.df))
+    def plot(self, x_label = '', y_label = '', title = '', colour_palette = af_categorical, legend = True, legend_loc = 'upper center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme', ax = None, fig = None):
+        colour_palette = resolve_palette(colour_palette)
 
-                # Create chart for each category
-                if len(self.y) > len(colour_palette):
-                    raise ValueError(f"You have more y-axis values ({len(self.y)}) than colours in the palette ({len(colour_palette)}), please provide a larger palette")
-                elif type(colour_palette) != list:
-                    raise ValueError("You need to supply a colour palette with more than one value to create a stacked bar chart")
+        with theme_context(theme):
+            fig, ax = self._create_axes(ax, fig)
+
+            # Create stacked bar from df
+            if self.df is not None:
+                if type(self.y) != list:
+                    raise ValueError("You need to supply multiple y-axis values in a list to create a stacked bar chart")
                 else:
-                    for i, item in enumerate (self.y):
-                        ax.barh(self.df.index, self.df[item], left=left, label=item, color=colour_palette[i])
-                        left += self.df[item] # update the bottom for the next stack
+                    # Every series as one array, the bottom of each segment comes from a single cumulative sum
+                    with self._span('colours'):
+                        colours = self._series_colours(colour_palette, len(self.y), 'stacked bar chart')
+                    with self._span('prepare'):
+                        values = series_matrix(self.df, self.y)
+                        positions, tick_labels = group_positions(self.df[self.x])
+
+                    with self._span('artists') as phase:
+                        self._track(ax, self._add_bars(ax, positions, stack_offsets(values), values, self.y, colours))
+                        if tick_labels is not None:
+                            self._category_ticks(ax.xaxis, np.arange(len(tick_labels)), tick_labels)
+                        phase.record(artists=len(self._artists))
+
+                    ax.set_xlabel(xlabel=x_label)
+                    ax.set_ylabel(ylabel=y_label)
+                    self._legend(ax, legend=legend, legend_loc=legend_loc, legend_plot_area=legend_plot_area)
+                    ax.set_title(label=title)
+
+                    logger.debug('Colour palette - %s', colour_palette)
+
+                    return ax
+            else:
+                raise ValueError("You need to supply a dataframe to create a stacked bar chart")
 
-                ax.set_xlabel(xlabel=x_label)
-                ax.set_ylabel(ylabel=y_label)
-                self._legend(legend=legend, legend_loc=legend_loc, legend_plot_area=legend_plot_area)
-                ax.set_title(label=title)
-                self.df.reset_index(inplace=True)
 
-                print('Colour Palette - ', colour_palette)
+class HorizontalStackedBar(CreateChart):
+    def __init__(self, x, y, df=None):
+        super().__init__(x, y, df)
 
-                return ax
-        else:
-            raise ValueError("You need to supply a dataframe to create a Horizontal stacked bar chart")
+    @classmethod
+    def from_file(cls, path, x, y, agg = 'sum', top_n = None, other_label = 'Other', filters = None, chunk_size = FILE_CHUNK_SIZE, file_format = None):
+        return cls(x, y, df = cls._read_groups(path, x, y, agg, top_n, other_label, None, filters, chunk_size, file_format))
 
+    def _update_artists(self, ax):
+        values = series_matrix(self.df, self.y)
+        positions, tick_labels = group_positions(self.df[self.x])
+        self._set_bars(self._artists, positions, stack_offsets(values), values, horizontal=True)
+        if tick_labels is not None:
+            self._category_ticks(ax.yaxis, np.arange(len(tick_labels)), tick_labels)
 
-class GroupedBar(CreateChart):
-    def __init__(self, x, y, df=None):
-        super().__init__(x, y, df)
+    def plot(self, x_label = '', y_label = '', title = '', colour_palette = af_categorical, legend = True, legend_loc = 'lower center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme', ax = None, fig = None):
+        colour_palette = resolve_palette(colour_palette)
 
-    def plot(self, x_label = '', y_label = '', title = '', colour_palette = af_categorical, legend = True, legend_loc = 'upper center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme'):
-        plt.style.use(theme)
-        fig, ax = plt.subplots(layout='constrained')
+        with theme_context(theme):
+            fig, ax = self._create_axes(ax, fig)
 
-        # Create stacked bar from df
-        if self.df is not None:
-            if type(self.y) != list:
-                raise ValueError("You need to supply multiple y-axis values in a list to create a grouped bar chart")
+            # Create stacked bar from df
+            if self.df is not None:
+                if type(self.y) != list:
+                    raise ValueError("You need to supply multiple y-axis values in a list to create a stacked bar chart")
+                else:
+                    # Every series as one array, the left edge of each segment comes from a single cumulative sum
+                    with self._span('colours'):
+                        colours = self._series_colours(colour_palette, len(self.y), 'stacked bar chart')
+                    with self._span('prepare'):
+                        values = series_matrix(self.df, self.y)
+                        positions, tick_labels = group_positions(self.df[self.x])
+
+                    with self._span('artists') as phase:
+                        self._track(ax, self._add_bars(ax, positions, stack_offsets(values), values, self.y, colours, horizontal=True))
+                        if tick_labels is not None:
+                            self._category_ticks(ax.yaxis, np.arange(len(tick_labels)), tick_labels)
+                        phase.record(artists=len(self._artists))
+
+                    ax.set_xlabel(xlabel=x_label)
+                    ax.set_ylabel(ylabel=y_label)
+                    self._legend(ax, legend=legend, legend_loc=legend_loc, legend_plot_area=legend_plot_area)
+                    ax.set_title(label=title)
+
+                    logger.debug('Colour palette - %s', colour_palette)
+
+                    return ax
             else:
-                self.df.set_index(self.x, inplace=True)
-
-                # Define label locations and bar width
-                x = np.arange(len(self.df.index)) # label locations
-                n_groups = len(self.y)
-                width = 1 / (n_groups + 1) # Bar widths
-
-                # Create chart for each category
-                if len(self.y) > len(colour_palette):
-                    raise ValueError(f"You have more y-axis values ({len(self.y)}) than colours in the palette ({len(colour_palette)}), please provide a larger palette")
-                elif type(colour_palette) != list:
-                    raise ValueError("You need to supply a colour palette with more than one value to create a grouped bar chart")
+                raise ValueError("You need to supply a dataframe to create a Horizontal stacked bar chart")
+
+
+class GroupedBar(CreateChart):
+    def __init__(self, x, y, df = None, agg = None, top_n = None, other_label = 'Other'):
+        super().__init__(x, y, df)
+        self.agg = agg
+        self.top_n = top_n
+        self.other_label = other_label
+
+    @classmethod
+    def from_file(cls, path, x, y, agg = 'sum', top_n = None, other_label = 'Other', filters = None, chunk_size = FILE_CHUNK_SIZE, file_format = None):
+        return cls(x, y, df = cls._read_groups(path, x, y, agg, top_n, other_label, None, filters, chunk_size, file_format))
+
+    def _update_artists(self, ax):
+        df = self._bar_frame()
+        x = np.arange(len(df))
+        width = 1 / (len(self.y) + 1)
+        values = series_matrix(df, self.y)
+        self._set_bars(self._artists, x, np.zeros_like(values), values, width=width, step=width)
+        self._category_ticks(ax.xaxis, (x-(0.5*width)) + ((width*len(self.y))/2), [str(group) for group in df[self.x]])
+
+    def plot(self, x_label = '', y_label = '', title = '', colour_palette = af_categorical, legend = True, legend_loc = 'upper center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme', ax = None, fig = None):
+        colour_palette = resolve_palette(colour_palette)
+
+        with theme_context(theme):
+            fig, ax = self._create_axes(ax, fig)
+
+            # Create stacked bar from df
+            if self.df is not None:
+                if type(self.y) != list:
+                    raise ValueError("You need to supply multiple y-axis values in a list to create a grouped bar chart")
                 else:
-                    for i, item in enumerate (self.y):
-                        offset = width * i
-                        ax.bar(x + offset, self.df[item], width, label=item, color=colour_palette[i])
+                    with self._span('prepare'):
+                        df = self._bar_frame()
+                        values = series_matrix(df, self.y)
 
-                    ax.set_xticks((x-(0.5*width)) + ((width*len(self.y))/2), self.df.index)
+                    # Define label locations and bar width
+                    x = np.arange(len(df)) # label locations
+                    n_groups = len(self.y)
+                    width = 1 / (n_groups + 1) # Bar widths
 
-                ax.set_xlabel(xlabel=x_label)
-                ax.set_ylabel(ylabel=y_label)
-                self._legend(legend=legend, legend_loc=legend_loc, legend_plot_area=legend_plot_area)
-                ax.set_title(label=title)
-                self.df.reset_index(inplace=True)
+                    # Each series is shifted along by one bar width, all drawn from the same value array
+                    with self._span('colours'):
+                        colours = self._series_colours(colour_palette, len(self.y), 'grouped bar chart')
 
-                plt.subplots_adjust(bottom=0.3)
+                    with self._span('artists') as phase:
+                        self._track(ax, self._add_bars(ax, x, np.zeros_like(values), values, self.y, colours, width=width, step=width))
+                        self._category_ticks(ax.xaxis, (x-(0.5*width)) + ((width*len(self.y))/2), [str(group) for group in df[self.x]])
+                        phase.record(artists=len(self._artists))
 
-                print('Colour Palette - ', colour_palette)
+                    ax.set_xlabel(xlabel=x_label)
+                    ax.set_ylabel(ylabel=y_label)
+                    self._legend(ax, legend=legend, legend_loc=legend_loc, legend_plot_area=legend_plot_area)
+                    ax.set_title(label=title)
 
-                return ax
-        else:
-            raise ValueError("You need to supply a dataframe to create a grouped bar chart")
+                    logger.debug('Colour palette - %s', colour_palette)
+
+                    return ax
+            else:
+                raise ValueError("You need to supply a dataframe to create a grouped bar chart")
 
 
 class Line(CreateChart):
     def __init__(self, x, y, df=None):
         super().__init__(x, y, df)
-
-    def plot(self, x_label = '', y_label = '', title = '', colour_palette= af_categorical, legend = False, legend_loc = 'lower center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme'):
-        plt.style.use(theme)
-        fig, ax = plt.subplots(layout='constrained')
-
-        # Create line chart from dataframe
+        self._downsample_method = None
+
+    @classmethod
+    def from_file(cls, path, x, y, filters = None, chunk_size = FILE_CHUNK_SIZE, file_format = None, buckets = 2000):
+        # Only the rows holding each series' minimum and maximum in every one of `buckets` runs of rows are kept
+        chunks = read_chunks(path, chart_columns(x, y), filters, chunk_size, file_format)
+        return cls(x, y, df = line_extremes(chunks, x, y, buckets))
+
+    def _downsample(self, ax, x, y, downsample):
+        # Reduce long series to roughly one bucket per horizontal pixel of the axes
+        if downsample is None:
+            return x, y
+        n_points = max(int(ax.get_window_extent().width), 1)
+        return downsample_series(x, y, n_points, method=downsample)
+
+    def _update_artists(self, ax):
         if self.df is not None:
-            if type(self.y) != list:
-                ax.plot(self.df[self.x], self.df[self.y], c=colour_palette)
-            elif type(self.y) == list:
-                for i, item in enumerate(self.y):
-                    ax.plot(self.df[self.x], self.df[item], label=item, color=colour_palette[i])
-
-        elif self.df is None and type(self.y) != list:
-            ax.plot(self.x, self.y, color=colour_palette)
-
-        ax.set_xlabel(xlabel=x_label)
-        ax.set_ylabel(ylabel=y_label)
-        ax.set_title(label=title)
-        self._legend(legend=legend, legend_loc=legend_loc, legend_plot_area=legend_plot_area)
-
-        print('Colour Palette - ', colour_palette)
+            x = self.df[self.x]
+            series = [self.df[item] for item in self.y] if type(self.y) == list else [self.df[self.y]]
+        else:
+            x = self.x
+            series = [self.y]
+
+        for line, y in zip(self._artists, series):
+            line.set_data(*self._downsample(ax, x, y, self._downsample_method))
+
+    def plot(self, x_label = '', y_label = '', title = '', colour_palette= af_categorical, legend = False, legend_loc = 'lower center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme', downsample = None, ax = None, fig = None):
+        colour_palette = resolve_palette(colour_palette)
+
+        with theme_context(theme):
+            fig, ax = self._create_axes(ax, fig)
+
+            with self._span('colours'):
+                colour = colour_palette[0] if type(colour_palette) == list else colour_palette
+                if type(self.y) == list:
+                    colours = palette_rgba(colour_palette, len(self.y))
+
+            # Points for every line from the dataframe or lists/arrays, downsampled before any line is drawn
+            with self._span('prepare'):
+                series = []
+                if self.df is not None:
+                    if type(self.y) != list:
+                        series.append((self._downsample(ax, self.df[self.x], self.df[self.y], downsample), {'color': colour}))
+                    elif type(self.y) == list:
+                        for i, item in enumerate(self.y):
+                            series.append((self._downsample(ax, self.df[self.x], self.df[item], downsample), {'label': item, 'color': colours[i]}))
+
+                elif self.df is None and type(self.y) != list:
+                    series.append((self._downsample(ax, self.x, self.y, downsample), {'color': colour}))
+
+            with self._span('artists') as phase:
+                lines = []
+                for points, style in series:
+                    lines += ax.plot(*points, **style)
+                phase.record(artists=len(lines))
+
+            self._downsample_method = downsample
+            self._track(ax, lines)
+
+            ax.set_xlabel(xlabel=x_label)
+            ax.set_ylabel(ylabel=y_label)
+            ax.set_title(label=title)
+            self._legend(ax, legend=legend, legend_loc=legend_loc, legend_plot_area=legend_plot_area)
+
+            logger.debug('Colour palette - %s', colour_palette)
+
+            return ax
+
+class StreamingLine(Line):
+    def __init__(self, x, y, df = None, capacity = 10000, window = None):
+        # x and y name the series, points arrive through append/extend and are kept in fixed size ring buffers
+        super().__init__(x, y, None)
+        self.capacity = capacity
+        self.window = window
+        self._series = self.y if type(self.y) == list else [self.y]
+        self._x_buffer = None
+        self._y_buffers = None
+        self._window = None
+
+        if df is not None:
+            self.extend(df)
+
+    def _create_buffers(self, x):
+        # Datetime x values stay as datetimes, everything else is stored as floats
+        x = np.asarray(x)
+        if x.dtype == object:
+            x = np.asarray(pd.to_datetime(x))
+        if x.dtype.kind in 'mM':
+            dtype = x.dtype
+            if self.window is not None:
+                self._window = pd.Timedelta(self.window).to_timedelta64()
+        else:
+            dtype = float
+            if self.window is not None:
+                self._window = float(self.window)
+
+        self._x_buffer = RingBuffer(self.capacity, dtype=dtype)
+        self._y_buffers = [RingBuffer(self.capacity) for _ in self._series]
+
+    def _series_values(self, y, n_points):
+        # Values for each series from a scalar/array (one series), a list in series order or a dict keyed by series name
+        if hasattr(y, 'keys'):
+            return [y.get(name, np.full(n_points, np.nan) if n_points is not None else np.nan) for name in self._series]
+        if len(self._series) == 1 and (n_points is None or np.ndim(y) == 1):
+            return [y]
+        if len(y) != len(self._series):
+            raise ValueError(f"Expected values for {len(self._series)} series ({', '.join(self._series)}), got {len(y)}")
+        return list(y)
+
+    def append(self, x, y):
+        # Add one point to every series
+        if self._x_buffer is None:
+            self._create_buffers([x])
+
+        self._x_buffer.append(x)
+        for buffer, value in zip(self._y_buffers, self._series_values(y, None)):
+            buffer.append(value)
+        self._trim()
+
+    def extend(self, x, y = None):
+        # Add many points at once, either as a dataframe with the x and y columns or as an x array with y values for each series
+        if y is None:
+            df = as_frame(x, chart_columns(self.x, self._series))
+            x = df[self.x]
+            y = {name: df[name] for name in self._series}
+
+        x = np.asarray(x)
+        if self._x_buffer is None:
+            self._create_buffers(x)
+
+        self._x_buffer.extend(x)
+        for buffer, values in zip(self._y_buffers, self._series_values(y, len(x))):
+            buffer.extend(values)
+        self._trim()
+
+    def _trim(self):
+        # Drop points that have fallen out of the rolling window, x values are assumed to arrive in order
+        if self._window is None or len(self._x_buffer) == 0:
+            return
+        x_values = self._x_buffer.values()
+        count = np.searchsorted(x_values, x_values[-1] - self._window, side='left')
+        if count:
+            self._x_buffer.drop(count)
+            for buffer in self._y_buffers:
+                buffer.drop(count)
+
+    def clear(self):
+        if self._x_buffer is not None:
+            self._x_buffer.clear()
+            for buffer in self._y_buffers:
+                buffer.clear()
+
+    def __len__(self):
+        return 0 if self._x_buffer is None else len(self._x_buffer)
+
+    def _buffer_values(self):
+        if self._x_buffer is None:
+            return np.array([]), [np.array([]) for _ in self._series]
+        return self._x_buffer.values(), [buffer.values() for buffer in self._y_buffers]
+
+    def to_frame(self):
+        x_values, series = self._buffer_values()
+        return pd.DataFrame({self.x: x_values, **{name: values.copy() for name, values in zip(self._series, series)}})
+
+    def _cache_data(self):
+        return self._buffer_values()
+
+    def plot(self, x_label = '', y_label = '', title = '', colour_palette= af_categorical, legend = False, legend_loc = 'lower center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme', downsample = None, ax = None, fig = None):
+        # Plot a snapshot of the buffers, later points are drawn by update
+        self.df = self.to_frame()
+        try:
+            return super().plot(x_label=x_label, y_label=y_label, title=title, colour_palette=colour_palette, legend=legend, legend_loc=legend_loc,
+                                legend_plot_area=legend_plot_area, theme=theme, downsample=downsample, ax=ax, fig=fig)
+        finally:
+            self.df = None
+
+    def update(self, df = None, x = None, y = None, blit = False):
+        # New data is appended to the buffers rather than replacing what is already there
+        if df is not None:
+            self.extend(df)
+        elif x is not None:
+            self.extend(x, y)
+        return super().update(blit=blit)
+
+    def _update_artists(self, ax):
+        x_values, series = self._buffer_values()
+        for line, values in zip(self._artists, series):
+            line.set_data(*self._downsample(ax, x_values, values, self._downsample_method))
 
-        return ax
 
 class Scatter(CreateChart):
     def __init__(self, x, y, df=None, category_column=None, category_list=None, custom_ranges=None):
         super().__init__(x, y, df, category_column, category_list, custom_ranges)
-
-    def plot(self, x_label = '', y_label = '', title = '', colour_palette = af_categorical, legend = True, legend_loc = 'lower center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme' ):
-        plt.style.use(theme)
-        fig, ax = plt.subplots(layout='constrained')
-
-        #Create scatter plot from dataframe
+        self._density = False
+        # (counts, extent, categories) of points binned by from_file, used for as long as the chart has no dataframe
+        self._binned = None
+
+    @classmethod
+    def from_file(cls, path, x, y, category_column = None, category_list = None, custom_ranges = None, filters = None, chunk_size = FILE_CHUNK_SIZE, file_format = None, extent = None, bins = (1000, 600)):
+        # Points are counted into a bins sized (width, height) grid as the file is read and drawn as a density image
+        if type(y) == list:
+            raise ValueError("Scatter.from_file takes a single y-axis value, not a list")
+        chart = cls(x, y, category_column = category_column, category_list = category_list, custom_ranges = custom_ranges)
+
+        if extent is None:
+            # A first pass over the x and y columns finds the range the grid has to cover
+            extent = value_extent(read_chunks(path, [x, y], filters, chunk_size, file_format), x, y)
+
+        categories = []
+
+        def layers(chunk):
+            if category_column is None:
+                return None, 1
+            if category_list is None and custom_ranges is None:
+                # Categories in order of first appearance across the whole file
+                chart._check_category_column(chunk, category_column)
+                categories.extend(category for category in pd.unique(chunk[category_column].dropna()) if category not in categories)
+            elif not categories:
+                categories.extend(chart._categories(chunk))
+            return chart._category_codes(chunk[category_column], categories), len(categories)
+
+        chunks = read_chunks(path, chart_columns(x, y, category_column), filters, chunk_size, file_format)
+        counts = point_counts(chunks, x, y, extent, bins, layers)
+        chart._binned = (counts, extent, categories if category_column is not None else None)
+        return chart
+
+    def _xy_values(self):
         if self.df is not None:
-
-            # Basic Scatter with no category split
-            if type(self.y) != list and self.category_column is None:
-                ax.scatter(self.df[self.x], self.df[self.y])
-
-            # Scatter plot with category split but without custom order specified
-            elif type(self.y) != list and self.category_column is not None and self.category_list is None and len(colour_palette) >= len(self.df[self.category_column].unique()):
-                # Create a color map for the categories
-                colour_list = self.convert_hex_list_to_rgba(colour_palette)
-                category_colours = self.create_colour_categories(self.df, self.category_column, colour_list, self.category_list)
-                ax.scatter(self.df[self.x], self.df[self.y], c=self.df['colour'])
-                handles = [mpatches.Patch(color = category_colours[category], label = category) for category in self.df[self.category_column].unique()]
-
-            # Scatter plot with category split and custom category order specified
-            elif self.category_list is not None and self.custom_ranges is None and len(colour_palette) >= len(self.category_list):
-            # Create a color map for the categories
-                colour_list = self.convert_hex_list_to_rgba(colour_palette)
-                category_colours = self.create_colour_categories(self.df, self.category_column, colour_list, self.category_list)
-                ax.scatter(self.df[self.x], self.df[self.y], c=self.df['colour'])
-                handles = [mpatches.Patch(color=category_colours[category], label=category) for category in self.category_list]
-                handles = sorted(handles, key=lambda handle: self.category_list.index(handle.get_label()))
-
-            # Scatter plot with category split and custom category order and custom numeric ranges
-            elif self.category_list is not None and self.custom_ranges is not None and len(colour_palette) >= (len(self.custom_ranges)-1):
-            # Create a color map for the categories
-                colour_list = self.convert_hex_list_to_rgba(colour_palette)
-                category_colours = self.create_colour_ranges(self.df, self.category_column, colour_list, self.category_list, self.custom_ranges)
-                ax.scatter(self.df[self.x], self.df[self.y], c=self.df['colour'])
-                handles = [mpatches.Patch(color=category_colours[category], label=category) for category in self.category_list]
-                handles = sorted(handles, key=lambda handle: self.category_list.index(handle.get_label()))
-
-            elif self.custom_ranges is not None and self.category_list is None:
-                raise ValueError(
-                    f"When providing custom ranges, you need to also provide a category list to assign names to the ranges"
-                )
-
-            # Raise error if number of colours required is larger than the palette (too many categories)
-            else:
-                raise ValueError(
-                    f" You have more categories ({len(self.df[self.category_column].unique())}) than colours in the palette ({len(colour_palette)}), please provide a larger palette or choose a column with fewer categories"
-                )
-
-        # Create scatter with multiple y_axis values specified
-        elif type(self.y) == list and self.category_column is None:
-            for i, item in enumerate(self.y):
-                ax.scatter(self.x, self.y, color= af_categorical)
-
-        elif self.df is None and type(self.y) != list:
-            ax.scatter(self.x, self.y, color = af_categorical[0] )
-
-        ax.set_xlabel(xlabel=x_label)
-        ax.set_ylabel(ylabel=y_label)
-        ax.set_title(label=title)
-
-        # Add legend to plot
-        if self.category_column is None:
-            self._legend(legend = legend, legend_loc = legend_loc)
+            return np.asarray(self.df[self.x]), np.asarray(self.df[self.y])
+        return np.asarray(self.x), np.asarray(self.y)
+
+    def _density_image(self, ax):
+        # Bin the points into a pixel sized grid, one layer per category picked when the chart was plotted
+        if self._binned is not None and self.df is None:
+            counts, extent, _ = self._binned
+            colours = self._plotted_colours if self._plotted_categories is not None else [mcolors.to_rgba('C0')]
+            return density_image(counts, colours), extent
+
+        x_values, y_values = self._xy_values()
+        extent = data_extent(x_values, y_values)
+        shape = axes_pixel_shape(ax)
+
+        if self._plotted_categories is None:
+            counts = bin_points(x_values, y_values, extent, shape)
+            return density_image(counts, [mcolors.to_rgba('C0')]), extent
+
+        categories = self._plotted_categories
+        category_values = self.df[self.category_column]
+
+        def codes(start, stop):
+            return self._category_codes(category_values.iloc[start:stop], categories)
+
+        counts = bin_points(x_values, y_values, extent, shape, codes=codes, n_layers=len(categories))
+        return density_image(counts, self._plotted_colours), extent
+
+    def _plot_density(self, ax, colour_palette):
+        # Draw the points as a single image instead of one marker per point
+        binned = self._binned if self.df is None else None
+        if self.category_column is None or (self.df is None and binned is None):
+            self._plotted_categories = self._plotted_colours = None
+            handles = None
         else:
-            # Apply custom legend where category column has been specified
-            if legend_plot_area == 'inside':
-                ax.legend(handles = handles, loc = legend_loc)
+            with self._span('colours'):
+                categories = binned[2] if binned is not None else self._categories(self.df)
+                if len(categories) > len(colour_palette) and not can_interpolate(colour_palette):
+                    raise ValueError(
+                        f" You have more categories ({len(categories)}) than colours in the palette ({len(colour_palette)}), please provide a larger palette or choose a column with fewer categories"
+                    )
+                category_colours = self._category_colours(categories, colour_palette)
+            self._plotted_categories, self._plotted_colours = categories, category_colours
+            handles = [mpatches.Patch(color=category_colours[i], label=category) for i, category in enumerate(categories)]
+
+        with self._span('prepare'):
+            image, extent = self._density_image(ax)
+        with self._span('artists') as phase:
+            self._track(ax, [ax.imshow(image, extent=extent, origin='lower', aspect='auto', interpolation='nearest')])
+            phase.record(artists=1)
+
+        return handles
+
+    def _update_artists(self, ax):
+        if self._density:
+            image, extent = self._density_image(ax)
+            self._artists[0].set_data(image)
+            self._artists[0].set_extent(extent)
+            return
+
+        x_values, y_values = self._xy_values()
+        offsets = np.column_stack([ax.convert_xunits(x_values), ax.convert_yunits(y_values)])
+        for points in self._artists:
+            points.set_offsets(offsets)
+            if self._plotted_categories is not None:
+                points.set_facecolors(self._plotted_row_colours(self.df))
+
+    def plot(self, x_label = '', y_label = '', title = '', colour_palette = af_categorical, legend = True, legend_loc = 'lower center', legend_plot_area = 'outside', theme = 'speedy_charts.mplstyles.standard_theme', density = None, density_threshold = 1000000, ax = None, fig = None):
+        colour_palette = resolve_palette(colour_palette)
+
+        with theme_context(theme):
+            fig, ax = self._create_axes(ax, fig)
+
+            # Points binned by from_file can only be drawn as an image
+            if self._binned is not None and self.df is None:
+                density = True
+
+            # Switch to a binned image once there are too many points to draw individually
+            elif density is None:
+                n_points = len(self.df) if self.df is not None else len(self.x)
+                density = type(self.y) != list and n_points > density_threshold
+
+            self._density = density
+            if density:
+                handles = self._plot_density(ax, colour_palette)
+
+            #Create scatter plot from dataframe
+            elif self.df is not None:
+
+                # Basic Scatter with no category split
+                if type(self.y) != list and self.category_column is None:
+                    with self._span('artists') as phase:
+                        self._track(ax, [ax.scatter(self.df[self.x], self.df[self.y])])
+                        phase.record(artists=1)
+
+                # Scatter plot coloured by a category column, or by custom numeric ranges of it
+                else:
+                    with self._span('colours'):
+                        categories, category_colours, row_colours = self._colour_rows(self.df, colour_palette)
+
+                        # Raise error if number of colours required is larger than the palette (too many categories)
+                        if len(categories) > len(colour_palette) and not can_interpolate(colour_palette):
+                            raise ValueError(
+                                f" You have more categories ({len(categories)}) than colours in the palette ({len(colour_palette)}), please provide a larger palette or choose a column with fewer categories"
+                            )
+
+                    with self._span('artists') as phase:
+                        points = ax.scatter(self.df[self.x], self.df[self.y], c=row_colours)
+                        phase.record(artists=1)
+                    handles = [mpatches.Patch(color=category_colours[i], label=category) for i, category in enumerate(categories)]
+                    self._plotted_categories, self._plotted_colours = categories, category_colours
+                    self._track(ax, [points])
+
+            # Create scatter with multiple y_axis values specified
+            elif type(self.y) == list and self.category_column is None:
+                with self._span('artists') as phase:
+                    self._track(ax, [ax.scatter(self.x, self.y, color= af_categorical) for item in self.y])
+                    phase.record(artists=len(self._artists))
+
+            elif self.df is None and type(self.y) != list:
+                with self._span('artists') as phase:
+                    self._track(ax, [ax.scatter(self.x, self.y, color = af_categorical[0] )])
+                    phase.record(artists=1)
+
+            ax.set_xlabel(xlabel=x_label)
+            ax.set_ylabel(ylabel=y_label)
+            ax.set_title(label=title)
+
+            # Add legend to plot
+            if self.category_column is None:
+                self._legend(ax, legend = legend, legend_loc = legend_loc)
             else:
-                # Place the legend outside the plot area
-                if 'upper' not in legend_loc and 'lower' not in legend_loc:
-                    ax.legend(handles = handles, bbox_to_anchor=(1.05, 1), loc=legend_loc, borderaxespad=0)
-
+                # Apply custom legend where category column has been specified
+                if legend_plot_area == 'inside':
+                    ax.legend(handles = handles, loc = legend_loc)
                 else:
-                    num_items = len(handles)
-                    ax.legend(handles = handles, loc = legend_loc, bbox_to_anchor=(0.5, -0.2), ncol=num_items)
+                    # Place the legend outside the plot area
+                    if 'upper' not in legend_loc and 'lower' not in legend_loc:
+                        ax.legend(handles = handles, bbox_to_anchor=(1.05, 1), loc=legend_loc, borderaxespad=0)
+
+                    else:
+                        num_items = len(handles)
+                        ax.legend(handles = handles, loc = legend_loc, bbox_to_anchor=(0.5, -0.2), ncol=num_items)
 
-        print('Colour Palette - ', colour_palette)
+            logger.debug('Colour palette - %s', colour_palette)
 
-        return ax
\ No newline at end of file
+            return ax
\ No newline at end of file
@@ -0,0 +1,98 @@
+from ._lazy import LazyModule
+
+np = LazyModule('numpy')
+
+# Rows binned at a time, this bounds the temporary arrays no matter how many points there are
+DENSITY_CHUNK_SIZE = 2_000_000
+
+
+def axes_pixel_shape(ax):
+    # One grid cell per pixel of the axes
+    bbox = ax.get_window_extent()
+    return max(int(bbox.width), 1), max(int(bbox.height), 1)
+
+
+def data_extent(x, y, chunk_size = DENSITY_CHUNK_SIZE):
+    x_min = y_min = np.inf
+    x_max = y_max = -np.inf
+
+    for start in range(0, len(x), chunk_size):
+        chunk_x = np.asarray(x[start:start + chunk_size], dtype=float)
+        chunk_y = np.asarray(y[start:start + chunk_size], dtype=float)
+        finite = np.isfinite(chunk_x) & np.isfinite(chunk_y)
+        if finite.any():
+            x_min = min(x_min, chunk_x[finite].min())
+            x_max = max(x_max, chunk_x[finite].max())
+            y_min = min(y_min, chunk_y[finite].min())
+            y_max = max(y_max, chunk_y[finite].max())
+
+    if not np.isfinite(x_min):
+        return 0.0, 1.0, 0.0, 1.0
+
+    # Give single valued axes some width so every point falls inside the grid
+    if x_min == x_max:
+        x_min, x_max = x_min - 0.5, x_max + 0.5
+    if y_min == y_max:
+        y_min, y_max = y_min - 0.5, y_max + 0.5
+
+    return float(x_min), float(x_max), float(y_min), float(y_max)
+
+
+def accumulate(counts, x, y, extent, shape, codes = None):
+    # Add one chunk of points to a flat (layers * height * width) count array
+    width, height = shape
+    x_min, x_max, y_min, y_max = extent
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    with np.errstate(invalid='ignore'):
+        column = np.floor((x - x_min) * (width / (x_max - x_min)))
+        row = np.floor((y - y_min) * (height / (y_max - y_min)))
+
+    # Points exactly on the upper edge belong to the last cell
+    column[x == x_max] = width - 1
+    row[y == y_max] = height - 1
+
+    valid = (column >= 0) & (column < width) & (row >= 0) & (row < height)
+    flat = row.astype(np.intp) * width + column.astype(np.intp)
+    if codes is not None:
+        codes = np.asarray(codes)
+        valid &= codes >= 0
+        flat += codes.astype(np.intp) * (width * height)
+
+    binned = np.bincount(flat[valid])
+    counts[:len(binned)] += binned
+    return counts
+
+
+def bin_points(x, y, extent, shape, codes = None, n_layers = 1, chunk_size = DENSITY_CHUNK_SIZE):
+    # codes, when given, is called with (start, stop) and returns the layer of each point in that chunk
+    width, height = shape
+    counts = np.zeros(n_layers * width * height, dtype=np.int64)
+
+    for start in range(0, len(x), chunk_size):
+        stop = start + chunk_size
+        layer = None if codes is None else codes(start, stop)
+        accumulate(counts, x[start:stop], y[start:stop], extent, shape, layer)
+
+    return counts.reshape(n_layers, height, width)
+
+
+def density_image(counts, colours):
+    # Colour each cell by its most common layer and fade it in with the log of the number of points
+    colours = np.asarray(colours, dtype=float)
+    total = counts.sum(axis=0)
+
+    if counts.shape[0] > 1:
+        image = colours[counts.argmax(axis=0)]
+    else:
+        image = np.broadcast_to(colours[0], total.shape + (4,)).copy()
+
+    filled = total > 0
+    alpha = np.zeros(total.shape)
+    if filled.any():
+        alpha[filled] = 0.3 + 0.7 * np.log1p(total[filled]) / np.log1p(total.max())
+    image[..., 3] *= alpha
+
+    return image
@@ -0,0 +1,115 @@
+from ._lazy import LazyModule
+
+np = LazyModule('numpy')
+
+DOWNSAMPLE_METHODS = ('minmax', 'lttb')
+
+
+def _as_float(values):
+    # Numeric view of an axis used for the LTTB triangle areas, non-numeric axes fall back to their position
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64) or np.issubdtype(values.dtype, np.timedelta64):
+        return values.view('int64').astype(float)
+    if not np.issubdtype(values.dtype, np.number) or np.issubdtype(values.dtype, np.complexfloating):
+        return np.arange(len(values), dtype=float)
+    return values.astype(float, copy=False)
+
+
+def _bucket_extremes(values, size):
+    # Position of the minimum and maximum within each run of `size` consecutive values
+    full = len(values) - len(values) % size
+    starts = np.arange(0, len(values), size)
+
+    blocks = values[:full].reshape(-1, size)
+    lows = blocks.argmin(axis=1)
+    highs = blocks.argmax(axis=1)
+
+    if full < len(values):
+        tail = values[full:]
+        lows = np.append(lows, tail.argmin())
+        highs = np.append(highs, tail.argmax())
+
+    return starts + lows, starts + highs
+
+
+def minmax_indices(values, n_buckets):
+    # Positions of the minimum and maximum of each of n_buckets runs of values, plus both end points, in their original order
+    values = np.asarray(values).astype(float, copy=False)
+    n = len(values)
+    if n_buckets < 1 or n <= 2 * n_buckets:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)
+
+    # Missing values would otherwise win every argmin/argmax and hide the real extremes
+    missing = np.isnan(values)
+    if missing.any():
+        lows, _ = _bucket_extremes(np.where(missing, np.inf, values), size)
+        _, highs = _bucket_extremes(np.where(missing, -np.inf, values), size)
+    else:
+        lows, highs = _bucket_extremes(values, size)
+
+    return np.unique(np.concatenate([lows, highs, [0, n - 1]]))
+
+
+def minmax_downsample(x, y, n_buckets):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if n_buckets < 1 or len(y) <= 2 * n_buckets:
+        return x, y
+
+    index = minmax_indices(y, n_buckets)
+    return x[index], y[index]
+
+
+def lttb_downsample(x, y, n_out):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if n_out < 3 or n <= n_out:
+        return x, y
+
+    xs = _as_float(x)
+    ys = y.astype(float, copy=False)
+
+    # Split everything between the first and last point into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(xs[:n - 1], edges[:-1]) / counts
+
+    # Missing values are left out of the bucket means and never picked while a bucket has a real value
+    missing = np.isnan(ys)
+    if missing.any():
+        present = np.add.reduceat((~missing[:n - 1]).astype(float), edges[:-1])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_y = np.add.reduceat(np.where(missing, 0.0, ys)[:n - 1], edges[:-1]) / present
+    else:
+        mean_y = np.add.reduceat(ys[:n - 1], edges[:-1]) / counts
+
+    # The third vertex of each triangle is the mean of the next bucket, or the last point for the final bucket
+    next_x = np.append(mean_x[1:], xs[-1])
+    next_y = np.append(mean_y[1:], ys[-1])
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        bucket_x = xs[start:stop]
+        bucket_y = ys[start:stop]
+        area = np.abs((xs[a] - next_x[i]) * (bucket_y - ys[a]) - (xs[a] - bucket_x) * (next_y[i] - ys[a]))
+        a = start + (np.where(np.isnan(area), -1.0, area).argmax() if missing.any() else area.argmax())
+        selected[i + 1] = a
+
+    return x[selected], y[selected]
+
+
+def downsample_series(x, y, n_points, method = 'minmax'):
+    if method == 'minmax':
+        return minmax_downsample(x, y, n_points)
+    elif method == 'lttb':
+        return lttb_downsample(x, y, n_points)
+    else:
+        raise ValueError(f"Unknown downsample method '{method}', choose one of {', '.join(DOWNSAMPLE_METHODS)}")
@@ -0,0 +1,38 @@
+import os
+
+# Formats where every point is written out as its own element
+VECTOR_FORMATS = ('svg', 'svgz', 'pdf', 'eps', 'ps')
+
+# Artists with more points than this are embedded as an image in vector output, which keeps the file size bounded
+RASTERIZE_THRESHOLD = 5000
+
+
+def output_format(file_format = None, to = None):
+    # Explicit format first, then the extension of a path, then png
+    if file_format:
+        return file_format.lower()
+    if isinstance(to, (str, os.PathLike)):
+        extension = os.path.splitext(os.fspath(to))[1][1:]
+        if extension:
+            return extension.lower()
+    return 'png'
+
+
+def point_count(artist):
+    # Number of points or shapes an artist writes out, lines by vertex and collections by marker or path
+    if hasattr(artist, 'get_xydata'):
+        return len(artist.get_xydata())
+    if hasattr(artist, 'get_offsets') and hasattr(artist, 'get_paths'):
+        return max(len(artist.get_offsets()), len(artist.get_paths()))
+    return 0
+
+
+def rasterize_dense_artists(fig, threshold = RASTERIZE_THRESHOLD):
+    # Only the dense data artists are rasterized, text, axes and legends stay as vectors
+    rasterized = []
+    for ax in fig.axes:
+        for artist in ax.get_children():
+            if not artist.get_rasterized() and point_count(artist) > threshold:
+                artist.set_rasterized(True)
+                rasterized.append(artist)
+    return rasterized
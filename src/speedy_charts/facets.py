@@ -0,0 +1,188 @@
+import io
+import math
+
+from ._lazy import LazyModule
+from .adapters import as_frame, chart_columns
+from .charts import Bar, GroupedBar, HorizontalStackedBar, StackedBar, new_figure
+from .export import RASTERIZE_THRESHOLD, VECTOR_FORMATS, output_format, rasterize_dense_artists
+from .palettes import af_categorical, resolve_palette
+from .themes import DEFAULT_THEME, theme_context
+
+mticker = LazyModule('matplotlib.ticker')
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+# Axis each bar chart places its groups along with tick labels, every panel has its own groups so it can't be shared
+_GROUP_AXIS = ((HorizontalStackedBar, 'y'), (Bar, 'x'), (StackedBar, 'x'), (GroupedBar, 'x'))
+
+
+def _group_axis(chart):
+    return next((axis for chart_class, axis in _GROUP_AXIS if issubclass(chart, chart_class)), None)
+
+
+def _share_limits(axes, axis):
+    # One range covering every panel, each panel keeps its own direction in case it was drawn inverted
+    limits = [getattr(ax, f'get_{axis}lim')() for ax in axes]
+    low = min(min(limit) for limit in limits)
+    high = max(max(limit) for limit in limits)
+    for ax, limit in zip(axes, limits):
+        getattr(ax, f'set_{axis}lim')((high, low) if limit[0] > limit[1] else (low, high))
+
+    # The same limits give the same ticks, so plain numeric axes are ticked once rather than once per panel
+    axis_objects = [getattr(ax, f'{axis}axis') for ax in axes]
+    if all(type(item.get_major_locator()) is mticker.AutoLocator for item in axis_objects):
+        ticks = axis_objects[0].get_major_locator()()
+        for item in axis_objects:
+            item.set_major_locator(mticker.FixedLocator(ticks))
+
+
+def _legend_entries(ax):
+    # Handles and labels of the legend a panel drew for itself, or of its labelled artists when it didn't draw one
+    legend = ax.get_legend()
+    if legend is None:
+        return ax.get_legend_handles_labels()
+    # legend_handles replaced legendHandles in matplotlib 3.7, an empty list is a legend without entries rather than an old release
+    handles = getattr(legend, 'legend_handles', None)
+    if handles is None:
+        handles = legend.legendHandles
+    labels = [text.get_text() for text in legend.get_texts()]
+    legend.remove()
+    return handles, labels
+
+
+class Facets:
+    def __init__(self, chart, x, y, df, facet_column, columns = None, sharex = None, sharey = None, facet_order = None, **chart_kwargs):
+        # One chart per value of facet_column, chart is a chart class such as Scatter and chart_kwargs go to each panel
+        category_column = chart_kwargs.get('category_column')
+        self.df = as_frame(df, chart_columns(x, y, category_column) + [facet_column])
+        self.chart = chart
+        self.x = x
+        self.y = y
+        self.facet_column = facet_column
+        self.columns = columns
+
+        # Bars keep their own groups in every panel, so by default only their value axis is shared
+        group_axis = _group_axis(chart)
+        self.sharex = sharex if sharex is not None else group_axis != 'x'
+        self.sharey = sharey if sharey is not None else group_axis != 'y'
+
+        # Every panel gets the categories of the whole dataframe, so a category has the same colour in all of them
+        if category_column is not None and chart_kwargs.get('category_list') is None and chart_kwargs.get('custom_ranges') is None:
+            chart_kwargs['category_list'] = list(pd.unique(self.df[category_column].dropna()))
+        self.chart_kwargs = chart_kwargs
+
+        # A single pass over the facet column splits the rows between the panels, rows with a missing facet value are dropped
+        codes, facets = pd.factorize(self.df[facet_column])
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(facets) + 1))
+        rows = {facet: order[bounds[i]:bounds[i + 1]] for i, facet in enumerate(facets)}
+
+        if facet_order is not None:
+            missing = [facet for facet in facet_order if facet not in rows]
+            if missing:
+                raise ValueError(f"The column {facet_column} has no value{'s' if len(missing) > 1 else ''} {', '.join(map(repr, missing))}")
+            facets = list(facet_order)
+
+        self.facets = list(facets)
+        self._rows = [rows[facet] for facet in self.facets]
+        self.charts = [chart(x, y, df=self.df.take(panel_rows), **chart_kwargs) for panel_rows in self._rows]
+        self._figure = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        # Let go of every panel's artists, and clear the figure if plot created it
+        for chart in self.charts:
+            chart.close()
+        fig, self._figure = self._figure, None
+        if fig is not None:
+            fig.clear()
+
+    def _grid(self):
+        columns = self.columns or math.ceil(math.sqrt(len(self.charts)))
+        columns = max(1, min(columns, len(self.charts)))
+        return math.ceil(len(self.charts) / columns), columns
+
+    def plot(self, x_label = '', y_label = '', title = '', colour_palette = af_categorical, legend = True, legend_loc = 'outside lower center', theme = DEFAULT_THEME, panel_size = (3.2, 2.4), layout = 'constrained', fig = None, **plot_kwargs):
+        # Every panel is drawn on one figure under one theme, plot_kwargs go to each panel's plot
+        if not self.charts:
+            raise ValueError(f"The column {self.facet_column} has no values to split the chart by")
+        colour_palette = resolve_palette(colour_palette)
+        rows, columns = self._grid()
+
+        with theme_context(theme):
+            if fig is None:
+                fig = self._figure = new_figure(theme=None, layout=layout, figsize=(panel_size[0] * columns, panel_size[1] * rows))
+            axes = fig.subplots(rows, columns, squeeze=False).ravel()
+            panels = axes[:len(self.charts)]
+
+            # Category codes and row colours come from one pass over the whole dataframe, each panel gets its own rows of them.
+            # Aggregated bars colour their groups rather than the rows, so they are left to work them out per panel
+            row_colours = None
+            aggregated = self.chart_kwargs.get('agg') is not None or self.chart_kwargs.get('top_n') is not None
+            if self.chart_kwargs.get('category_column') is not None and not aggregated:
+                categories, category_colours, row_colours = self.charts[0]._colour_rows(self.df, colour_palette)
+
+            handles = {}
+            for i, (facet, chart, ax) in enumerate(zip(self.facets, self.charts, axes)):
+                if row_colours is not None:
+                    chart._preset_colours = (categories, category_colours, row_colours[self._rows[i]])
+                # The theme is already active, so the panels skip applying it again
+                try:
+                    chart.plot(title=str(facet), colour_palette=colour_palette, legend=False, theme=None, ax=ax, **plot_kwargs)
+                finally:
+                    chart._preset_colours = None
+
+                # One legend for the whole figure, with each label listed once
+                for handle, label in zip(*_legend_entries(ax)):
+                    handles.setdefault(label, handle)
+
+                # Axis labels only on the outer panels, inner panels drop the tick labels of shared axes as well
+                if i + columns >= len(self.charts):
+                    ax.set_xlabel(x_label)
+                elif self.sharex:
+                    ax.tick_params(axis='x', labelbottom=False)
+                if i % columns == 0:
+                    ax.set_ylabel(y_label)
+                elif self.sharey:
+                    ax.tick_params(axis='y', labelleft=False)
+
+            # Limits are shared once every panel is drawn rather than through matplotlib's shared axes,
+            # which look through all the other panels every time one of them reads its limits
+            if self.sharex:
+                _share_limits(panels, 'x')
+            if self.sharey:
+                _share_limits(panels, 'y')
+
+            for ax in axes[len(self.charts):]:
+                ax.set_visible(False)
+
+            if title:
+                fig.suptitle(title)
+            if legend and handles:
+                fig.legend(list(handles.values()), list(handles), loc=legend_loc, ncol=min(len(handles), max(columns, 4)))
+
+        return fig
+
+    def render(self, format = None, dpi = None, to = None, rasterize_threshold = RASTERIZE_THRESHOLD, **plot_kwargs):
+        # Plot every panel on a figure of its own and save it straight to a buffer or path, or return the bytes when to is None
+        file_format = output_format(format, to)
+        theme = plot_kwargs.get('theme', DEFAULT_THEME)
+        fig = self.plot(**plot_kwargs)
+        try:
+            if file_format in VECTOR_FORMATS and rasterize_threshold is not None:
+                rasterize_dense_artists(fig, rasterize_threshold)
+
+            target = io.BytesIO() if to is None else to
+            with theme_context(theme):
+                fig.savefig(target, format=file_format, dpi=dpi)
+        finally:
+            self.close()
+            fig.clear()
+
+        return target.getvalue() if to is None else to
@@ -0,0 +1,105 @@
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+
+from .themes import DEFAULT_THEME, compile_theme
+
+# Spare figures kept for each theme, layout and size
+POOL_SIZE = 4
+
+_SUBPLOT_PARAMS = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+
+
+def _theme_key(theme):
+    # Themes given by name or path are keyed by it, dict themes by their settings
+    if theme is None or isinstance(theme, (str, os.PathLike)):
+        return theme
+    return repr(sorted(compile_theme(theme).items()))
+
+
+class FigurePool:
+    # Cleared figures handed out again for renders with the same theme, layout and size instead of building new ones
+    def __init__(self, max_figures = POOL_SIZE):
+        self.max_figures = max_figures
+
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+        self._free = {}
+        # Key, subplot parameters and whether it is in use for every figure the pool made, forgotten once a figure is collected
+        self._figures = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(free) for free in self._free.values())
+
+    def acquire(self, theme = DEFAULT_THEME, layout = 'constrained', figsize = None, dpi = None):
+        key = (_theme_key(theme), layout, tuple(figsize) if figsize is not None else None, dpi)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                fig = free.pop()
+                self._figures[fig][2] = True
+                self.reused += 1
+                return fig
+
+        from .charts import new_figure
+
+        kwargs = {name: value for name, value in (('figsize', figsize), ('dpi', dpi)) if value is not None}
+        fig = new_figure(theme=theme, layout=layout, **kwargs)
+        state = (tuple(fig.get_size_inches()), fig.dpi, type(fig.get_layout_engine()))
+        params = {name: getattr(fig.subplotpars, name) for name in _SUBPLOT_PARAMS}
+        with self._lock:
+            self._figures[fig] = [key, (state, params), True]
+            self.created += 1
+        return fig
+
+    def release(self, fig):
+        # Clear a figure and keep it for the next render, figures that were resized or given another layout are dropped
+        with self._lock:
+            entry = self._figures.get(fig)
+            if entry is None:
+                raise ValueError("The figure wasn't made by this pool")
+            if not entry[2]:
+                raise ValueError("The figure has already been released")
+            entry[2] = False
+
+        fig.clear()
+        key, (state, params) = entry[0], entry[1]
+        # Layout engines such as the fixed layout move the subplot parameters on every draw
+        fig.subplotpars.update(**params)
+
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_figures and (tuple(fig.get_size_inches()), fig.dpi, type(fig.get_layout_engine())) == state:
+                free.append(fig)
+            else:
+                del self._figures[fig]
+                self.discarded += 1
+
+    @contextmanager
+    def figure(self, theme = DEFAULT_THEME, layout = 'constrained', figsize = None, dpi = None):
+        fig = self.acquire(theme, layout, figsize, dpi)
+        try:
+            yield fig
+        finally:
+            self.release(fig)
+
+    def clear(self):
+        with self._lock:
+            for free in self._free.values():
+                for fig in free:
+                    del self._figures[fig]
+            self._free.clear()
+
+    def stats(self):
+        requests = self.created + self.reused
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'reuse_rate': self.reused / requests if requests else 0.0,
+            'discarded': self.discarded,
+            'spare': len(self),
+        }
@@ -0,0 +1,189 @@
+import operator
+import os
+
+from ._lazy import LazyModule
+from .adapters import as_frame
+from .bars import category_columns, combine_groups, fold_groups
+from .density import accumulate, data_extent
+from .downsample import minmax_indices
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+# Rows read at a time, peak memory is bounded by this many rows of the columns a chart uses
+FILE_CHUNK_SIZE = 1_000_000
+
+# Aggregations whose results for each chunk can be combined into the result for the whole file
+FILE_AGGREGATIONS = ('sum', 'mean', 'count', 'min', 'max')
+
+_PARQUET_EXTENSIONS = ('.parquet', '.pq', '.parq')
+
+_FILTER_OPERATORS = {
+    '==': operator.eq, '=': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    'in': lambda values, value: values.isin(value),
+    'not in': lambda values, value: ~values.isin(value),
+}
+
+
+def detect_format(path, file_format = None):
+    # Explicit format first, then Parquet for Parquet extensions and directories of Parquet files, otherwise CSV
+    if file_format:
+        return file_format.lower()
+    path = os.fspath(path)
+    if os.path.isdir(path) or path.lower().endswith(_PARQUET_EXTENSIONS):
+        return 'parquet'
+    return 'csv'
+
+
+def _check_filters(filters):
+    # Filters are (column, operator, value) tuples which all have to hold, the same form pandas/pyarrow take for Parquet
+    for item in filters or []:
+        if len(item) != 3 or item[1] not in _FILTER_OPERATORS:
+            raise ValueError(f"Filters are (column, operator, value) tuples with one of the operators {', '.join(_FILTER_OPERATORS)}, got {item!r}")
+    return list(filters or [])
+
+
+def _filter_rows(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for column, op, value in filters:
+        mask &= np.asarray(_FILTER_OPERATORS[op](df[column], value), dtype=bool)
+    return df[mask]
+
+
+def read_chunks(path, columns, filters = None, chunk_size = FILE_CHUNK_SIZE, file_format = None):
+    # Dataframes of at most chunk_size rows holding only the chart's columns, with rows failing the filters left out
+    filters = _check_filters(filters)
+    columns = list(dict.fromkeys(columns))
+    file_format = detect_format(path, file_format)
+
+    if file_format == 'parquet':
+        # Filters are pushed down to pyarrow, which skips row groups whose statistics rule them out
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        dataset = ds.dataset(os.fspath(path), format='parquet')
+        expression = pq.filters_to_expression(filters) if filters else None
+        for batch in dataset.to_batches(columns=columns, filter=expression, batch_size=chunk_size):
+            if batch.num_rows:
+                yield as_frame(batch, columns)
+
+    elif file_format == 'csv':
+        # CSV can only be filtered once a chunk is read, but the filter columns are dropped straight after
+        filter_columns = [column for column, _, _ in filters if column not in columns]
+        for chunk in pd.read_csv(path, usecols=columns + filter_columns, chunksize=chunk_size):
+            if filters:
+                chunk = _filter_rows(chunk, filters)[columns]
+            if len(chunk):
+                yield chunk
+
+    else:
+        raise ValueError(f"Unsupported file format '{file_format}', use csv or parquet")
+
+
+def group_totals(chunks, x, y, agg = 'sum', top_n = None, other_label = 'Other', category_column = None):
+    # One row per bar from chunks of long format data, only one row per group is kept between chunks
+    if agg not in FILE_AGGREGATIONS:
+        raise ValueError(f"Aggregation '{agg}' can't be built up chunk by chunk, use one of {', '.join(FILE_AGGREGATIONS)}")
+    if top_n is not None and top_n < 1:
+        raise ValueError(f"top_n must be at least 1, got {top_n}")
+
+    value_columns = list(y) if type(y) == list else [y]
+    stats = ['sum', 'count'] if agg == 'mean' else [agg]
+    # How the results for each chunk combine, counts add up like sums
+    combine = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+    totals = first = None
+    columns = text_category = None
+    for chunk in chunks:
+        if columns is None:
+            columns, text_category = category_columns(chunk, x, value_columns, category_column)
+
+        grouped = chunk.groupby(x, sort=False, observed=True)
+        partial = grouped[columns].agg(stats)
+        totals = partial if totals is None else pd.concat([totals, partial]).groupby(level=0, sort=False).agg({key: combine[key[1]] for key in partial.columns})
+        if text_category is not None:
+            chunk_first = grouped[text_category].first()
+            first = chunk_first if first is None else pd.concat([first, chunk_first]).groupby(level=0, sort=False).first()
+
+    if totals is None:
+        raise ValueError("No rows were left to plot after filtering")
+
+    sums = counts = None
+    if agg == 'mean':
+        sums = totals.xs('sum', axis=1, level=1)
+        counts = totals.xs('count', axis=1, level=1)
+        table = sums / counts
+    else:
+        table = totals.xs(agg, axis=1, level=1)
+
+    labels = list(table.index)
+    table = table.reset_index(drop=True)
+    if sums is not None:
+        sums, counts = sums.reset_index(drop=True), counts.reset_index(drop=True)
+    if text_category is not None:
+        table[text_category] = first.reindex(labels).to_numpy()
+
+    return fold_groups(table, labels, x, value_columns, top_n, other_label, text_category, lambda tail: combine_groups(agg, table[columns], tail, sums, counts))
+
+
+def line_extremes(chunks, x, y, n_buckets):
+    # Rows holding the minimum and maximum of every series in each of n_buckets runs of rows, kept bounded between chunks
+    series = list(y) if type(y) == list else [y]
+    kept = None
+    for chunk in chunks:
+        chunk = chunk[[x] + series].reset_index(drop=True)
+        chunk = chunk.iloc[_extreme_rows(chunk, series, n_buckets)]
+        kept = chunk if kept is None else pd.concat([kept, chunk], ignore_index=True)
+        # Everything kept so far is reduced again once it grows past a few chunks worth of extremes
+        if len(kept) > 8 * n_buckets * len(series):
+            kept = kept.iloc[_extreme_rows(kept, series, n_buckets)].reset_index(drop=True)
+
+    if kept is None:
+        raise ValueError("No rows were left to plot after filtering")
+    kept = kept.iloc[_extreme_rows(kept, series, n_buckets)].reset_index(drop=True)
+
+    # CSV files hold dates as text, which would otherwise be plotted as one category per row
+    if pd.api.types.is_string_dtype(kept[x]) or kept[x].dtype == object:
+        try:
+            kept[x] = pd.to_datetime(kept[x])
+        except (ValueError, TypeError):
+            pass
+    return kept
+
+
+def _extreme_rows(df, series, n_buckets):
+    # Union of the extremes of every series, so all series keep sharing one x column
+    index = [minmax_indices(df[name].to_numpy(dtype=float, na_value=np.nan), n_buckets) for name in series]
+    return np.unique(np.concatenate(index))
+
+
+def value_extent(chunks, x, y):
+    # Smallest and largest finite x and y over every chunk
+    x_min = y_min = np.inf
+    x_max = y_max = -np.inf
+    for chunk in chunks:
+        x_values = chunk[x].to_numpy(dtype=float, na_value=np.nan)
+        y_values = chunk[y].to_numpy(dtype=float, na_value=np.nan)
+        finite = np.isfinite(x_values) & np.isfinite(y_values)
+        if finite.any():
+            x_min, x_max = min(x_min, x_values[finite].min()), max(x_max, x_values[finite].max())
+            y_min, y_max = min(y_min, y_values[finite].min()), max(y_max, y_values[finite].max())
+
+    if not np.isfinite(x_min):
+        raise ValueError("No rows were left to plot after filtering")
+    return data_extent(np.array([x_min, x_max]), np.array([y_min, y_max]))
+
+
+def point_counts(chunks, x, y, extent, shape, layers = None):
+    # 2D histogram built up chunk by chunk, layers(chunk) gives the layer of each row and how many layers there are so far
+    width, height = shape
+    cells = width * height
+    counts = np.zeros(cells, dtype=np.int64)
+    for chunk in chunks:
+        codes, n_layers = layers(chunk) if layers is not None else (None, 1)
+        # Categories turn up as they are read, so the counts grow a layer at a time
+        if n_layers * cells > len(counts):
+            counts = np.concatenate([counts, np.zeros(n_layers * cells - len(counts), dtype=np.int64)])
+        accumulate(counts, chunk[x].to_numpy(dtype=float, na_value=np.nan), chunk[y].to_numpy(dtype=float, na_value=np.nan), extent, shape, codes)
+    return counts.reshape(-1, height, width)
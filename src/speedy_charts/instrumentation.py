@@ -0,0 +1,136 @@
+import contextvars
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Collectors listening in the current thread or task, and callbacks listening for the whole process
+_collectors = contextvars.ContextVar('speedy_charts_collectors', default=())
+_callbacks = []
+
+
+class Span:
+    # One timed phase of drawing a chart, handed to every collector and callback once the phase finishes
+    def __init__(self, name, chart = None, rows = None, artists = None):
+        self.name = name
+        self.chart = chart
+        self.rows = rows
+        self.artists = artists
+        self.start = None
+        self.duration = None
+        self.error = None
+
+    def record(self, rows = None, artists = None):
+        if rows is not None:
+            self.rows = rows
+        if artists is not None:
+            self.artists = artists
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _emit(self)
+        return False
+
+    def __repr__(self):
+        return f"Span(name={self.name!r}, chart={self.chart!r}, duration={self.duration!r}, rows={self.rows!r}, artists={self.artists!r})"
+
+
+class _NullSpan:
+    # Handed out while nothing is listening, so an instrumented phase only costs a couple of lookups
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def record(self, rows = None, artists = None):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, chart = None, rows = None):
+    if not _callbacks and not _collectors.get():
+        return _NULL_SPAN
+    return Span(name, chart, rows)
+
+
+def _emit(span):
+    for collector in _collectors.get():
+        collector.add(span)
+    for callback in list(_callbacks):
+        # A broken metrics hook shouldn't stop the chart from rendering
+        try:
+            callback(span)
+        except Exception:
+            logger.exception('Instrumentation callback %r failed', callback)
+
+
+class _TimedLayout:
+    # Stands in for a layout engine's execute, layout runs inside matplotlib's draw so this is the only place it can be timed
+    def __call__(self, fig):
+        engine = fig.get_layout_engine()
+        with span('layout'):
+            return type(engine).execute(engine, fig)
+
+
+def time_layout(fig):
+    # Report the figure's layout as a span of its own whenever it is drawn, holds no state so the figure can still be pickled
+    engine = fig.get_layout_engine()
+    if engine is not None and not isinstance(vars(engine).get('execute'), _TimedLayout):
+        engine.execute = _TimedLayout()
+
+
+def add_callback(callback):
+    # Called with every finished span in the process, from whichever thread drew the chart
+    _callbacks.append(callback)
+    return callback
+
+
+def remove_callback(callback):
+    _callbacks.remove(callback)
+
+
+class Collector:
+    # Keeps the spans of every chart drawn inside its with block, in the same thread or asyncio task
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_collectors.set(_collectors.get() + (self,)))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _collectors.reset(self._tokens.pop())
+        return False
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+    def totals(self):
+        # Count, time, rows and artists summed per phase
+        totals = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            total = totals.setdefault(span.name, {'count': 0, 'seconds': 0.0, 'rows': 0, 'artists': 0})
+            total['count'] += 1
+            total['seconds'] += span.duration
+            total['rows'] += span.rows or 0
+            total['artists'] += span.artists or 0
+        return totals
@@ -0,0 +1,270 @@
+import functools
+import math
+
+# Only imported by new_figure, so matplotlib is already being loaded by the time this module is
+import matplotlib as mpl
+import numpy as np
+from matplotlib.font_manager import FontProperties
+from matplotlib.layout_engine import LayoutEngine
+from matplotlib.textpath import text_to_path
+
+# Layouts a figure can be created with, 'fixed' works out its margins in a single pass instead of constrained layout's solver
+LAYOUTS = ('constrained', 'fixed', 'tight', 'compressed', 'none')
+
+# Points of space left at the edges of the figure and between panels
+FIXED_LAYOUT_PAD = 3.0
+
+# Measured strings kept per font, tick labels and titles repeat across charts so most lookups are hits
+TEXT_METRICS_CACHE_SIZE = 8192
+
+# Where the anchor of an outside legend sits for each side it is moved to
+_LEGEND_LOCATIONS = {'bottom': 'upper center', 'right': 'upper left'}
+
+
+@functools.lru_cache(maxsize=TEXT_METRICS_CACHE_SIZE)
+def _line_extent(text, family, size, weight, style):
+    # Width and height in points of one line of text, lines are at least as tall as 'lp' like matplotlib lays them out
+    prop = FontProperties(family=list(family), size=size, weight=weight, style=style)
+    ismath = text.count('$') >= 2 and text.count('$') % 2 == 0
+    width, height, _ = text_to_path.get_text_width_height_descent(text, prop, ismath=ismath)
+    if text != 'lp':
+        height = max(height, _line_extent('lp', family, size, weight, style)[1])
+    return width, height
+
+
+def text_extent(text, prop, rotation = 0, linespacing = 1.2):
+    # Width and height in points of the box around some text once rotated, from cached measurements of its font
+    if not text:
+        return 0.0, 0.0
+    key = (tuple(prop.get_family()), prop.get_size_in_points(), prop.get_weight(), prop.get_style())
+    lines = [_line_extent(line, *key) for line in text.split('\n')]
+    width = max(line[0] for line in lines)
+    height = sum(line[1] for line in lines) + (len(lines) - 1) * (linespacing - 1) * key[1]
+
+    angle = math.radians(rotation)
+    return abs(width * math.cos(angle)) + abs(height * math.sin(angle)), abs(width * math.sin(angle)) + abs(height * math.cos(angle))
+
+
+def clear_text_metrics():
+    _line_extent.cache_clear()
+
+
+def _text_size(text):
+    if text is None or not text.get_visible():
+        return 0.0, 0.0
+    # Newer matplotlib releases default to 'normal' spacing, which is the same 1.2 older releases use
+    spacing = getattr(text, 'get_linespacing', lambda: 1.2)()
+    return text_extent(text.get_text(), text.get_fontproperties(), text.get_rotation(), spacing if isinstance(spacing, (int, float)) else 1.2)
+
+
+def _tick_labels(axis):
+    # Positions (0 to 1 along the axes) and sizes of the labels the axis will draw, formatted straight from its locator
+    # and formatter rather than by building the tick artists
+    locs = np.asarray(axis.get_majorticklocs(), dtype=float)
+    if len(locs) == 0:
+        return np.empty(0), [], ''
+    labels = axis.major.formatter.format_ticks(locs)
+
+    ax = axis.axes
+    points = np.column_stack([locs, locs])
+    fractions = (ax.transScale + ax.transLimits).transform(points)[:, 0 if axis.axis_name == 'x' else 1]
+    inside = (fractions >= -1e-9) & (fractions <= 1 + 1e-9)
+
+    label = axis.majorTicks[0].label1
+    prop, rotation = label.get_fontproperties(), label.get_rotation()
+    sizes = [text_extent(text, prop, rotation) for text, keep in zip(labels, inside) if keep]
+    return fractions[inside], sizes, axis.major.formatter.get_offset()
+
+
+def _axis_margins(axis, axes_size):
+    # Points that tick labels, the axis label and the offset text take up beyond each side of the axes
+    margins = {'left': 0.0, 'right': 0.0, 'bottom': 0.0, 'top': 0.0}
+    if not axis.get_visible() or not axis.axes.axison:
+        return margins
+
+    params = axis.get_tick_params()
+    near, far = ('bottom', 'top') if axis.axis_name == 'x' else ('left', 'right')
+    sides = [side for side in (near, far) if params.get(f'label{side}')]
+    tick = axis.majorTicks[0]
+    fractions, sizes, offset = _tick_labels(axis) if sides else (np.empty(0), [], '')
+
+    # Across the axis: ticks, padding and the deepest label
+    depth = tick.get_tick_padding() + tick.get_pad()
+    if sizes:
+        depth += max(size[1] if axis.axis_name == 'x' else size[0] for size in sizes)
+    for side in sides:
+        margins[side] = depth
+
+    label = axis.label
+    if label.get_visible() and label.get_text():
+        width, height = _text_size(label)
+        side = axis.get_label_position()
+        margins[side] = max(margins[side], tick.get_tick_padding()) + axis.labelpad + (height if axis.axis_name == 'x' else width)
+
+    # Along the axis: labels at the ends can stick out past the edges of the axes
+    if sizes:
+        if axis.axis_name == 'x':
+            align = {'left': 0.0, 'center': 0.5, 'right': 1.0}[tick.label1.get_horizontalalignment()]
+            extents = [(fraction * axes_size - align * width, fraction * axes_size + (1 - align) * width) for fraction, (width, _) in zip(fractions, sizes)]
+            low, high = 'left', 'right'
+        else:
+            extents = [(fraction * axes_size - height / 2, fraction * axes_size + height / 2) for fraction, (_, height) in zip(fractions, sizes)]
+            low, high = 'bottom', 'top'
+        margins[low] = max(margins[low], -min(extent[0] for extent in extents))
+        margins[high] = max(margins[high], max(extent[1] for extent in extents) - axes_size)
+
+    # Scientific notation sits at the end of the axis
+    if offset:
+        width, height = text_extent(offset, tick.label1.get_fontproperties())
+        if axis.axis_name == 'x':
+            margins[near] += height
+        else:
+            margins['top'] = max(margins['top'], height + tick.get_pad())
+    return margins
+
+
+def _outside_legend(ax, legend):
+    # Side of the axes a legend was anchored outside of, None for legends inside the axes
+    anchor = ax.transAxes.inverted().transform(legend.get_bbox_to_anchor().get_points())
+    (x0, y0), (x1, y1) = anchor
+    if y1 <= 0:
+        return 'bottom'
+    if x0 >= 1:
+        return 'right'
+    return None
+
+
+def _figure_legend_side(fig, box):
+    # Figure legends are placed against an edge of the figure, the side is taken from where they end up
+    width, height = fig.bbox.width, fig.bbox.height
+    x, y = (box.x0 + box.x1) / 2 / width, (box.y0 + box.y1) / 2 / height
+    if y < 1 / 3:
+        return 'bottom'
+    if y > 2 / 3:
+        return 'top'
+    return 'right' if x > 0.5 else 'left'
+
+
+class FixedLayoutEngine(LayoutEngine):
+    # Margins sized once per draw from cached text metrics, with no iterative solving. Outside legends are moved to sit
+    # just past the axis labels rather than at fixed offsets. Settings are read from rcParams when the engine is made,
+    # so create it inside the theme the chart is drawn with
+    _adjust_compatible = True
+    _colorbar_gridspec = True
+
+    def __init__(self, pad = FIXED_LAYOUT_PAD, **kwargs):
+        super().__init__(**kwargs)
+        self._params = {'pad': pad, 'title_pad': mpl.rcParams['axes.titlepad']}
+
+    def set(self, pad = None):
+        if pad is not None:
+            self._params['pad'] = pad
+
+    def _axes_margins(self, ax, renderer, width, height):
+        # Points taken up outside the axes on each side, and the outside legends that need placing afterwards
+        position = ax.get_position()
+        axes_width, axes_height = position.width * width, position.height * height
+        margins = {'left': 0.0, 'right': 0.0, 'bottom': 0.0, 'top': 0.0}
+        for axis, size in ((ax.xaxis, axes_width), (ax.yaxis, axes_height)):
+            for side, value in _axis_margins(axis, size).items():
+                margins[side] = max(margins[side], value)
+
+        titles = [ax.get_title(loc) for loc in ('left', 'center', 'right')]
+        if any(titles):
+            prop = ax.title.get_fontproperties()
+            margins['top'] = max(margins['top'], self._params['title_pad'] + max(text_extent(title, prop)[1] for title in titles))
+
+            # With nothing drawn above the axes the title stays where matplotlib starts it, so skip its search for
+            # overlapping labels, which measures every tick label of the axes again on each draw
+            if not ax.xaxis.get_tick_params().get('labeltop') and ax.xaxis.get_label_position() == 'bottom' and not ax.yaxis.major.formatter.get_offset():
+                ax._autotitlepos = False
+
+        legends = []
+        legend = ax.get_legend()
+        if legend is not None and legend.get_visible():
+            side = _outside_legend(ax, legend)
+            if side is not None:
+                box = legend.get_window_extent(renderer)
+                space = legend.borderaxespad * legend.prop.get_size_in_points()
+                # The legend keeps its own borderaxespad from the anchor, so the anchor goes right against the labels
+                legends.append((legend, side, margins[side]))
+                extent = (box.height if side == 'bottom' else box.width) * 72 / ax.figure.dpi
+                margins[side] += space + extent
+        return margins, legends
+
+    def execute(self, fig):
+        renderer = fig._get_renderer()
+        pad = self._params['pad']
+        width, height = fig.get_size_inches() * 72
+
+        panels = [ax for ax in fig.axes if ax.get_visible() and ax.get_subplotspec() is not None]
+        if not panels:
+            return
+        rows, columns = panels[0].get_subplotspec().get_gridspec().get_geometry()
+
+        # The outer margins come from the panels along each edge, the gaps from the panels either side of them
+        measured = []
+        for ax in panels:
+            margins, legends = self._axes_margins(ax, renderer, width, height)
+            measured.append((ax.get_subplotspec(), margins, legends))
+
+        def widest(side, line, start = None, stop = None):
+            # Largest margin on one side among the panels starting or ending at a row/column boundary
+            return max([margins[side] for spec, margins, _ in measured
+                        if getattr(spec, line).start == start or getattr(spec, line).stop == stop] or [0.0])
+
+        def gap(before, after, line, count):
+            return max([0.0] + [widest(before, line, stop=i) + widest(after, line, start=i) for i in range(1, count)])
+
+        left = widest('left', 'colspan', start=0)
+        right = widest('right', 'colspan', stop=columns)
+        top = widest('top', 'rowspan', start=0)
+        bottom = widest('bottom', 'rowspan', stop=rows)
+
+        suptitle = getattr(fig, '_suptitle', None)
+        if suptitle is not None and suptitle.get_visible() and suptitle.get_text():
+            top += _text_size(suptitle)[1] + (1 - suptitle.get_position()[1]) * height
+
+        # Figure legends keep their own placement, they only need room made for them
+        outer = {'left': 0.0, 'right': 0.0, 'bottom': 0.0, 'top': 0.0}
+        for legend in fig.legends:
+            if legend.get_visible():
+                box = legend.get_window_extent(renderer)
+                side = _figure_legend_side(fig, box)
+                extent = box.height if side in ('bottom', 'top') else box.width
+                outer[side] = max(outer[side], extent * 72 / fig.dpi + 2 * legend.borderaxespad * legend.prop.get_size_in_points())
+
+        left_edge = min((left + outer['left'] + pad) / width, 0.45)
+        right_edge = max(1 - (right + outer['right'] + pad) / width, 0.55)
+        bottom_edge = min((bottom + outer['bottom'] + pad) / height, 0.45)
+        top_edge = max(1 - (top + outer['top'] + pad) / height, 0.55)
+
+        # subplots_adjust spaces panels as a fraction of the average panel size
+        gap_width = gap('right', 'left', 'colspan', columns) + pad
+        gap_height = gap('bottom', 'top', 'rowspan', rows) + pad
+        panel_width = max(((right_edge - left_edge) * width - (columns - 1) * gap_width) / columns, 1.0)
+        panel_height = max(((top_edge - bottom_edge) * height - (rows - 1) * gap_height) / rows, 1.0)
+        fig.subplots_adjust(
+            left=left_edge, right=right_edge, bottom=bottom_edge, top=top_edge,
+            wspace=gap_width / panel_width if columns > 1 else 0.0,
+            hspace=gap_height / panel_height if rows > 1 else 0.0,
+        )
+
+        # Outside legends start just past everything else on their side of the axes
+        for spec, _, legends in measured:
+            for legend, side, offset in legends:
+                ax = legend.axes
+                position = ax.get_position()
+                if side == 'bottom':
+                    anchor = (0.5, -offset / (position.height * height))
+                else:
+                    anchor = (1 + offset / (position.width * width), 1)
+                legend.set_loc(_LEGEND_LOCATIONS[side])
+                legend.set_bbox_to_anchor(anchor, transform=ax.transAxes)
+
+
+def figure_layout(layout):
+    # What Figure(layout=...) takes for one of LAYOUTS
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}', use one of {', '.join(LAYOUTS)}")
+    return FixedLayoutEngine() if layout == 'fixed' else layout
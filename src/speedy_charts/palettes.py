@@ -1,10 +1,17 @@
+import functools
+
+from ._lazy import LazyModule
+
+np = LazyModule('numpy')
+mcolors = LazyModule('matplotlib.colors')
+
 af_categorical = ['#12436D', '#28A197', '#801650', '#F46A25', '#F46A25', '#3D3D3D', '#A285D1']
 
 std_diverging_5 = ["#003479", "#858AB3", "#EEEEEE",  "#F19695", "#DD2745"]
 std_diverging_7 = ["#003479", "#636C9F", "#A8AAC6", "#EEEEEE", "#F3B4B2", "#EC7779", "#DD2745"]
 std_diverging_9 = ["#003479", "#505D96", "#858AB3", "#B9BBD0", "#EEEEEE", "#F3B4B2", "#F19695", "#E9666C", "#DD2745"]
 
-oth_diverging_5 = [["#003479", "#858AB3", "#EEEEEE", "#95CCC9", "#00A9A5"]]
+oth_diverging_5 = ["#003479", "#858AB3", "#EEEEEE", "#95CCC9", "#00A9A5"]
 oth_diverging_7 = ["#003479", "#636C9F", "#A8AAC6", "#EEEEEE", "#B3D7D5", "#74C0BD", "#00A9A5"]
 oth_diverging_9 = ["#003479", "#505D96", "#858AB3", "#B9BBD0", "#EEEEEE", "#C2DDDB", "#95CCC9", "#62BBB7", "#00A9A5"]
 
@@ -18,4 +25,97 @@ onehue_sequential_9 = ["#D4F7FF", "#B2DFEE", "#91C6DD", "#72ADCE", "#5595BF", "#
 
 oth_sequential_5 = ["#D9D9D9", "#B3B3B3", "#707070", "#414141", "#222222"]
 oth_sequential_7 = ["#D9D9D9", "#BBBBBB", "#9A9A9A", "#7A7A7A", "#595959", "#3A3A3A", "#222222"]
-oth_sequential_9 = ["#D9D9D9", "#C1C1C1", "#AAAAAA", "#929292", "#7C7C7C", "#646464", "#4B4B4B", "#323232", "#222222"]
\ No newline at end of file
+oth_sequential_9 = ["#D9D9D9", "#C1C1C1", "#AAAAAA", "#929292", "#7C7C7C", "#646464", "#4B4B4B", "#323232", "#222222"]
+
+
+# Palette registry
+# Palettes are parsed into RGBA arrays once and then served from a cache. Sequential and diverging palettes
+# can be stretched to any number of colours by interpolating between their stops.
+PALETTE_KINDS = ('categorical', 'sequential', 'diverging')
+
+# Upper bound on the cached arrays, stretched palettes are generated per requested size
+PALETTE_CACHE_SIZE = 256
+
+_registry = {}
+_kinds_by_colours = {}
+
+
+def register_palette(name, colours, kind = 'categorical'):
+    if kind not in PALETTE_KINDS:
+        raise ValueError(f"Unknown palette kind '{kind}', choose one of {', '.join(PALETTE_KINDS)}")
+    colours = list(colours)
+    _registry[name] = (colours, kind)
+    _kinds_by_colours[tuple(colours)] = kind
+
+
+def palette_names(kind = None):
+    return [name for name, (_, palette_kind) in _registry.items() if kind is None or palette_kind == kind]
+
+
+def get_palette(palette):
+    # Palettes can be passed by registered name or as a list of colours
+    if isinstance(palette, str):
+        if palette not in _registry:
+            raise ValueError(f"Unknown palette '{palette}', choose one of {', '.join(_registry)} or pass a list of colours")
+        return list(_registry[palette][0])
+    return list(palette)
+
+
+def resolve_palette(palette):
+    # Registered names become their colour list, anything else (a list or a single colour) is returned as it is
+    if isinstance(palette, str) and palette in _registry:
+        return list(_registry[palette][0])
+    return palette
+
+
+def palette_kind(palette):
+    if isinstance(palette, str):
+        get_palette(palette)
+        return _registry[palette][1]
+    return _kinds_by_colours.get(tuple(palette), 'categorical')
+
+
+def can_interpolate(palette):
+    return palette_kind(palette) in ('sequential', 'diverging')
+
+
+# The kind is part of the cache key, registering a palette can turn colours already seen as categorical into a sequential palette
+@functools.lru_cache(maxsize=PALETTE_CACHE_SIZE)
+def _palette_rgba(colours, n, kind):
+    rgba = mcolors.to_rgba_array(list(colours))
+
+    if n is not None and n > len(rgba):
+        if kind in ('sequential', 'diverging'):
+            # Interpolate each channel between the palette stops
+            stops = np.linspace(0, 1, len(rgba))
+            positions = np.linspace(0, 1, n)
+            rgba = np.column_stack([np.interp(positions, stops, rgba[:, channel]) for channel in range(4)])
+        else:
+            # Categorical palettes can't be stretched, extra categories reuse the last colour
+            rgba = np.vstack([rgba, np.repeat(rgba[-1:], n - len(rgba), axis=0)])
+    elif n is not None:
+        rgba = rgba[:n]
+
+    rgba.flags.writeable = False
+    return rgba
+
+
+def palette_rgba(palette, n = None):
+    # Cached, read only (n, 4) array of the palette's colours
+    return _palette_rgba(tuple(get_palette(palette)), n, palette_kind(palette))
+
+
+@functools.lru_cache(maxsize=PALETTE_CACHE_SIZE)
+def _palette_colormap(colours, n, kind):
+    return mcolors.ListedColormap(_palette_rgba(colours, n, kind))
+
+
+def palette_colormap(palette, n = None):
+    return _palette_colormap(tuple(get_palette(palette)), n, palette_kind(palette))
+
+
+register_palette('af_categorical', af_categorical, 'categorical')
+for _name, _colours in list(globals().items()):
+    if _name.endswith(('_5', '_7', '_9')) and isinstance(_colours, list):
+        register_palette(_name, _colours, 'diverging' if '_diverging_' in _name else 'sequential')
+del _name, _colours
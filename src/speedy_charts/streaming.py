@@ -0,0 +1,63 @@
+from ._lazy import LazyModule
+
+np = LazyModule('numpy')
+
+
+class RingBuffer:
+    # Fixed capacity buffer where every value is written twice, so the newest values are always one contiguous slice
+    def __init__(self, capacity, dtype = float):
+        if capacity < 1:
+            raise ValueError(f"A ring buffer needs a capacity of at least 1, got {capacity}")
+        self.capacity = int(capacity)
+        self._data = np.zeros(2 * self.capacity, dtype=dtype)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    def append(self, value):
+        end = (self._start + self._size) % self.capacity
+        self._data[end] = value
+        self._data[end + self.capacity] = value
+
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        # Anything older than the last `capacity` values would be overwritten straight away
+        if len(values) > self.capacity:
+            values = values[-self.capacity:]
+        if len(values) == 0:
+            return
+
+        index = (self._start + self._size + np.arange(len(values))) % self.capacity
+        self._data[index] = values
+        self._data[index + self.capacity] = values
+
+        total = self._size + len(values)
+        if total > self.capacity:
+            self._start = (self._start + total - self.capacity) % self.capacity
+            total = self.capacity
+        self._size = total
+
+    def drop(self, count):
+        # Forget the oldest `count` values
+        count = min(int(count), self._size)
+        self._start = (self._start + count) % self.capacity
+        self._size -= count
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+    def values(self):
+        # Oldest to newest, a view that stays valid until the next write
+        return self._data[self._start:self._start + self._size]
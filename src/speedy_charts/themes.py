@@ -0,0 +1,173 @@
+import contextvars
+import importlib.resources
+import os
+import threading
+import warnings
+from contextlib import contextmanager
+
+from ._lazy import LazyModule
+
+mpl = LazyModule('matplotlib')
+mstyle = LazyModule('matplotlib.style')
+font_manager = LazyModule('matplotlib.font_manager')
+
+DEFAULT_THEME = 'speedy_charts.mplstyles.standard_theme'
+
+# Families tried in order when a theme asks for fonts that aren't installed, the first few are metric compatible with Arial
+FONT_FALLBACKS = ['Arial', 'Liberation Sans', 'Arimo', 'Helvetica', 'Nimbus Sans', 'DejaVu Sans']
+
+_GENERIC_FAMILIES = {'serif', 'sans', 'sans-serif', 'cursive', 'fantasy', 'monospace'}
+
+# Settings matplotlib ignores in style files because they aren't about how a chart looks
+_NON_STYLE_KEYS = {
+    'interactive', 'backend', 'webagg.port', 'webagg.address', 'webagg.port_retries', 'webagg.open_in_browser',
+    'backend_fallback', 'toolbar', 'timezone', 'figure.max_open_warning', 'figure.raise_window',
+    'savefig.directory', 'tk.window_focus', 'docstring.hardcopy', 'date.epoch',
+}
+
+_STYLE_ALIASES = {'mpl20': 'default', 'mpl15': 'classic'}
+
+# Settings of the theme active in the current thread or task, read before the process wide rcParams
+_active_rc = contextvars.ContextVar('speedy_charts_theme', default=None)
+_overlay_lock = threading.Lock()
+
+_registry = {}
+_compiled = {}
+
+
+def _load_style(style):
+    # Resolve a style specification the same way matplotlib.style.use does
+    if hasattr(style, 'keys'):
+        return dict(style)
+
+    if isinstance(style, (list, tuple)):
+        rc = {}
+        for item in style:
+            rc.update(_load_style(item))
+        return rc
+
+    if isinstance(style, str):
+        style = _STYLE_ALIASES.get(style, style)
+        if style in _registry:
+            return dict(_registry[style])
+        if style == 'default':
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                return {key: mpl.rcParamsDefault[key] for key in mpl.rcParamsDefault if key not in _NON_STYLE_KEYS}
+        if style in mstyle.library:
+            return dict(mstyle.library[style])
+        if '.' in style and not os.path.exists(style):
+            package, _, name = style.rpartition('.')
+            try:
+                path = importlib.resources.files(package) / f'{name}.mplstyle'
+                return dict(mpl.rc_params_from_file(path, use_default_template=False))
+            except (ModuleNotFoundError, OSError, TypeError):
+                pass
+
+    try:
+        return dict(mpl.rc_params_from_file(style, use_default_template=False))
+    except OSError as exc:
+        raise ValueError(f"'{style}' is not a registered theme, a matplotlib style or a path to an mplstyle file") from exc
+
+
+def _installed_families():
+    # Only TrueType/OpenType fonts can be drawn by Agg, the bundled AFM metrics don't count
+    return {font.name for font in font_manager.fontManager.ttflist}
+
+
+def _resolve_font_family(families):
+    # Swap fonts that aren't installed for the closest available fallback, so text never goes through a failed font lookup
+    installed = _installed_families()
+    available = [family for family in families if family.lower() in _GENERIC_FAMILIES or family in installed]
+    if len(available) == len(families):
+        return list(families)
+
+    fallback = next((family for family in FONT_FALLBACKS if family in installed), None)
+    if fallback is not None and fallback not in available:
+        available.insert(0, fallback)
+    return available or ['sans-serif']
+
+
+def _compile(style):
+    rc = {key: value for key, value in _load_style(style).items() if key not in _NON_STYLE_KEYS}
+
+    # Validate once up front so applying the theme later is a plain dictionary update
+    validated = mpl.RcParams()
+    for key, value in rc.items():
+        validated[key] = value
+    compiled = {key: dict.__getitem__(validated, key) for key in rc}
+
+    if 'font.family' in compiled:
+        compiled['font.family'] = _resolve_font_family(compiled['font.family'])
+
+    return compiled
+
+
+def _cache_key(theme):
+    if isinstance(theme, (list, tuple)):
+        keys = tuple(_cache_key(item) for item in theme)
+        return None if None in keys else keys
+    if isinstance(theme, (str, os.PathLike)):
+        return os.fspath(theme)
+    return None
+
+
+def compile_theme(theme = DEFAULT_THEME):
+    # rc dictionary for a theme, parsed and validated on first use and cached afterwards
+    key = _cache_key(theme)
+    if key is None:
+        return _compile(theme)
+
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = _compiled[key] = _compile(theme)
+    return compiled
+
+
+def register_theme(name, theme):
+    # theme can be a dict of rcParams, a matplotlib style name, an mplstyle path or a list of these
+    _registry[name] = _compile(theme)
+    clear_theme_cache()
+
+
+def clear_theme_cache():
+    _compiled.clear()
+
+
+def _install_overlay():
+    # rcParams is one dict for the whole process, so rather than writing a theme into it, lookups on it check the active theme
+    # first. Renders on other threads keep drawing with their own settings at the same time, and rcParams itself never changes
+    params = mpl.rcParams
+    with _overlay_lock:
+        if getattr(type(params), '_speedy_charts_overlay', False):
+            return
+        base = type(params)
+
+        class ThemedRcParams(base):
+            _speedy_charts_overlay = True
+
+            def __getitem__(self, key):
+                # Copies of rcParams, such as the one rc_context restores from, keep the values actually stored
+                rc = _active_rc.get()
+                if rc is not None and self is params and key in rc:
+                    return rc[key]
+                return base.__getitem__(self, key)
+
+        params.__class__ = ThemedRcParams
+
+
+@contextmanager
+def theme_context(theme = DEFAULT_THEME):
+    # Apply a theme to everything drawn in the current thread or task for the duration of a single render
+    if theme is None:
+        yield
+        return
+
+    rc = compile_theme(theme)
+    _install_overlay()
+    outer = _active_rc.get()
+    token = _active_rc.set({**outer, **rc} if outer else rc)
+    try:
+        yield
+    finally:
+        _active_rc.reset(token)
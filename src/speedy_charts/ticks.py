@@ -0,0 +1,79 @@
+import heapq
+import math
+
+# Only imported once a chart has axes, so matplotlib is already loaded by the time this module is
+import numpy as np
+from matplotlib.ticker import Formatter, Locator
+
+from .layout import text_extent
+
+# Labels measured to find the widest, the longest strings are nearly always the widest as well
+MEASURED_LABELS = 16
+
+# Space kept between neighbouring tick labels, as a fraction of the font size
+LABEL_GAP = 0.5
+
+
+class CategoryLocator(Locator):
+    # Ticks on every nth category, with n the smallest step that keeps neighbouring labels apart at the axis' current size
+    def __init__(self, positions, labels):
+        order = np.argsort(np.asarray(positions, dtype=float), kind='stable')
+        self.positions = np.asarray(positions, dtype=float)[order]
+        self.labels = [str(labels[i]) for i in order]
+        self.label_at = dict(zip(self.positions.tolist(), self.labels))
+        self._longest = heapq.nlargest(MEASURED_LABELS, self.labels, key=len)
+
+    def __call__(self):
+        vmin, vmax = self.axis.get_view_interval()
+        return self.tick_values(vmin, vmax)
+
+    def tick_values(self, vmin, vmax):
+        # Without an axis there is no length to fit labels into, so every category in the interval gets a tick
+        vmin, vmax = sorted((vmin, vmax))
+        first = int(np.searchsorted(self.positions, vmin, side='left'))
+        last = int(np.searchsorted(self.positions, vmax, side='right'))
+        if last <= first:
+            return self.positions[:0]
+        step = self.step(first, last, vmax - vmin) if self.axis is not None else 1
+        # Ticks stay on the same categories as the view pans, rather than following its first category
+        return self.positions[first + (-first) % step:last:step]
+
+    def step(self, first, last, span):
+        ax = self.axis.axes
+        horizontal = self.axis.axis_name == 'x'
+        length = ax.bbox.width if horizontal else ax.bbox.height
+        if last - first < 2 or length <= 0 or span <= 0:
+            return 1
+
+        # Pixels between neighbouring categories in view
+        spacing = length / span * (self.positions[last - 1] - self.positions[first]) / (last - first - 1)
+        if spacing <= 0:
+            return 1
+
+        # Labels clear each other once they are a label's width apart along its text, or a line apart across it
+        label = self.axis.get_major_ticks(1)[0].label1
+        prop, rotation = label.get_fontproperties(), math.radians(label.get_rotation())
+        gap = LABEL_GAP * prop.get_size_in_points()
+        width = max(text_extent(text, prop)[0] for text in self._longest) + gap
+        height = text_extent('lp', prop)[1] + gap
+        along, across = (math.cos(rotation), math.sin(rotation)) if horizontal else (math.sin(rotation), math.cos(rotation))
+        needed = min(width / abs(along) if abs(along) > 1e-6 else math.inf, height / abs(across) if abs(across) > 1e-6 else math.inf)
+
+        return max(1, math.ceil(needed * ax.figure.dpi / 72 / spacing))
+
+
+class CategoryFormatter(Formatter):
+    # Label of the category at each tick, read from the locator so the two always agree
+    def __init__(self, locator):
+        self.locator = locator
+
+    def __call__(self, x, pos = None):
+        return self.locator.label_at.get(float(x), '')
+
+
+def category_ticks(axis, positions, labels):
+    # Label the categories placed at positions, with only as many labels as fit along the axis
+    locator = CategoryLocator(positions, labels)
+    axis.set_major_locator(locator)
+    axis.set_major_formatter(CategoryFormatter(locator))
+    return locator
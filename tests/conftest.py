@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+POSITIONS = ['GK', 'DEF', 'MID', 'FWD']
+
+
+@pytest.fixture
+def teams():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'team': [f'team_{i}' for i in range(12)],
+        'goals': rng.integers(20, 90, 12).astype(float),
+        'assists': rng.integers(10, 60, 12).astype(float),
+        'band': rng.choice(['low', 'high'], 12),
+    })
+
+
+@pytest.fixture
+def players():
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        'minutes': rng.random(500) * 3000,
+        'influence': rng.random(500) * 40,
+        'position': rng.choice(POSITIONS, 500),
+    })
+
+
+@pytest.fixture
+def gameweeks():
+    rng = np.random.default_rng(2)
+    return pd.DataFrame({
+        'gw': np.arange(38, dtype=float),
+        'goals': rng.integers(0, 4, 38).cumsum().astype(float),
+        'assists': rng.integers(0, 3, 38).cumsum().astype(float),
+    })
+
+
+@pytest.fixture
+def chart_specs(teams, players, gameweeks):
+    # One of every chart type as (class, constructor arguments)
+    from speedy_charts.charts import Bar, GroupedBar, HorizontalStackedBar, Line, Scatter, StackedBar
+    return [
+        (Bar, dict(x='team', y='goals', df=teams)),
+        (Bar, dict(x='team', y='goals', df=teams, category_column='band')),
+        (StackedBar, dict(x='team', y=['goals', 'assists'], df=teams)),
+        (HorizontalStackedBar, dict(x='team', y=['goals', 'assists'], df=teams)),
+        (GroupedBar, dict(x='team', y=['goals', 'assists'], df=teams)),
+        (Line, dict(x='gw', y=['goals', 'assists'], df=gameweeks)),
+        (Scatter, dict(x='minutes', y='influence', df=players, category_column='position')),
+    ]
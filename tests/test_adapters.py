@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from speedy_charts.adapters import as_frame
+from speedy_charts.charts import Bar, GroupedBar, HorizontalStackedBar, Line, Scatter, StackedBar
+
+N = 200
+
+
+@pytest.fixture
+def columns():
+    rng = np.random.default_rng(4)
+    return {
+        'team': np.array([f'team_{i % 10}' for i in range(N)]),
+        'goals': rng.random(N) * 100,
+        'assists': rng.integers(0, 50, N),
+        'minutes': np.arange(N, dtype=float),
+        'position': rng.choice(['GK', 'DEF', 'MID', 'FWD'], N),
+    }
+
+
+def to_arrow(columns):
+    pa = pytest.importorskip('pyarrow')
+    return pa.table(columns)
+
+
+def to_polars(columns):
+    pl = pytest.importorskip('polars')
+    return pl.DataFrame(columns)
+
+
+def to_structured(columns):
+    array = np.empty(N, dtype=[(name, values.dtype) for name, values in columns.items()])
+    for name, values in columns.items():
+        array[name] = values
+    return array
+
+
+INPUTS = {
+    'pandas': pd.DataFrame,
+    'dict': dict,
+    'structured': to_structured,
+    'arrow': to_arrow,
+    'polars': to_polars,
+}
+
+
+def test_arrow_numeric_columns_not_copied(columns):
+    table = to_arrow(columns)
+    frame = as_frame(table, ['team', 'goals', 'assists'])
+    for name in ('goals', 'assists'):
+        assert np.shares_memory(frame[name].to_numpy(), table.column(name).chunk(0).to_numpy(zero_copy_only=True))
+    assert list(frame['team']) == list(columns['team'])
+
+
+def test_polars_numeric_columns_not_copied(columns):
+    df = to_polars(columns)
+    frame = as_frame(df, ['team', 'goals', 'assists'])
+    for name in ('goals', 'assists'):
+        assert np.shares_memory(frame[name].to_numpy(), df.get_column(name).to_numpy(allow_copy=False))
+    assert list(frame['team']) == list(columns['team'])
+
+
+def test_structured_array_columns_not_copied(columns):
+    array = to_structured(columns)
+    frame = as_frame(array, ['goals', 'assists', 'team'])
+    for name in ('goals', 'assists'):
+        assert np.shares_memory(frame[name].to_numpy(), array)
+
+
+def test_only_chart_columns_kept(columns):
+    frame = as_frame(columns, ['minutes', 'goals'])
+    assert list(frame.columns) == ['minutes', 'goals']
+
+
+def test_arrow_nulls_kept(columns):
+    pa = pytest.importorskip('pyarrow')
+    table = pa.table({'goals': pa.array([1.0, None, 3.0]), 'team': pa.array(['a', None, 'c'])})
+    frame = as_frame(table, ['team', 'goals'])
+    assert frame['goals'].isna().tolist() == [False, True, False]
+    assert frame['team'].isna().tolist() == [False, True, False]
+
+
+def test_bad_input(columns):
+    with pytest.raises(ValueError, match='has no column'):
+        as_frame(columns, ['goals', 'saves'])
+    with pytest.raises(ValueError, match='needs named fields'):
+        as_frame(np.zeros(3), ['goals'])
+    with pytest.raises(ValueError, match='same length'):
+        as_frame({'a': np.zeros(3), 'b': np.zeros(4)}, ['a', 'b'])
+    with pytest.raises(ValueError, match='Unsupported data type'):
+        as_frame([1, 2, 3], ['a'])
+
+
+CHARTS = [
+    (Bar, dict(x='team', y='goals', agg='sum')),
+    (Bar, dict(x='team', y='goals', category_column='position')),
+    (StackedBar, dict(x='team', y=['goals', 'assists'])),
+    (HorizontalStackedBar, dict(x='team', y=['goals', 'assists'])),
+    (GroupedBar, dict(x='team', y=['goals', 'assists'], agg='mean')),
+    (Line, dict(x='minutes', y=['goals', 'assists'])),
+    (Scatter, dict(x='minutes', y='goals', category_column='position')),
+]
+
+
+@pytest.mark.parametrize('chart, kwargs', CHARTS, ids=lambda value: value.__name__ if isinstance(value, type) else '')
+@pytest.mark.parametrize('input_type', list(INPUTS))
+def test_charts_render_from_every_input(columns, chart, kwargs, input_type):
+    expected = chart(df=pd.DataFrame(columns), **kwargs).render()
+    assert chart(df=INPUTS[input_type](columns), **kwargs).render() == expected
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from speedy_charts.bars import aggregate_bars, group_positions
+from speedy_charts.charts import Bar, GroupedBar
+from speedy_charts.files import group_totals
+
+
+@pytest.fixture
+def rows():
+    return pd.DataFrame({'player': list('aabbbcdd'), 'goals': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0], 'club': list('xxyyyxzz')})
+
+
+@pytest.mark.parametrize('agg, expected', [('sum', [3, 12, 6, 15]), ('mean', [1.5, 4, 6, 7.5]), ('count', [2, 3, 1, 2]), ('max', [2, 5, 6, 8]), (0.5, [1.5, 4, 6, 7.5])])
+def test_aggregations(rows, agg, expected):
+    table = aggregate_bars(rows, 'player', 'goals', agg=agg)
+    assert list(table['player']) == list('abcd')
+    assert list(table['goals']) == expected
+
+
+# Bars ranked by their aggregated value, 'Other' aggregates all the rows of the groups it replaces
+@pytest.mark.parametrize('agg, order, other', [('sum', ['d', 'b'], 9.0), ('mean', ['d', 'c'], 3.0), ('max', ['d', 'c'], 5.0), (0.5, ['d', 'c'], 3.0)])
+def test_top_n_folds_the_rest_into_other(rows, agg, order, other):
+    table = aggregate_bars(rows, 'player', 'goals', agg=agg, top_n=2)
+    assert list(table['player']) == order + ['Other']
+    assert table['goals'].iloc[-1] == other
+
+
+def test_text_category_kept(rows):
+    table = aggregate_bars(rows, 'player', 'goals', top_n=2, category_column='club')
+    assert list(table['club']) == ['z', 'y', 'Other']
+
+
+@pytest.mark.parametrize('top_n', [None, 2])
+def test_category_column_same_as_x(rows, top_n):
+    table = aggregate_bars(rows, 'player', 'goals', top_n=top_n, category_column='player')
+    assert list(table.columns) == ['player', 'goals']
+    Bar(x='player', y='goals', df=rows, category_column='player', agg='sum', top_n=top_n).render()
+
+
+@pytest.mark.parametrize('category_column', [None, 'club', 'player'])
+def test_chunked_totals_match(rows, category_column):
+    chunks = [rows.iloc[:3], rows.iloc[3:5], rows.iloc[5:]]
+    expected = aggregate_bars(rows, 'player', 'goals', agg='mean', top_n=2, category_column=category_column)
+    pd.testing.assert_frame_equal(group_totals(iter(chunks), 'player', 'goals', agg='mean', top_n=2, category_column=category_column), expected)
+
+
+def test_unknown_aggregation(rows):
+    with pytest.raises(ValueError, match='Unknown aggregation'):
+        aggregate_bars(rows, 'player', 'goals', agg='mode')
+    with pytest.raises(ValueError, match='top_n must be at least 1'):
+        aggregate_bars(rows, 'player', 'goals', top_n=0)
+
+
+def test_group_positions():
+    positions, labels = group_positions(['b', 'a', 'b', None, 'c'])
+    assert labels == ['b', 'a', 'c']
+    assert np.array_equal(positions[[0, 1, 2, 4]], [0, 1, 0, 2]) and np.isnan(positions[3])
+    positions, labels = group_positions([3, 1, 2])
+    assert labels is None and list(positions) == [3, 1, 2]
+
+
+def test_grouped_bar_aggregates(rows):
+    rows = rows.assign(assists=rows['goals'] / 2)
+    assert GroupedBar(x='player', y=['goals', 'assists'], df=rows, agg='sum').render()
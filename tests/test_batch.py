@@ -0,0 +1,97 @@
+import multiprocessing
+import sys
+
+import pytest
+
+from speedy_charts.batch import main, render_batch
+from speedy_charts.charts import Bar, Line
+from speedy_charts.themes import DEFAULT_THEME
+
+
+def specs():
+    return [
+        {'chart': 'Bar', 'df': 'teams', 'x': 'team', 'y': 'goals', 'plot': {'title': 'Goals'}},
+        {'chart': 'Line', 'df': 'gameweeks', 'x': 'gw', 'y': ['goals', 'assists']},
+        {'chart': 'Pie', 'df': 'teams', 'x': 'team', 'y': 'goals'},
+        {'chart': 'Bar', 'df': 'missing', 'x': 'team', 'y': 'goals'},
+        {'chart': 'Bar', 'df': 'teams', 'x': 'team', 'y': 'assists', 'format': 'svg'},
+    ]
+
+
+def test_results_in_spec_order(teams, gameweeks):
+    results = render_batch(specs(), dataframes={'teams': teams, 'gameweeks': gameweeks}, processes=1)
+
+    assert [result.index for result in results] == list(range(5))
+    assert [result.ok for result in results] == [True, True, False, False, True]
+    # A failing spec keeps its traceback and the specs after it still render
+    assert "Unknown chart type 'Pie'" in results[2].error
+    assert "No dataframe called 'missing'" in results[3].error
+    assert results[0].data == Bar(x='team', y='goals', df=teams).render(title='Goals')
+    assert results[1].data == Line(x='gw', y=['goals', 'assists'], df=gameweeks).render()
+    assert results[4].data.lstrip().startswith(b'<?xml')
+
+
+def test_processes_give_the_same_bytes(teams, gameweeks, monkeypatch):
+    # SVG output carries a timestamp and random ids unless both are pinned
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '0')
+    pinned = specs()
+    pinned[4]['plot'] = {'theme': [DEFAULT_THEME, {'svg.hashsalt': 'batch'}]}
+
+    dataframes = {'teams': teams, 'gameweeks': gameweeks}
+    one = render_batch(pinned, dataframes=dataframes, processes=1)
+    two = render_batch(pinned, dataframes=dataframes, processes=2)
+
+    assert [result.data for result in two] == [result.data for result in one]
+    assert [result.ok for result in two] == [result.ok for result in one]
+
+
+def test_output_paths(tmp_path, teams):
+    nested = tmp_path / 'charts' / 'teams' / 'goals.png'
+    results = render_batch([
+        {'chart': 'Bar', 'df': 'teams', 'x': 'team', 'y': 'goals', 'output': str(nested)},
+        {'chart': 'Bar', 'df': 'teams', 'x': 'team', 'y': 'goals', 'output': str(tmp_path / 'goals.svg')},
+    ], dataframes={'teams': teams}, processes=1)
+
+    assert all(result.ok and result.data is None for result in results)
+    assert results[0].output == str(nested)
+    assert nested.read_bytes() == Bar(x='team', y='goals', df=teams).render()
+    # The format follows the extension of the output path
+    assert (tmp_path / 'goals.svg').read_bytes().lstrip().startswith(b'<?xml')
+
+
+@pytest.mark.parametrize('platform, method', [('linux', 'fork'), ('darwin', None), ('win32', None)])
+def test_start_method(monkeypatch, platform, method):
+    asked = []
+
+    def get_context(name = None):
+        asked.append(name)
+        raise RuntimeError('stop before starting workers')
+
+    monkeypatch.setattr(sys, 'platform', platform)
+    monkeypatch.setattr(multiprocessing, 'get_context', get_context)
+    with pytest.raises(RuntimeError):
+        render_batch([{'chart': 'Bar'}] * 2, processes=2)
+    assert asked == [method]
+
+
+def test_command_line(tmp_path, teams, capsys):
+    teams.to_csv(tmp_path / 'teams.csv', index=False)
+    spec = '{"chart": "Bar", "df": "teams", "x": "team", "y": "goals", "output": "%s"}'
+    (tmp_path / 'good.jsonl').write_text(spec % (tmp_path / 'out' / 'good.png'))
+    (tmp_path / 'bad.jsonl').write_text('\n'.join([spec % (tmp_path / 'out' / 'first.png'), spec.replace('"Bar"', '"Pie"') % (tmp_path / 'out' / 'bad.png')]))
+
+    assert main([str(tmp_path / 'good.jsonl'), '--data', f'teams={tmp_path / "teams.csv"}', '--processes', '1']) == 0
+    assert (tmp_path / 'out' / 'good.png').exists()
+    assert 'Rendered 1 of 1 charts' in capsys.readouterr().out
+
+    assert main([str(tmp_path / 'bad.jsonl'), '--data', f'teams={tmp_path / "teams.csv"}', '--processes', '2']) == 1
+    captured = capsys.readouterr()
+    assert 'Rendered 1 of 2 charts' in captured.out
+    assert 'Spec 1 failed' in captured.err and "Unknown chart type 'Pie'" in captured.err
+    assert (tmp_path / 'out' / 'first.png').exists()
+
+    # Specs written to disk need an output path
+    (tmp_path / 'no_output.jsonl').write_text('{"chart": "Bar", "df": "teams", "x": "team", "y": "goals"}')
+    with pytest.raises(SystemExit) as exit:
+        main([str(tmp_path / 'no_output.jsonl'), '--data', f'teams={tmp_path / "teams.csv"}'])
+    assert exit.value.code == 2
@@ -0,0 +1,159 @@
+import os
+
+import numpy as np
+import pytest
+
+from speedy_charts.cache import RenderCache, render_key
+from speedy_charts.charts import Bar, Line, Scatter, StreamingLine
+
+
+def bar_key(df, **plot_kwargs):
+    return render_key(Bar(x='team', y='goals', df=df), plot_kwargs)
+
+
+def test_same_chart_same_key(teams):
+    assert bar_key(teams) == bar_key(teams.copy())
+    # Leaving an argument out and passing its default give the same key
+    assert bar_key(teams) == bar_key(teams, title='', theme='speedy_charts.mplstyles.standard_theme')
+
+
+def test_data_change(teams):
+    changed = teams.copy()
+    changed.loc[3, 'goals'] += 1
+    assert bar_key(changed) != bar_key(teams)
+
+    renamed = teams.copy()
+    renamed.loc[0, 'team'] = 'someone else'
+    assert bar_key(renamed) != bar_key(teams)
+
+
+def test_unused_columns_ignored(teams):
+    assert bar_key(teams.assign(assists=0.0)) == bar_key(teams)
+
+
+def test_row_order(teams):
+    assert bar_key(teams.iloc[::-1].reset_index(drop=True)) != bar_key(teams)
+
+
+def test_dtype(teams):
+    assert bar_key(teams.astype({'goals': 'float32'})) != bar_key(teams)
+    assert bar_key(teams.astype({'goals': 'int64'})) != bar_key(teams)
+
+
+@pytest.mark.parametrize('argument, value', [('title', 'Goals'), ('x_label', 'Team'), ('legend', True), ('legend_loc', 'upper right')])
+def test_plot_arguments(teams, argument, value):
+    assert bar_key(teams, **{argument: value}) != bar_key(teams)
+
+
+def test_chart_arguments(teams):
+    assert render_key(Bar(x='team', y='goals', df=teams, category_column='band')) != bar_key(teams)
+    assert render_key(Bar(x='team', y='goals', df=teams, top_n=5)) != bar_key(teams)
+    assert render_key(Line(x='team', y='goals', df=teams)) != bar_key(teams)
+
+
+def test_theme(teams):
+    assert bar_key(teams, theme={'axes.facecolor': '#eeeeee'}) != bar_key(teams)
+    assert bar_key(teams, theme={'axes.facecolor': '#eeeeee'}) != bar_key(teams, theme={'axes.facecolor': '#dddddd'})
+    assert bar_key(teams, theme=None) != bar_key(teams)
+
+
+def test_palette(teams):
+    assert bar_key(teams, colour_palette='std_sequential_5') != bar_key(teams)
+    # A registered name and its colours draw the same chart
+    from speedy_charts.palettes import get_palette
+    assert bar_key(teams, colour_palette='std_sequential_5') == bar_key(teams, colour_palette=get_palette('std_sequential_5'))
+
+
+def test_output_settings(teams):
+    chart = Bar(x='team', y='goals', df=teams)
+    keys = {
+        render_key(chart),
+        render_key(chart, file_format='svg'),
+        render_key(chart, dpi=150),
+        render_key(chart, dpi=300),
+        render_key(chart, layout='fixed'),
+        render_key(chart, file_format='svg', rasterize_threshold=None),
+    }
+    assert len(keys) == 6
+
+
+def test_library_version(teams, monkeypatch):
+    from speedy_charts import cache
+    key = bar_key(teams)
+    monkeypatch.setattr(cache, 'CACHE_VERSION', cache.CACHE_VERSION + 1)
+    assert bar_key(teams) != key
+    monkeypatch.undo()
+
+    monkeypatch.setattr(cache, '_package_version', lambda: '99.0')
+    assert bar_key(teams) != key
+
+
+def test_lists_and_arrays():
+    assert render_key(Bar(['a', 'b'], [1, 2])) != render_key(Bar(['a', 'b'], [1, 3]))
+    assert render_key(Scatter(np.arange(5.0), np.arange(5.0))) != render_key(Scatter(np.arange(5.0), np.arange(5.0)[::-1]))
+
+
+def test_streaming_buffers_invalidate():
+    rng = np.random.default_rng(3)
+    chart = StreamingLine('t', ['a', 'b'], capacity=1000)
+    chart.extend(np.arange(500.0), [rng.random(500), rng.random(500)])
+
+    cache = RenderCache()
+    first = chart.render(cache=cache)
+    key = render_key(chart)
+    chart.extend(np.arange(500.0, 990.0), [rng.random(490), rng.random(490)])
+
+    assert render_key(chart) != key
+    second = chart.render(cache=cache)
+    assert cache.stats()['hits'] == 0
+    assert second != first and second == chart.render()
+    # Plot defaults are filled in for streaming charts as well
+    assert render_key(chart) == render_key(chart, {'title': '', 'downsample': None})
+    assert render_key(chart) != render_key(chart, {'colour_palette': 'std_sequential_5'})
+
+
+def test_hits_return_the_same_bytes(teams):
+    cache = RenderCache()
+    chart = Bar(x='team', y='goals', df=teams)
+    first = cache.render(chart, title='Goals')
+    assert cache.render(chart, title='Goals') == first
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    assert cache.render(chart, title='Assists') != first
+    assert cache.stats()['misses'] == 2
+
+
+def test_memory_lru_eviction():
+    cache = RenderCache(max_bytes=300)
+    for key in 'abc':
+        cache.put(key, key.encode() * 100)
+    cache.get('a')
+    cache.put('d', b'd' * 100)
+
+    assert 'b' not in cache and all(key in cache for key in 'acd')
+    assert cache.stats()['bytes'] == 300 and cache.stats()['evictions'] == 1
+
+    # Entries bigger than the whole budget aren't kept at all
+    cache.put('e', b'e' * 301)
+    assert 'e' not in cache and cache.stats()['entries'] == 3
+
+
+def test_disk_lru_eviction(tmp_path):
+    cache = RenderCache(directory=str(tmp_path), max_disk_bytes=300, memory=False)
+    for i, key in enumerate('abc'):
+        cache.put(key, key.encode() * 100)
+        os.utime(tmp_path / key, (1000 + i, 1000 + i))
+    # Reading a file marks it as the most recently used
+    assert cache.get('a') == b'a' * 100
+    cache.put('d', b'd' * 100)
+
+    assert sorted(os.listdir(tmp_path)) == ['a', 'c', 'd']
+    assert cache.stats()['disk_bytes'] == 300 and cache.stats()['evictions'] == 1
+    assert cache.stats()['entries'] == 0
+
+
+def test_disk_cache_shared_between_instances(tmp_path, teams):
+    chart = Bar(x='team', y='goals', df=teams)
+    data = RenderCache(directory=str(tmp_path)).render(chart)
+    other = RenderCache(directory=str(tmp_path))
+    assert other.render(chart) == data
+    assert other.stats()['disk_hits'] == 1
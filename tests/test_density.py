@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.collections import PathCollection
+from matplotlib.image import AxesImage
+
+from speedy_charts.charts import Scatter, new_figure
+from speedy_charts.density import bin_points, data_extent, density_image
+
+
+def plot(chart, **plot_kwargs):
+    ax = new_figure().add_subplot()
+    chart.plot(ax=ax, **plot_kwargs)
+    return ax
+
+
+def artist_types(ax):
+    return [type(artist) for artist in ax.get_children() if isinstance(artist, (AxesImage, PathCollection))]
+
+
+def test_switch_above_threshold(players):
+    chart = Scatter(x='minutes', y='influence', df=players, category_column='position')
+    assert artist_types(plot(chart, density_threshold=len(players) - 1)) == [AxesImage]
+    assert artist_types(plot(chart, density_threshold=len(players))) == [PathCollection]
+
+
+def test_cell_takes_majority_colour():
+    # Two clusters in opposite corners, each mostly one category
+    df = pd.DataFrame({
+        'x': [0.0] * 100 + [1.0] * 100,
+        'y': [0.0] * 100 + [1.0] * 100,
+        'kind': ['a'] * 90 + ['b'] * 10 + ['a'] * 5 + ['b'] * 95,
+    })
+    chart = Scatter(x='x', y='y', df=df, category_column='kind')
+    image = plot(chart, density=True).images[0].get_array()
+    colours = dict(zip(chart._plotted_categories, chart._plotted_colours))
+
+    np.testing.assert_allclose(image[0, 0, :3], colours['a'][:3])
+    np.testing.assert_allclose(image[-1, -1, :3], colours['b'][:3])
+    assert image[0, 0, 3] > 0 and image[-1, -1, 3] > 0
+    # Cells without points stay transparent
+    assert image[0, -1, 3] == 0
+
+
+def test_custom_range_codes():
+    ranges = [0, 10, 20, 30]
+    values = pd.Series([-1, 0, 9.99, 10, 19.5, 20, 29.9, 30, 31, np.nan])
+    chart = Scatter(x='x', y='y', category_column='v', category_list=['low', 'mid', 'high'], custom_ranges=ranges)
+
+    expected = pd.cut(values, ranges, right=False).cat.codes
+    np.testing.assert_array_equal(chart._category_codes(values, chart.category_list), expected)
+    # Values on the last edge and missing values belong to no range
+    assert expected.iloc[7] == -1 and expected.iloc[9] == -1
+
+
+def test_custom_ranges_image():
+    df = pd.DataFrame({'x': [0.0, 1.0, 2.0], 'y': [0.0, 1.0, 2.0], 'v': [5.0, 30.0, np.nan]})
+    chart = Scatter(x='x', y='y', df=df, category_column='v', category_list=['low', 'mid', 'high'], custom_ranges=[0, 10, 20, 30])
+    image = plot(chart, density=True).images[0].get_array()
+    # Only the point inside a range is drawn
+    assert (image[..., 3] > 0).sum() == 1 and image[0, 0, 3] > 0
+
+
+def test_update_rebins(players):
+    chart = Scatter(x='minutes', y='influence', df=players)
+    ax = plot(chart, density=True)
+    before = ax.images[0].get_array().copy()
+
+    moved = players.assign(minutes=players['minutes'] * 2 + 100, influence=players['influence'][::-1].to_numpy())
+    chart.update(moved)
+    assert len(ax.images) == 1
+
+    image = ax.images[0].get_array()
+    x, y = moved['minutes'].to_numpy(), moved['influence'].to_numpy()
+    extent = data_extent(x, y)
+    expected = density_image(bin_points(x, y, extent, (image.shape[1], image.shape[0])), [(0.0, 0.0, 0.0, 1.0)])
+    assert ax.images[0].get_extent() == pytest.approx(list(extent))
+    np.testing.assert_array_equal(image[..., 3], expected[..., 3])
+    assert not np.array_equal(image, before)
+    chart.close()
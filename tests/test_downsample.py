@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from speedy_charts.downsample import downsample_series, lttb_downsample, minmax_downsample, minmax_indices
+
+
+@pytest.fixture
+def spiky():
+    # Noise with one spike up and one down well away from the ends
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=100_000)
+    y[12_345] = 50.0
+    y[80_000] = -50.0
+    return np.arange(len(y), dtype=float), y
+
+
+@pytest.mark.parametrize('downsample', [minmax_downsample, lttb_downsample])
+def test_global_extremes_kept(spiky, downsample):
+    x, y = spiky
+    xs, ys = downsample(x, y, 500)
+    assert len(ys) < len(y) // 50
+    assert ys.max() == 50.0 and ys.min() == -50.0
+    assert 12_345.0 in xs and 80_000.0 in xs
+
+
+@pytest.mark.parametrize('downsample', [minmax_downsample, lttb_downsample])
+def test_end_points_kept(spiky, downsample):
+    x, y = spiky
+    xs, ys = downsample(x, y, 500)
+    assert xs[0] == x[0] and xs[-1] == x[-1]
+    assert ys[0] == y[0] and ys[-1] == y[-1]
+    assert np.all(np.diff(xs) > 0)
+
+
+def test_minmax_keeps_every_bucket_extreme(spiky):
+    _, y = spiky
+    index = minmax_indices(y, 100)
+    size = -(-len(y) // 100)
+    for start in range(0, len(y), size):
+        bucket = y[start:start + size]
+        assert start + bucket.argmin() in index and start + bucket.argmax() in index
+
+
+@pytest.mark.parametrize('downsample', [minmax_downsample, lttb_downsample])
+def test_missing_values_dont_hide_extremes(spiky, downsample):
+    x, y = spiky
+    y = y.copy()
+    y[1::7] = np.nan
+    xs, ys = downsample(x, y, 500)
+    assert np.nanmax(ys) == 50.0 and np.nanmin(ys) == -50.0
+    assert np.isnan(ys).sum() <= 2
+
+
+@pytest.mark.parametrize('downsample', [minmax_downsample, lttb_downsample])
+def test_datetime_x(spiky, downsample):
+    _, y = spiky
+    x = np.datetime64('2024-01-01T00:00') + np.arange(len(y)).astype('timedelta64[m]')
+    xs, ys = downsample(x, y, 500)
+    assert xs.dtype == x.dtype
+    assert xs[0] == x[0] and xs[-1] == x[-1]
+    assert ys.max() == 50.0 and ys.min() == -50.0
+    assert xs[ys.argmax()] == x[12_345]
+
+
+@pytest.mark.parametrize('method', ['minmax', 'lttb'])
+def test_short_series_passed_through(method):
+    x = np.arange(100, dtype=float)
+    y = np.sin(x)
+    xs, ys = downsample_series(x, y, 100, method)
+    assert np.array_equal(xs, x) and np.array_equal(ys, y)
+    xs, ys = downsample_series(x, y, 1000, method)
+    assert np.array_equal(xs, x) and np.array_equal(ys, y)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError, match='Unknown downsample method'):
+        downsample_series([1, 2, 3], [1, 2, 3], 2, 'mean')
@@ -0,0 +1,71 @@
+import io
+import pathlib
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from speedy_charts.charts import Bar, Scatter
+from speedy_charts.export import RASTERIZE_THRESHOLD, output_format
+
+MAGIC = {'png': b'\x89PNG', 'svg': b'<?xml', 'pdf': b'%PDF'}
+
+
+@pytest.mark.parametrize('file_format, to, expected', [
+    (None, None, 'png'),
+    (None, 'chart.SVG', 'svg'),
+    (None, pathlib.Path('out') / 'chart.pdf', 'pdf'),
+    (None, 'chart', 'png'),
+    (None, io.BytesIO(), 'png'),
+    ('PDF', 'chart.png', 'pdf'),
+])
+def test_output_format(file_format, to, expected):
+    assert output_format(file_format, to) == expected
+
+
+@pytest.mark.parametrize('extension', ['png', 'svg', 'pdf'])
+def test_format_from_extension(teams, tmp_path, extension):
+    path = tmp_path / f'chart.{extension}'
+    assert Bar(x='team', y='goals', df=teams).render(to=path) == path
+    assert path.read_bytes().startswith(MAGIC[extension])
+
+    # A string path works the same way
+    Bar(x='team', y='goals', df=teams).render(to=str(path))
+    assert path.read_bytes().startswith(MAGIC[extension])
+
+
+def test_caller_buffer(teams):
+    buffer = io.BytesIO()
+    buffer.write(b'header')
+    assert Bar(x='team', y='goals', df=teams).render(to=buffer) is buffer
+    # Written from the buffer's position, the caller's own bytes are left alone
+    assert buffer.getvalue() == b'header' + Bar(x='team', y='goals', df=teams).render()
+
+
+@pytest.mark.parametrize('file_format', ['png', 'svg', 'pdf'])
+def test_bytes_without_target(teams, file_format):
+    data = Bar(x='team', y='goals', df=teams).render(format=file_format)
+    assert isinstance(data, bytes) and data.startswith(MAGIC[file_format])
+
+
+def test_dense_scatter_svg():
+    rng = np.random.default_rng(3)
+    n_points = 4 * RASTERIZE_THRESHOLD
+    chart = Scatter(x='x', y='y', df=pd.DataFrame({'x': rng.random(n_points), 'y': rng.random(n_points)}))
+
+    rasterized = chart.render(format='svg')
+    assert b'<image' in rasterized and len(rasterized) < 400_000
+
+    # Without the threshold every point is written out as its own element
+    vector = chart.render(format='svg', rasterize_threshold=None)
+    assert b'<image' not in vector and len(vector) > 5 * len(rasterized)
+
+
+def test_render_leaves_no_figures_or_output(chart_specs, capsys):
+    plt.close('all')
+    for chart_class, kwargs in chart_specs:
+        for file_format in ('png', 'svg'):
+            chart_class(**kwargs).render(format=file_format)
+    assert plt.get_fignums() == []
+    assert capsys.readouterr().out == ''
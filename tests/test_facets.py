@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from speedy_charts.charts import Bar, Line, Scatter, new_figure
+from speedy_charts.facets import Facets, _legend_entries
+
+
+@pytest.fixture
+def panels():
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({
+        'player': np.repeat(['p1', 'p2', 'p3'], 50),
+        'minute': np.tile(np.arange(50, dtype=float), 3),
+        'influence': rng.random(150),
+        'position': rng.choice(['GK', 'DEF', 'MID'], 150),
+    })
+
+
+def test_one_panel_per_value(panels):
+    facets = Facets(Scatter, x='minute', y='influence', df=panels, facet_column='player', category_column='position')
+    assert facets.facets == ['p1', 'p2', 'p3']
+    assert [len(chart.df) for chart in facets.charts] == [50, 50, 50]
+    fig = facets.plot()
+    assert sum(ax.get_visible() for ax in fig.axes) == 3
+    # One shared legend listing each category once
+    assert len(fig.legends) == 1 and sorted(text.get_text() for text in fig.legends[0].get_texts()) == ['DEF', 'GK', 'MID']
+    facets.close()
+
+
+def test_shared_limits(panels):
+    with Facets(Line, x='minute', y='influence', df=panels, facet_column='player') as facets:
+        axes = [ax for ax in facets.plot().axes if ax.get_visible()]
+        assert len({ax.get_ylim() for ax in axes}) == 1
+
+
+def test_facet_order(panels):
+    assert Facets(Line, x='minute', y='influence', df=panels, facet_column='player', facet_order=['p3', 'p1']).facets == ['p3', 'p1']
+    with pytest.raises(ValueError, match='has no value'):
+        Facets(Line, x='minute', y='influence', df=panels, facet_column='player', facet_order=['p4'])
+
+
+def test_empty_panel_legend():
+    fig = new_figure()
+    ax = fig.add_subplot()
+    ax.legend(handles=[])
+    assert _legend_entries(ax) == ([], [])
+    assert ax.get_legend() is None
+
+
+@pytest.mark.parametrize('layout', ['constrained', 'fixed'])
+def test_render(panels, layout):
+    assert Facets(Bar, x='minute', y='influence', df=panels, facet_column='player').render(layout=layout)[:4] == b'\x89PNG'
+
+
+def test_colours_worked_out_once(panels, monkeypatch):
+    calls = []
+    category_codes = Scatter._category_codes
+    monkeypatch.setattr(Scatter, '_category_codes', lambda self, *args: calls.append(self) or category_codes(self, *args))
+
+    with Facets(Scatter, x='minute', y='influence', df=panels, facet_column='player', category_column='position') as facets:
+        fig = facets.plot()
+        assert len(calls) == 1
+        # Each panel still gets the colours of its own rows
+        colours = dict(zip(facets.charts[0]._plotted_categories, map(tuple, facets.charts[0]._plotted_colours)))
+        for chart, ax in zip(facets.charts, fig.axes):
+            expected = [colours[position] for position in chart.df['position']]
+            assert [tuple(colour) for colour in ax.collections[0].get_facecolors()] == expected
+
+
+def test_aggregated_bar_panels(panels):
+    rows = panels.assign(minute=panels['minute'] % 5)
+    with Facets(Bar, x='minute', y='influence', df=rows, facet_column='player', category_column='position', agg='sum') as facets:
+        fig = facets.plot()
+        assert [len(ax.patches) for ax in fig.axes[:3]] == [5, 5, 5]
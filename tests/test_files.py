@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from speedy_charts.bars import aggregate_bars
+from speedy_charts.charts import Bar, Line, Scatter
+from speedy_charts.density import bin_points, data_extent
+from speedy_charts.files import read_chunks
+
+CHUNK_SIZE = 64
+
+
+@pytest.fixture
+def sales():
+    rng = np.random.default_rng(6)
+    n_rows = 1000
+    return pd.DataFrame({
+        'region': rng.choice(['north', 'south', 'east', 'west'], n_rows),
+        'units': rng.integers(0, 10, n_rows),
+        'amount': rng.random(n_rows) * 100,
+        'price': rng.normal(50, 10, n_rows),
+        'volume': rng.normal(0, 1, n_rows),
+        # Written as text, the way dates end up in a CSV file
+        'date': pd.date_range('2024-01-01', periods=n_rows, freq='h').strftime('%Y-%m-%d %H:%M:%S'),
+    })
+
+
+@pytest.fixture(params=['csv', 'parquet'])
+def sales_file(request, sales, tmp_path):
+    if request.param == 'parquet':
+        pytest.importorskip('pyarrow')
+        path = tmp_path / 'sales.parquet'
+        sales.to_parquet(path, row_group_size=CHUNK_SIZE)
+    else:
+        path = tmp_path / 'sales.csv'
+        sales.to_csv(path, index=False)
+    return path
+
+
+def contents(path):
+    # The whole file read in one go, CSV floats don't always parse back to the exact values written
+    return pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_csv(path)
+
+
+FILTERS = [('units', '>=', 3), ('region', 'in', ['north', 'east', 'west']), ('amount', '!=', 0)]
+
+
+def filtered(df):
+    return df[(df['units'] >= 3) & df['region'].isin(['north', 'east', 'west']) & (df['amount'] != 0)]
+
+
+def test_filtered_chunks(sales_file):
+    chunks = list(read_chunks(sales_file, ['region', 'amount'], FILTERS, CHUNK_SIZE))
+    assert all(len(chunk) <= CHUNK_SIZE for chunk in chunks)
+    # Only the requested columns come back, the filter columns are dropped
+    assert all(list(chunk.columns) == ['region', 'amount'] for chunk in chunks)
+
+    expected = filtered(contents(sales_file))[['region', 'amount']].reset_index(drop=True)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('agg, top_n', [('sum', None), ('mean', None), ('count', 2), ('max', 2)])
+def test_bar_filters_match_in_memory(sales_file, agg, top_n):
+    chart = Bar.from_file(sales_file, x='region', y='amount', agg=agg, top_n=top_n, filters=FILTERS, chunk_size=CHUNK_SIZE)
+    expected = aggregate_bars(filtered(contents(sales_file)), 'region', 'amount', agg=agg, top_n=top_n)
+    pd.testing.assert_frame_equal(chart.df, expected, check_dtype=False)
+
+
+def test_bar_text_category(sales_file):
+    chart = Bar.from_file(sales_file, x='units', y='amount', category_column='region', chunk_size=CHUNK_SIZE)
+    expected = aggregate_bars(contents(sales_file), 'units', 'amount', category_column='region')
+    pd.testing.assert_frame_equal(chart.df.sort_values('units').reset_index(drop=True), expected.sort_values('units').reset_index(drop=True), check_dtype=False)
+
+
+def test_line_keeps_extremes(sales_file):
+    sales = contents(sales_file)
+    chart = Line.from_file(sales_file, x='date', y=['amount', 'price'], buckets=20, chunk_size=CHUNK_SIZE)
+    assert len(chart.df) < len(sales)
+    # Text dates are parsed, so the line gets a date axis rather than a category per row
+    assert chart.df['date'].dtype.kind == 'M'
+    assert chart.df['date'].is_monotonic_increasing
+
+    for column in ('amount', 'price'):
+        assert chart.df[column].max() == sales[column].max()
+        assert chart.df[column].min() == sales[column].min()
+    # Every row kept is a real row of the file
+    original = sales.assign(date=pd.to_datetime(sales['date'])).set_index('date')
+    pd.testing.assert_frame_equal(chart.df.set_index('date'), original.loc[chart.df['date'], ['amount', 'price']], check_freq=False, check_names=False)
+
+
+def test_scatter_counts_match_bin_points(sales_file):
+    bins = (40, 30)
+    chart = Scatter.from_file(sales_file, x='price', y='volume', bins=bins, chunk_size=CHUNK_SIZE)
+    counts, extent, categories = chart._binned
+    sales = contents(sales_file)
+
+    x, y = sales['price'].to_numpy(), sales['volume'].to_numpy()
+    assert extent == data_extent(x, y)
+    assert categories is None
+    np.testing.assert_array_equal(counts, bin_points(x, y, extent, bins))
+
+
+def test_scatter_category_counts(sales_file):
+    bins = (40, 30)
+    chart = Scatter.from_file(sales_file, x='price', y='volume', category_column='region', filters=FILTERS, bins=bins, chunk_size=CHUNK_SIZE)
+    counts, extent, categories = chart._binned
+
+    rows = filtered(contents(sales_file))
+    x, y = rows['price'].to_numpy(), rows['volume'].to_numpy()
+    assert categories == list(pd.unique(rows['region']))
+    codes = pd.Categorical(rows['region'], categories=categories).codes
+    expected = bin_points(x, y, data_extent(x, y), bins, codes=lambda start, stop: codes[start:stop], n_layers=len(categories))
+    np.testing.assert_array_equal(counts, expected)
+    assert counts.sum() == len(rows)
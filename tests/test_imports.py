@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+# Seconds importing speedy_charts.charts may take in a fresh interpreter, well above the ~0.1s it takes
+IMPORT_BUDGET = 0.5
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+def run_import(module):
+    code = (
+        'import json, sys, time\n'
+        'start = time.perf_counter()\n'
+        f'import {module}\n'
+        'elapsed = time.perf_counter() - start\n'
+        "print(json.dumps({'elapsed': elapsed, 'loaded': [name for name in ('matplotlib', 'numpy', 'pandas') if name in sys.modules]}))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=SRC)
+    env.pop('MPLBACKEND', None)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_charts_import_leaves_heavy_modules_unloaded():
+    assert run_import('speedy_charts.charts')['loaded'] == []
+
+
+def test_charts_import_within_budget():
+    # The first run may still be writing bytecode, so the fastest of a few runs is compared
+    elapsed = min(run_import('speedy_charts.charts')['elapsed'] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET
+
+
+def test_package_modules_import_lazily():
+    for module in ('speedy_charts.palettes', 'speedy_charts.themes', 'speedy_charts.facets', 'speedy_charts.batch', 'speedy_charts.cache'):
+        assert run_import(module)['loaded'] == [], module
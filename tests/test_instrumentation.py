@@ -0,0 +1,95 @@
+import logging
+import threading
+
+import pytest
+
+from speedy_charts.charts import Bar, Line
+from speedy_charts.instrumentation import _NULL_SPAN, Collector, Span, add_callback, remove_callback, span
+
+
+def test_collector_spans(teams):
+    with Collector() as collector:
+        Bar(x='team', y='goals', df=teams, category_column='band').render()
+
+    assert [phase.name for phase in collector.spans] == ['prepare', 'colours', 'artists', 'layout', 'savefig']
+    for phase in collector.spans:
+        assert phase.duration >= 0 and phase.error is None
+        if phase.name != 'layout':
+            assert phase.chart == 'Bar' and phase.rows == len(teams)
+    assert collector.spans[2].artists == len(teams)
+
+    totals = collector.totals()
+    assert totals['artists'] == {'count': 1, 'seconds': collector.spans[2].duration, 'rows': len(teams), 'artists': len(teams)}
+
+
+def test_collectors_per_thread(teams, gameweeks):
+    # Both threads draw at the same time, each collector only sees its own chart
+    barrier = threading.Barrier(2)
+    collected = {}
+
+    def draw(name, chart):
+        with Collector() as collector:
+            barrier.wait()
+            for _ in range(3):
+                chart.render()
+        collected[name] = collector
+
+    threads = [
+        threading.Thread(target=draw, args=('bar', Bar(x='team', y='goals', df=teams))),
+        threading.Thread(target=draw, args=('line', Line(x='gw', y='goals', df=gameweeks))),
+    ]
+    with Collector() as outer:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert outer.spans == []
+    assert {phase.chart for phase in collected['bar'].spans} == {'Bar', None}
+    assert {phase.chart for phase in collected['line'].spans} == {'Line', None}
+    assert collected['bar'].totals()['savefig']['count'] == collected['line'].totals()['savefig']['count'] == 3
+
+
+def test_failing_callback(teams, caplog):
+    def broken(phase):
+        raise RuntimeError('metrics backend is down')
+
+    seen = []
+    add_callback(broken)
+    add_callback(seen.append)
+    try:
+        with caplog.at_level(logging.ERROR, logger='speedy_charts.instrumentation'):
+            data = Bar(x='team', y='goals', df=teams).render()
+    finally:
+        remove_callback(broken)
+        remove_callback(seen.append)
+
+    assert data == Bar(x='team', y='goals', df=teams).render()
+    # Later callbacks still get every span
+    assert [phase.name for phase in seen] == ['prepare', 'artists', 'layout', 'savefig']
+    assert len(caplog.records) == len(seen)
+    assert all('metrics backend is down' in record.exc_text for record in caplog.records)
+
+
+def test_null_span_without_listeners():
+    assert span('plot') is _NULL_SPAN
+    with span('plot') as phase:
+        phase.record(rows=1, artists=1)
+
+    with Collector():
+        assert isinstance(span('plot'), Span)
+
+    callback = add_callback(lambda phase: None)
+    try:
+        assert isinstance(span('plot'), Span)
+    finally:
+        remove_callback(callback)
+    assert span('plot') is _NULL_SPAN
+
+
+def test_error_recorded():
+    with Collector() as collector:
+        with pytest.raises(KeyError):
+            with span('prepare', 'Bar', 10):
+                raise KeyError('goals')
+    assert collector.spans[0].error == 'KeyError' and collector.spans[0].duration >= 0
@@ -0,0 +1,130 @@
+import os
+
+import numpy as np
+import pytest
+from matplotlib.testing.compare import compare_images
+
+from speedy_charts.charts import Scatter, new_figure
+from speedy_charts.facets import Facets
+from speedy_charts.layout import _outside_legend, text_extent
+from speedy_charts.themes import DEFAULT_THEME
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline', 'layout')
+
+# RMS difference allowed against a reference image, enough for antialiasing differences between freetype builds
+TOLERANCE = 2.0
+
+# Small images keep the references light
+DPI = 72
+
+# The standard theme asks for Arial and falls back to whatever is installed, DejaVu Sans ships with matplotlib so the references look the same everywhere
+THEME = [DEFAULT_THEME, {'font.family': ['DejaVu Sans']}]
+
+# Pixels the fixed layout may place axes edges and figure legends away from where constrained layout puts them
+POSITION_TOLERANCE = 8
+
+
+def check_image(data, name, tmp_path):
+    # Compares with tests/baseline/layout/<name>.png, set SPEEDY_CHARTS_UPDATE_BASELINES=1 to write the references again
+    expected = os.path.join(BASELINES, f'{name}.png')
+    if os.environ.get('SPEEDY_CHARTS_UPDATE_BASELINES'):
+        os.makedirs(BASELINES, exist_ok=True)
+        with open(expected, 'wb') as f:
+            f.write(data)
+    actual = tmp_path / f'{name}.png'
+    actual.write_bytes(data)
+    result = compare_images(expected, str(actual), tol=TOLERANCE, in_decorator=True)
+    assert result is None, f"{name} differs from its reference image: rms {result['rms']:.2f}, see {result.get('diff')}"
+
+
+@pytest.fixture
+def layout_cases(chart_specs, players):
+    cases = [(f'{chart.__name__.lower()}_{i}', lambda chart=chart, kwargs=kwargs: chart(**kwargs), {}) for i, (chart, kwargs) in enumerate(chart_specs)]
+    cases.append(('scatter_legend_right', lambda: Scatter(x='minutes', y='influence', df=players, category_column='position'), {'legend_loc': 'center left'}))
+    facets = players.assign(group=np.arange(len(players)) % 6)
+    cases.append(('facets_6', lambda: Facets(Scatter, x='minutes', y='influence', df=facets, facet_column='group', category_column='position'), {}))
+    return cases
+
+
+def draw(make_chart, plot_kwargs, layout):
+    chart = make_chart()
+    if isinstance(chart, Facets):
+        fig = chart.plot(layout=layout, theme=THEME, x_label='Label', title='Title', **plot_kwargs)
+    else:
+        fig = new_figure(theme=THEME, layout=layout)
+        chart.plot(fig=fig, theme=THEME, x_label='Label', title='Title', **plot_kwargs)
+    fig.canvas.draw()
+    return fig
+
+
+@pytest.mark.parametrize('layout', ['constrained', 'fixed'])
+def test_layout_matches_reference(layout_cases, layout, tmp_path):
+    for name, make_chart, plot_kwargs in layout_cases:
+        check_image(make_chart().render(layout=layout, dpi=DPI, theme=THEME, x_label='Label', title='Title', **plot_kwargs), f'{name}_{layout}', tmp_path)
+
+
+def gap(ax_box, legend_box, side):
+    return {'bottom': ax_box.y0 - legend_box.y1, 'right': legend_box.x0 - ax_box.x1}[side]
+
+
+def test_fixed_layout_close_to_constrained(layout_cases):
+    for name, make_chart, plot_kwargs in layout_cases:
+        constrained, fixed = draw(make_chart, plot_kwargs, 'constrained'), draw(make_chart, plot_kwargs, 'fixed')
+        renderer = constrained.canvas.get_renderer()
+
+        for before, after in zip(constrained.axes, fixed.axes):
+            if not before.get_visible():
+                continue
+            legend = before.get_legend()
+            side = _outside_legend(before, legend) if legend is not None else None
+
+            # Axes edges stay put, apart from the side of an outside legend, where the fixed layout hands the axes the gap
+            # constrained layout leaves between the legend and the tick labels
+            edges = {'left': before.bbox.x0 - after.bbox.x0, 'bottom': before.bbox.y0 - after.bbox.y0, 'right': after.bbox.x1 - before.bbox.x1, 'top': after.bbox.y1 - before.bbox.y1}
+            for edge, grown in edges.items():
+                if edge == side:
+                    assert grown > -POSITION_TOLERANCE, f'{name}: the axes shrank {-grown:.1f}px towards its legend'
+                elif edge == 'top' and side == 'right':
+                    # A legend on the right leaves the top margin to the title alone
+                    assert -POSITION_TOLERANCE < grown, f'{name}: the top of the axes moved {grown:.1f}px'
+                else:
+                    assert abs(grown) < POSITION_TOLERANCE, f'{name}: the {edge} of the axes moved {grown:.1f}px'
+
+            if side is not None:
+                # Outside legends keep their size and end up no further from the axes than before
+                box, moved = legend.get_window_extent(renderer), after.get_legend().get_window_extent(fixed.canvas.get_renderer())
+                assert moved.width == pytest.approx(box.width) and moved.height == pytest.approx(box.height)
+                assert gap(after.bbox, moved, side) <= gap(before.bbox, box, side) + 1, f'{name}: the legend moved away from the axes'
+
+        for before, after in zip(constrained.legends, fixed.legends):
+            assert np.abs(before.get_window_extent(renderer).get_points() - after.get_window_extent(fixed.canvas.get_renderer()).get_points()).max() < POSITION_TOLERANCE
+
+
+def test_fixed_layout_keeps_everything_inside(layout_cases):
+    for name, make_chart, plot_kwargs in layout_cases:
+        fig = draw(make_chart, plot_kwargs, 'fixed')
+        renderer = fig.canvas.get_renderer()
+
+        boxes = [ax.get_tightbbox(renderer) for ax in fig.axes if ax.get_visible()]
+        boxes += [artist.get_window_extent(renderer) for artist in fig.legends + [text for text in fig.texts if text.get_text()]]
+        for box in boxes:
+            assert fig.bbox.x0 - 1 <= box.x0 and box.x1 <= fig.bbox.x1 + 1 and fig.bbox.y0 - 1 <= box.y0 and box.y1 <= fig.bbox.y1 + 1, f'{name} draws outside the figure'
+
+        # A legend placed outside the axes must not cover the tick labels or axis labels
+        for ax in fig.axes:
+            legend = ax.get_legend()
+            if not ax.get_visible() or legend is None or ax.bbox.overlaps(legend.get_window_extent(renderer)):
+                continue
+            for axis in (ax.xaxis, ax.yaxis):
+                decorations = axis.get_tightbbox(renderer)
+                assert decorations is None or not legend.get_window_extent(renderer).overlaps(decorations), f'{name} legend overlaps the {axis.axis_name}-axis labels'
+
+
+def test_text_extent_rotation():
+    from matplotlib.font_manager import FontProperties
+    prop = FontProperties(size=10)
+    width, height = text_extent('team_name', prop)
+    assert width > height > 0
+    rotated = text_extent('team_name', prop, rotation=90)
+    assert rotated == pytest.approx((height, width))
+    assert text_extent('', prop) == (0.0, 0.0)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from speedy_charts.cache import render_key
+from speedy_charts.charts import Bar
+from speedy_charts.palettes import get_palette, palette_colormap, palette_kind, palette_rgba, register_palette
+
+
+def test_registered_palettes():
+    assert palette_kind('std_sequential_5') == 'sequential'
+    assert palette_kind('af_categorical') == 'categorical'
+    assert get_palette('std_diverging_5')[0] == '#003479'
+    with pytest.raises(ValueError, match='Unknown palette'):
+        get_palette('no_such_palette')
+    with pytest.raises(ValueError, match='Unknown palette kind'):
+        register_palette('bad', ['#000000'], 'qualitative')
+
+
+def test_stretching():
+    sequential = palette_rgba('std_sequential_5', 9)
+    assert sequential.shape == (9, 4) and not sequential.flags.writeable
+    assert len({tuple(row) for row in sequential}) == 9
+
+    categorical = palette_rgba('af_categorical', 10)
+    assert np.array_equal(categorical[7:], np.repeat(categorical[6:7], 3, axis=0))
+
+
+def test_registering_seen_colours_changes_their_kind(teams):
+    colours = ['#010101', '#fefefe']
+    chart = Bar(x='team', y='goals', df=teams)
+    before = render_key(chart, {'colour_palette': colours})
+
+    assert tuple(palette_rgba(colours, 3)[1]) == tuple(palette_rgba(colours, 3)[2])
+    palette_colormap(colours, 3)
+
+    register_palette('test_near_black_white', colours, 'sequential')
+    grey = palette_rgba('test_near_black_white', 3)[1]
+    assert 0.45 < grey[0] < 0.55
+    assert np.array_equal(palette_rgba(colours, 3), palette_rgba('test_near_black_white', 3))
+    assert np.array_equal(palette_colormap(colours, 3).colors, palette_rgba(colours, 3))
+    assert render_key(chart, {'colour_palette': colours}) != before
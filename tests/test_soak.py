@@ -0,0 +1,73 @@
+import gc
+import resource
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from speedy_charts.charts import Bar, Line, Scatter
+from speedy_charts.figures import FigurePool
+
+# Enough charts for a figure or its artists kept per chart to add up to well over the limit
+CHARTS = 400
+WARMUP = 150
+LIMIT_MB = 15.0
+
+
+def rss_mb():
+    # Current resident memory on Linux, the peak elsewhere
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+@pytest.fixture
+def soak_charts():
+    rng = np.random.default_rng(42)
+    teams = pd.DataFrame({'team': [f'team_{i}' for i in range(20)], 'goals': rng.integers(0, 100, 20)})
+    series = pd.DataFrame({'x': np.arange(2000, dtype=float), 'a': rng.normal(size=2000).cumsum(), 'b': rng.normal(size=2000).cumsum()})
+    points = pd.DataFrame({'x': rng.random(2000), 'y': rng.random(2000), 'position': rng.choice(['GK', 'DEF', 'MID', 'FWD'], 2000)})
+    return (
+        lambda: Bar(x='team', y='goals', df=teams),
+        lambda: Line(x='x', y=['a', 'b'], df=series),
+        lambda: Scatter(x='x', y='y', df=points, category_column='position'),
+    )
+
+
+def plot_and_close(chart, i, pool):
+    with chart as chart:
+        chart.plot(title=f'Chart {i}')
+        chart.figure.canvas.draw()
+
+
+def render(chart, i, pool):
+    chart.render(title=f'Chart {i}')
+
+
+def pooled_render(chart, i, pool):
+    chart.render(pool=pool, title=f'Chart {i}')
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('draw', [plot_and_close, render, pooled_render])
+def test_memory_stays_flat(soak_charts, draw):
+    plt.close('all')
+    pool = FigurePool()
+    baseline = None
+    for i in range(CHARTS):
+        draw(soak_charts[i % len(soak_charts)](), i, pool)
+        if i + 1 == WARMUP:
+            gc.collect()
+            baseline = rss_mb()
+
+    gc.collect()
+    growth = rss_mb() - baseline
+    assert plt.get_fignums() == []
+    assert growth < LIMIT_MB, f'grew {growth:.1f}MB over {CHARTS - WARMUP} charts'
+    if draw is pooled_render:
+        assert pool.stats()['created'] == 1 and pool.stats()['spare'] == 1
@@ -0,0 +1,100 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from speedy_charts.charts import StreamingLine
+from speedy_charts.streaming import RingBuffer
+
+
+@pytest.mark.parametrize('capacity', [1, 2, 7, 64])
+def test_ring_buffer_matches_deque(capacity):
+    rng = np.random.default_rng(capacity)
+    buffer = RingBuffer(capacity)
+    expected = deque(maxlen=capacity)
+    counter = 0
+
+    for _ in range(500):
+        operation = rng.integers(4)
+        if operation == 0:
+            buffer.append(counter)
+            expected.append(counter)
+            counter += 1
+        elif operation == 1:
+            # Sometimes longer than the buffer, so only the tail is kept
+            values = np.arange(counter, counter + rng.integers(0, 2 * capacity + 2))
+            buffer.extend(values)
+            expected.extend(values)
+            counter += len(values)
+        elif operation == 2:
+            count = rng.integers(0, capacity + 2)
+            buffer.drop(count)
+            for _ in range(min(count, len(expected))):
+                expected.popleft()
+        else:
+            buffer.clear()
+            expected.clear()
+
+        assert len(buffer) == len(expected)
+        np.testing.assert_array_equal(buffer.values(), np.array(expected, dtype=float))
+
+
+def test_ring_buffer_capacity():
+    with pytest.raises(ValueError, match='at least 1'):
+        RingBuffer(0)
+
+
+def test_numeric_window():
+    chart = StreamingLine(x='t', y='value', window=10)
+    for t in range(30):
+        chart.append(float(t), t * 2.0)
+        frame = chart.to_frame()
+        # Points at most `window` behind the newest one are kept
+        assert frame['t'].tolist() == [float(step) for step in range(max(t - 10, 0), t + 1)]
+    assert frame['value'].tolist() == [t * 2.0 for t in range(19, 30)]
+
+
+def test_datetime_window():
+    times = pd.date_range('2024-01-01', periods=120, freq='s')
+    chart = StreamingLine(x='time', y='value', window='30s')
+    chart.extend(times[:60], np.arange(60.0))
+    chart.extend(times[60:].astype(str).tolist(), np.arange(60.0, 120.0))
+
+    frame = chart.to_frame()
+    assert frame['time'].dtype.kind == 'M'
+    assert frame['time'].iloc[0] == times[-1] - pd.Timedelta('30s')
+    assert frame['time'].tolist() == times[89:].tolist()
+    assert frame['value'].tolist() == list(np.arange(89.0, 120.0))
+
+
+def test_capacity_without_window():
+    chart = StreamingLine(x='t', y=['a', 'b'], capacity=5)
+    chart.extend(np.arange(12.0), [np.arange(12.0), -np.arange(12.0)])
+    assert chart.to_frame()['t'].tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert chart.to_frame()['b'].tolist() == [-7.0, -8.0, -9.0, -10.0, -11.0]
+
+
+def test_extend_frame_and_arrays():
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({'t': np.arange(50.0), 'a': rng.random(50), 'b': rng.random(50), 'unused': 1})
+    from_frame = StreamingLine(x='t', y=['a', 'b'], capacity=40)
+    from_arrays = StreamingLine(x='t', y=['a', 'b'], capacity=40)
+
+    for start in range(0, 50, 15):
+        rows = df.iloc[start:start + 15]
+        from_frame.extend(rows)
+        from_arrays.extend(rows['t'].to_numpy(), {'a': rows['a'].to_numpy(), 'b': rows['b'].to_numpy()})
+
+    pd.testing.assert_frame_equal(from_frame.to_frame(), from_arrays.to_frame())
+    pd.testing.assert_frame_equal(from_frame.to_frame(), df[['t', 'a', 'b']].iloc[10:].reset_index(drop=True))
+
+    # Series left out of the dict are filled with NaN
+    from_arrays.extend([50.0], {'a': [1.0]})
+    assert np.isnan(from_arrays.to_frame()['b'].iloc[-1])
+
+
+def test_series_count_mismatch():
+    chart = StreamingLine(x='t', y=['a', 'b'])
+    with pytest.raises(ValueError, match='Expected values for 2 series'):
+        chart.extend([1.0, 2.0], [[1.0, 2.0]])
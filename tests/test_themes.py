@@ -0,0 +1,128 @@
+import io
+
+import matplotlib as mpl
+import pytest
+from matplotlib.colors import to_rgba
+from PIL import Image
+
+from speedy_charts import themes
+from speedy_charts.charts import Bar
+from speedy_charts.themes import DEFAULT_THEME, clear_theme_cache, compile_theme, register_theme, theme_context
+
+
+def stored(keys):
+    # Values rcParams actually holds, without looking through an active theme
+    return {key: dict.__getitem__(mpl.rcParams, key) for key in keys}
+
+
+@pytest.fixture
+def registered():
+    names = []
+
+    def register(name, theme):
+        names.append(name)
+        register_theme(name, theme)
+
+    yield register
+    for name in names:
+        themes._registry.pop(name, None)
+    clear_theme_cache()
+
+
+def test_register_theme(registered, teams):
+    registered('test_dark', ['dark_background', {'font.size': 9}])
+    rc = compile_theme('test_dark')
+    assert rc['font.size'] == 9 and rc['axes.facecolor'] == 'black'
+
+    chart = Bar(x='team', y='goals', df=teams)
+    assert chart.plot(theme='test_dark').get_facecolor() == to_rgba('black')
+    chart.close()
+
+    # A registered theme can be built on top of another one
+    registered('test_darker', ['test_dark', {'font.size': 7}])
+    assert compile_theme('test_darker')['font.size'] == 7 and compile_theme('test_darker')['axes.facecolor'] == 'black'
+
+
+def test_register_replaces_cached_theme(registered):
+    registered('test_size', {'font.size': 9})
+    assert compile_theme('test_size')['font.size'] == 9
+    registered('test_size', {'font.size': 11})
+    assert compile_theme('test_size')['font.size'] == 11
+
+
+def test_clear_theme_cache(tmp_path):
+    path = tmp_path / 'theme.mplstyle'
+    path.write_text('font.size: 9\n')
+    assert compile_theme(str(path))['font.size'] == 9
+
+    # The file is only read again once the cache is cleared
+    path.write_text('font.size: 13\n')
+    assert compile_theme(str(path))['font.size'] == 9
+    clear_theme_cache()
+    assert compile_theme(str(path))['font.size'] == 13
+    clear_theme_cache()
+
+
+def test_unknown_theme():
+    with pytest.raises(ValueError, match='is not a registered theme'):
+        compile_theme('no_such_theme')
+
+
+@pytest.mark.parametrize('installed, families, expected', [
+    ({'Arial', 'DejaVu Sans'}, ['Arial'], ['Arial']),
+    ({'Liberation Sans', 'DejaVu Sans'}, ['Arial'], ['Liberation Sans']),
+    ({'Arimo', 'Liberation Sans'}, ['Arial', 'sans-serif'], ['Liberation Sans', 'sans-serif']),
+    ({'DejaVu Sans'}, ['Arial', 'Comic Sans MS'], ['DejaVu Sans']),
+    (set(), ['Arial'], ['sans-serif']),
+])
+def test_font_fallback(monkeypatch, installed, families, expected):
+    monkeypatch.setattr(themes, '_installed_families', lambda: installed)
+    assert themes._resolve_font_family(families) == expected
+
+
+def test_missing_font_never_looked_up(registered):
+    registered('test_font', {'font.family': ['No Such Font', 'sans-serif']})
+    family = compile_theme('test_font')['font.family']
+    assert 'No Such Font' not in family and family[-1] == 'sans-serif'
+
+
+def test_theme_context_leaves_rcparams_alone():
+    keys = ['font.size', 'lines.linewidth', 'axes.facecolor']
+    before = stored(keys)
+
+    with theme_context({'font.size': 23.0, 'axes.facecolor': 'black'}):
+        assert mpl.rcParams['font.size'] == 23.0
+        with theme_context({'font.size': 30.0, 'lines.linewidth': 5.0}):
+            assert mpl.rcParams['font.size'] == 30.0 and mpl.rcParams['lines.linewidth'] == 5.0
+            # The outer theme's other settings still apply
+            assert mpl.rcParams['axes.facecolor'] == 'black'
+        # Leaving the inner theme brings back only what it touched
+        assert mpl.rcParams['font.size'] == 23.0 and mpl.rcParams['lines.linewidth'] == before['lines.linewidth']
+        assert stored(keys) == before
+
+    assert {key: mpl.rcParams[key] for key in keys} == before
+
+
+def test_plot_leaves_rcparams_alone(teams):
+    before = stored(mpl.rcParams.keys())
+    theme = {'font.size': 21.0, 'axes.facecolor': 'black', 'savefig.dpi': 40}
+    chart = Bar(x='team', y='goals', df=teams)
+    chart.plot(theme=theme)
+    chart.close()
+    assert stored(mpl.rcParams.keys()) == before
+    assert mpl.rcParams['font.size'] == before['font.size']
+
+
+def test_savefig_settings(teams):
+    chart = Bar(x='team', y='goals', df=teams)
+    theme = [DEFAULT_THEME, {'savefig.dpi': 40}]
+    width = Image.open(io.BytesIO(chart.render(theme=theme))).width
+    assert width == compile_theme(theme)['figure.figsize'][0] * 40
+
+    # plot leaves saving to the caller, who applies the theme's savefig settings through theme_context
+    chart.plot(theme=theme)
+    with theme_context(theme):
+        buffer = io.BytesIO()
+        chart.figure.savefig(buffer, format='png')
+    assert Image.open(buffer).width == width
+    chart.close()
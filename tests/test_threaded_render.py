@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+
+from speedy_charts.instrumentation import add_callback, remove_callback
+
+THREADS = 8
+ROUNDS = 4
+
+
+def test_concurrent_renders_match_sequential(chart_specs):
+    expected = [chart(**kwargs).render() for chart, kwargs in chart_specs]
+    rc_before = dict(mpl.rcParams)
+
+    # When each thread saved its charts, to check that renders really did overlap rather than take turns
+    saves = []
+    callback = add_callback(lambda span: span.name == 'savefig' and saves.append((threading.get_ident(), span.start, span.start + span.duration)))
+
+    tasks = [i for _ in range(ROUNDS) for i in range(len(chart_specs))]
+    try:
+        with ThreadPoolExecutor(THREADS) as pool:
+            results = list(pool.map(lambda i: (i, chart_specs[i][0](**chart_specs[i][1]).render()), tasks))
+    finally:
+        remove_callback(callback)
+
+    for i, data in results:
+        assert data == expected[i], chart_specs[i][0].__name__
+    assert dict(mpl.rcParams) == rc_before
+    assert plt.get_fignums() == []
+
+    saves.sort(key=lambda save: save[1])
+    assert any(a[0] != b[0] and b[1] < a[2] for a, b in zip(saves, saves[1:])), 'no two charts were saved at the same time'
+
+
+def test_theme_only_applies_to_its_own_thread():
+    from speedy_charts.themes import theme_context
+
+    started, done = threading.Event(), threading.Event()
+    seen = {}
+
+    def themed():
+        with theme_context({'axes.facecolor': '#123456'}):
+            seen['inside'] = mpl.rcParams['axes.facecolor']
+            started.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=themed)
+    thread.start()
+    started.wait(5)
+    # Another thread's theme neither shows up here nor changes what rcParams holds
+    seen['outside'] = mpl.rcParams['axes.facecolor']
+    done.set()
+    thread.join()
+
+    assert seen['inside'] == '#123456'
+    assert seen['outside'] == dict.__getitem__(mpl.rcParams, 'axes.facecolor') != '#123456'
+
+
+def test_concurrent_renders_with_themes_match_sequential(chart_specs):
+    themes = ['speedy_charts.mplstyles.standard_theme', {'axes.facecolor': '#eeeeee', 'font.size': 14}]
+    cases = [(i, theme) for i in range(len(chart_specs)) for theme in range(len(themes))]
+    expected = {case: chart_specs[case[0]][0](**chart_specs[case[0]][1]).render(theme=themes[case[1]]) for case in cases}
+
+    def render(case):
+        chart, kwargs = chart_specs[case[0]]
+        return case, chart(**kwargs).render(theme=themes[case[1]])
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(render, cases * 2))
+
+    for case, data in results:
+        assert data == expected[case]
+    assert plt.get_fignums() == []
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from speedy_charts.charts import Bar, new_figure
+from speedy_charts.ticks import CategoryFormatter, CategoryLocator
+
+
+def test_tick_values_without_axis():
+    locator = CategoryLocator([2, 0, 1, 3], ['c', 'a', 'b', 'd'])
+    np.testing.assert_array_equal(locator.tick_values(0, 3), [0, 1, 2, 3])
+    np.testing.assert_array_equal(locator.tick_values(2.5, 0.5), [1, 2])
+    assert len(locator.tick_values(3.2, 5)) == 0
+
+    formatter = CategoryFormatter(locator)
+    assert [formatter(x) for x in locator.tick_values(0, 3)] == ['a', 'b', 'c', 'd']
+
+
+def test_call_uses_the_view_interval():
+    n = 2000
+    df = pd.DataFrame({'team': [f'team_{i}' for i in range(n)], 'goals': np.arange(n)})
+    fig = new_figure()
+    ax = Bar(x='team', y='goals', df=df).plot(fig=fig)
+    locator = ax.xaxis.get_major_locator()
+
+    ticks = locator()
+    np.testing.assert_array_equal(ticks, locator.tick_values(*ax.get_xlim()))
+    # Too many groups to label them all, so only every nth is kept, starting from a multiple of n
+    step = int(ticks[1] - ticks[0])
+    assert step > 1 and len(ticks) < n
+    assert np.all(np.diff(ticks) == step) and ticks[0] % step == 0
+
+    # Zooming in leaves room for every label
+    ax.set_xlim(99.5, 104.5)
+    np.testing.assert_array_equal(locator(), [100, 101, 102, 103, 104])
@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+from speedy_charts.charts import Bar, new_figure
+from speedy_charts.themes import DEFAULT_THEME, theme_context
+
+
+def changed(df):
+    # Same rows and categories, different values
+    return df.assign(**{column: df[column][::-1].to_numpy() * 1.5 + 1 for column in df.select_dtypes('number').columns if column != 'gw'})
+
+
+def plotted(chart_class, kwargs):
+    # Layout engines place the axes from where the last draw left them, without one both figures keep the same axes
+    fig = new_figure()
+    fig.set_layout_engine('none')
+    chart = chart_class(**kwargs)
+    chart.plot(fig=fig)
+    return chart
+
+
+def saved(chart):
+    buffer = io.BytesIO()
+    with theme_context(DEFAULT_THEME):
+        chart.figure.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+
+def test_update_matches_fresh_plot(chart_specs):
+    for chart_class, kwargs in chart_specs:
+        new_df = changed(kwargs['df'])
+        chart = plotted(chart_class, kwargs)
+        chart.update(new_df)
+        assert saved(chart) == saved(plotted(chart_class, {**kwargs, 'df': new_df})), chart_class.__name__
+
+
+def test_bar_count_mismatch(teams):
+    chart = plotted(Bar, dict(x='team', y='goals', df=teams))
+    with pytest.raises(ValueError, match='has 12 bars but the new data has 5'):
+        chart.update(teams.iloc[:5])
+
+
+def test_plain_update_after_blit(chart_specs):
+    for chart_class, kwargs in chart_specs:
+        new_df = changed(kwargs['df'])
+        chart = plotted(chart_class, kwargs)
+        chart.figure.canvas.draw()
+        chart.update(kwargs['df'], blit=True)
+        assert all(artist.get_animated() for artist in chart._artists)
+
+        # Going back to plain updates hands the artists back to savefig
+        chart.update(new_df)
+        assert not any(artist.get_animated() for artist in chart._artists)
+        assert saved(chart) == saved(plotted(chart_class, {**kwargs, 'df': new_df})), chart_class.__name__
+
+
+def test_update_before_plot(teams):
+    with pytest.raises(ValueError, match='plot the chart before'):
+        Bar(x='team', y='goals', df=teams).update(teams)